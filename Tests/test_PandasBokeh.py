@@ -1,8 +1,10 @@
 import os
+import re
 
 import numpy as np
 import pandas as pd
 import pytest
+from bokeh.models import GlyphRenderer, HoverTool
 
 import pandas_bokeh
 
@@ -244,6 +246,315 @@ def test_lineplot_with_points(df_stock):
     assert True
 
 
+def test_lineplot_with_temporal_aggregation():
+    "Test pre-aggregation of datetime data via <freq> and <agg>"
+
+    np.random.seed(42)
+    df_events = pd.DataFrame(
+        {
+            "time": pd.date_range("2020-01-01", periods=10000, freq="7s"),
+            "latency": np.random.exponential(20, 10000),
+            "requests": np.random.randint(1, 10, 10000),
+        }
+    )
+
+    p_mean = df_events.plot_bokeh.line(
+        x="time",
+        y="latency",
+        freq="1H",
+        rangetool=True,
+        show_figure=False,
+    )
+    p_sum = df_events.plot_bokeh.bar(
+        x="time",
+        freq="6H",
+        agg={"requests": "sum"},
+        show_figure=False,
+    )
+    p_area_pandas_backend = df_events.set_index("time").plot.area(
+        freq="1H", agg="max", stacked=True, show_figure=False
+    )
+
+    # One vertex per interval and the span of the original timestamps in the source:
+    source = p_mean.children[0].renderers[0].data_source.data
+    expected = df_events.set_index("time")["latency"].resample("1H").mean()
+    np.testing.assert_allclose(source["latency"], expected.values)
+    assert source["__x__values_first"][1] == np.datetime64("2020-01-01T01:00:05")
+    assert source["__x__values_last"][0] == np.datetime64("2020-01-01T00:59:58")
+    assert p_sum.renderers[0].data_source.data["requests"].sum() == (
+        df_events["requests"].sum()
+    )
+    assert "span" in dict(p_sum.select_one(HoverTool).tooltips)
+
+    with pytest.raises(ValueError):
+        df_events.plot_bokeh.hist(x="time", freq="1H", show_figure=False)
+
+    layout = pandas_bokeh.column(p_mean, p_sum, p_area_pandas_backend)
+    pandas_bokeh.output_file(
+        os.path.join(DIRECTORY, "Plots", "Lineplot_temporal_aggregation.html")
+    )
+    pandas_bokeh.save(layout)
+
+
+def test_dictionary_encoded_hover_columns():
+    "Test that repeated strings in hovertool columns are sent as integer codes"
+
+    np.random.seed(42)
+    N = 20000
+    hosts = ["web-01.example.com", "web-02.example.com", "db-01.example.com"]
+    df = pd.DataFrame(
+        {
+            "latency": np.random.exponential(20, N),
+            "host": np.random.choice(hosts, N),
+        }
+    )
+
+    p = df.plot_bokeh.line(
+        y="latency", hovertool_string="@{host}: @{latency}", show_figure=False
+    )
+    p_without_host = df.plot_bokeh.line(
+        y="latency", hovertool_string="@{latency}", show_figure=False
+    )
+
+    source = p.renderers[0].data_source.data
+    assert source["host"].dtype == np.int8
+    hover = p.select_one(HoverTool)
+    assert hover.tooltips == "@{host}{custom}: @{latency}"
+    assert "@{host}" in hover.formatters
+
+    # Payload grows by the codes instead of the full strings:
+    html_size = len(pandas_bokeh.embedded_html(p))
+    html_size_without_host = len(pandas_bokeh.embedded_html(p_without_host))
+    assert html_size - html_size_without_host < 0.1 * N * len(hosts[0])
+
+    p_scatter = df.reset_index().plot_bokeh.scatter(
+        x="index", y="latency", category="host", show_figure=False
+    )
+    for renderer in p_scatter.renderers:
+        assert renderer.data_source.data["category"].dtype == np.int8
+
+    pandas_bokeh.output_file(
+        os.path.join(DIRECTORY, "Plots", "Dictionary_encoded_hover.html")
+    )
+    pandas_bokeh.save(p_scatter)
+
+
+def test_categorical_hover_columns():
+    "Test that categorical hovertool columns are sent as codes and categories"
+
+    df = pd.DataFrame(
+        {
+            "latency": [12.0, 3.5, 7.25, 1.0],
+            "host": pd.Categorical(["web-02", "web-01", None, "web-02"]),
+        }
+    )
+    hovertool_string = "@{host}: @{latency}"
+
+    p = df.plot_bokeh.line(
+        y="latency", hovertool_string=hovertool_string, show_figure=False
+    )
+    source = p.renderers[0].data_source.data
+    np.testing.assert_array_equal(source["host"], [1, 0, -1, 1])
+    hover = p.select_one(HoverTool)
+    assert hover.tooltips == "@{host}{custom}: @{latency}"
+    assert '["web-01", "web-02"]' in hover.formatters["@{host}"].code
+
+    p_scatter = df.reset_index().plot_bokeh.scatter(
+        x="index", y="latency", hovertool_string=hovertool_string, show_figure=False
+    )
+    source = p_scatter.renderers[0].data_source.data
+    np.testing.assert_array_equal(source["host"], [1, 0, -1, 1])
+
+    # Without encoding, the values of the categories are sent:
+    with pandas_bokeh.option_context(hover="raw"):
+        p_raw = df.plot_bokeh.line(
+            y="latency", hovertool_string=hovertool_string, show_figure=False
+        )
+    source = p_raw.renderers[0].data_source.data
+    assert list(source["host"][[0, 1, 3]]) == ["web-02", "web-01", "web-02"]
+
+
+def test_categorical_scatterplot_without_hovertool(df_iris):
+    "Test categorical scatterplots with hovertool=False"
+
+    p = df_iris.plot_bokeh.scatter(
+        x="petal length (cm)",
+        y="sepal width (cm)",
+        category="species",
+        hovertool=False,
+        show_figure=False,
+    )
+    assert len(p.renderers) == df_iris["species"].nunique()
+    assert p.select(HoverTool) == []
+
+
+@pytest.mark.parametrize(
+    "precision,max_size_ratio",
+    [("float64", 1), ("float32", 0.75), ("int32", 0.75), ("int16", 0.625)],
+)
+def test_lineplot_precision(df_stock, precision, max_size_ratio):
+    "Test reduced precision of plot data"
+
+    df_stock = pd.concat([df_stock.reset_index(drop=True)] * 20, ignore_index=True)
+    html_float64 = pandas_bokeh.embedded_html(
+        df_stock.plot_bokeh.line(show_figure=False)
+    )
+
+    p = df_stock.plot_bokeh.line(precision=precision, show_figure=False)
+    html = pandas_bokeh.embedded_html(p)
+
+    # Payload is reduced according to the itemsize of the y-values:
+    assert len(html) <= max_size_ratio * len(html_float64)
+
+    # Plotted values are within the documented error bound:
+    renderer = p.renderers[0]
+    values = renderer.data_source.data["Google"]
+    if precision in ["int32", "int16"]:
+        func = renderer.glyph.y["transform"].func
+        offset, scale = re.search(r": (\S+) \+ v \* (\S+)\)", func).groups()
+        values = float(offset) + values * float(scale)
+        q_max = np.iinfo(precision).max
+        max_error = (1 + 1e-6) / (4 * q_max)
+    else:
+        max_error = 0
+    value_range = df_stock["Google"].max() - df_stock["Google"].min()
+    tolerance = max(max_error * value_range, 6e-8 * df_stock["Google"].abs().max())
+    assert np.max(np.abs(values - df_stock["Google"].values)) <= tolerance
+
+
+def test_lineplot_precision_global_default(df_stock):
+    "Test global default precision"
+
+    with pandas_bokeh.option_context("precision", "float32"):
+        p = df_stock.plot_bokeh.line(show_figure=False)
+    source = p.renderers[0].data_source.data
+    assert source["Google"].dtype == np.float32
+    assert source["__x__values"].dtype == np.float64
+
+    with pytest.raises(ValueError):
+        df_stock.plot_bokeh.line(precision="float16", show_figure=False)
+
+
+@pytest.fixture(scope="function")
+def df_large():
+    np.random.seed(42)
+    n = 100000
+    return pd.DataFrame(
+        {"A": np.random.randn(n).cumsum(), "B": np.random.randn(n).cumsum()},
+        index=pd.date_range("2020-01-01", periods=n, freq="s"),
+    )
+
+
+@pytest.mark.parametrize(
+    "max_payload_bytes,measures",
+    [
+        (4e6, ["deduplicated"]),
+        (2e6, ["deduplicated", "'int16'"]),
+        (5e5, ["deduplicated", "'int16'", "downsampled"]),
+    ],
+)
+def test_lineplot_payload_budget(df_large, max_payload_bytes, measures):
+    "Test escalation of payload reductions for a lineplot"
+
+    html_unlimited = pandas_bokeh.embedded_html(
+        df_large.plot_bokeh.line(max_payload_bytes=1e12, show_figure=False)
+    )
+
+    with pytest.warns(UserWarning) as record:
+        p = df_large.plot_bokeh.line(
+            max_payload_bytes=max_payload_bytes, rangetool=True, show_figure=False
+        )
+    assert len(record) == 1
+    message = str(record[0].message)
+    for measure in measures:
+        assert measure in message
+    if "downsampled" not in measures:
+        assert "downsampled" not in message
+
+    # All glyphs share a single source without duplicated x-values:
+    renderers = list(p.select({"type": GlyphRenderer}))
+    assert len({id(renderer.data_source) for renderer in renderers}) == 1
+    data = renderers[0].data_source.data
+    assert "__x__values_original" not in data
+    for my_hover in p.select({"type": HoverTool}):
+        assert my_hover.tooltips[0][1] == "@{__x__values}{%F}"
+        assert "@{__x__values}" in my_hover.formatters
+
+    # Payload fits into the budget (besides the constant overhead of the document):
+    html = pandas_bokeh.embedded_html(p)
+    assert len(html) < len(html_unlimited)
+    assert len(data["__x__values"]) * 6 < max_payload_bytes
+
+    output_file = os.path.join(DIRECTORY, "Plots", "Payload_Budget.html")
+    pandas_bokeh.output_file(output_file)
+    pandas_bokeh.show(p)
+
+
+@pytest.mark.parametrize("kind", ["point", "scatter", "area", "bar"])
+def test_payload_budget_plot_kinds(df_large, kind):
+    "Test payload budget for other plot kinds"
+
+    kwargs = {"x": "A", "y": "B"} if kind == "scatter" else {}
+    with pytest.warns(UserWarning, match="exceeds <max_payload_bytes>") as record:
+        p = df_large.plot_bokeh(
+            kind=kind, max_payload_bytes=2e5, show_figure=False, **kwargs
+        )
+    assert len(record) == 1
+    message = str(record[0].message)
+
+    n_rows = len(p.renderers[-1].data_source.data["__x__values"])
+    if kind == "bar":
+        # Bars are not downsampled:
+        assert "still has an estimated size" in message
+        assert n_rows == len(df_large)
+    else:
+        assert "downsampled" in message
+        assert n_rows < len(df_large) / 5
+
+
+def test_payload_budget_global_default(df_stock):
+    "Test global default of payload budget"
+
+    with pandas_bokeh.option_context(max_payload_bytes=10000):
+        with pytest.warns(UserWarning, match="downsampled"):
+            p = df_stock.plot_bokeh.line(show_figure=False)
+    assert len(p.renderers[0].data_source.data["__x__values"]) < len(df_stock)
+
+    # No reductions are needed for small plots:
+    p = df_stock.plot_bokeh.line(show_figure=False)
+    assert len(p.renderers[0].data_source.data["__x__values"]) == len(df_stock)
+
+
+def test_plot_options(df_stock):
+    "Test that keyword arguments default to the global options"
+
+    df_stock["Category"] = ["A", "B"] * (len(df_stock) // 2)
+    with pandas_bokeh.option_context(webgl=False, hover="off", max_points=10):
+        p_line = df_stock.plot_bokeh.line(show_figure=False)
+        p_ecdf = df_stock.plot_bokeh.ecdf(y="Google", show_figure=False)
+        p_webgl = df_stock.plot_bokeh.line(webgl=True, show_figure=False)
+        p_hover = df_stock.plot_bokeh.line(hovertool=True, show_figure=False)
+    assert p_line.output_backend == "canvas"
+    assert len(p_line.select(type=HoverTool)) == 0
+    assert len(p_ecdf.renderers[0].data_source.data["Google"]) == 10
+    assert p_webgl.output_backend == "webgl"
+    assert len(p_hover.select(type=HoverTool)) == 2
+
+    with pandas_bokeh.option_context(hover="raw"):
+        p_raw = df_stock.plot_bokeh.line(
+            y="Google", hovertool_string="@Category", show_figure=False
+        )
+    assert p_raw.renderers[0].data_source.data["Category"].dtype == object
+
+    with pandas_bokeh.option_context(max_payload_bytes=10000, downsampling="minmax"):
+        with pytest.warns(UserWarning, match="min/max"):
+            p_minmax = df_stock.plot_bokeh.line(precision="float64", show_figure=False)
+    data = p_minmax.renderers[0].data_source.data
+    for col in ["Google", "Apple"]:
+        assert df_stock[col].max() in data[col]
+        assert df_stock[col].min() in data[col]
+
+
 def test_basic_stepplot(df_stock):
     """Test for basic stepplot"""
 
@@ -398,6 +709,44 @@ def test_scatterplot_2(df_iris):
     assert True
 
 
+def test_plots_with_extension_dtypes():
+    "Test plots of nullable extension dtypes and categorical columns"
+
+    np.random.seed(42)
+    df = pd.DataFrame(
+        {
+            "int": pd.array(np.random.randint(0, 10, 100), dtype="Int64"),
+            "float": pd.array(np.random.randn(100), dtype="Float64"),
+            "bool": pd.array(np.random.random(100) > 0.5, dtype="boolean"),
+            "category": pd.Categorical(
+                np.random.choice(["a", "b"], 100), categories=["a", "b", "unused"]
+            ),
+        }
+    )
+    df.loc[3, "float"] = pd.NA
+
+    p_line = df.plot_bokeh.line(y=["int", "float", "bool"], show_figure=False)
+    p_scatter = df.plot_bokeh.scatter(
+        x="float", y="int", category="category", show_figure=False
+    )
+    p_bar = df.iloc[:10].plot_bokeh.bar(x="category", y="int", show_figure=False)
+    p_hist = df.plot_bokeh.hist(y=["int"], show_figure=False)
+
+    # Nullable columns are passed as NumPy arrays with NaN to the source:
+    source = p_line.renderers[0].data_source.data
+    assert source["int"].dtype == np.int64
+    assert source["float"].dtype == np.float64
+    assert np.isnan(source["float"][3])
+
+    # One glyph per observed category:
+    assert len(p_scatter.renderers) == 2
+    assert sum(len(r.data_source.data["y"]) for r in p_scatter.renderers) == 100
+
+    layout = pandas_bokeh.column(p_line, p_scatter, p_bar, p_hist)
+    pandas_bokeh.output_file(os.path.join(DIRECTORY, "Plots", "ExtensionDtypes.html"))
+    pandas_bokeh.save(layout)
+
+
 def test_barplot_basic(df_fruits):
     "Basic Test for Barplot"
 
@@ -685,6 +1034,130 @@ def test_histogram_average_diplay(df_hist):
     pandas_bokeh.save(p_average)
 
 
+def test_kdeplot(df_hist):
+    "Test kde plots"
+
+    p_kde = df_hist.plot_bokeh.kde(
+        title="Normal distributions (KDE)",
+        show_figure=False,
+    )
+
+    p_kde_density = df_hist.plot_bokeh(
+        kind="density",
+        y=["a", "b"],
+        bw_method="silverman",
+        ind=200,
+        show_figure=False,
+    )
+
+    df_hist["group"] = np.where(df_hist["a"] > 1, "large", "small")
+    p_kde_by = df_hist.plot_bokeh.kde(
+        y="b",
+        by="group",
+        bw_method=0.5,
+        title="Density of b grouped by a",
+        show_figure=False,
+    )
+
+    p_kde_pandas_backend = df_hist.plot.kde(
+        ind=np.linspace(-5, 5, 101), show_figure=False
+    )
+
+    # All densities are drawn as lines from one shared source:
+    renderers = p_kde_by.renderers
+    assert len(renderers) == 2
+    assert renderers[0].data_source is renderers[1].data_source
+    assert len(p_kde_pandas_backend.renderers[0].data_source.data["__x__values"]) == 101
+
+    # Densities integrate to 1:
+    source = p_kde.renderers[0].data_source.data
+    for col in ["a", "b", "c"]:
+        assert np.trapz(source[col], source["__x__values"]) == pytest.approx(
+            1, abs=1e-2
+        )
+
+    layout = pandas_bokeh.plot_grid(
+        [[p_kde, p_kde_density], [p_kde_by, p_kde_pandas_backend]],
+        width=450,
+        height=300,
+        show_plot=False,
+    )
+
+    pandas_bokeh.output_file(os.path.join(DIRECTORY, "Plots", "KDE.html"))
+    pandas_bokeh.save(layout)
+
+
+def test_kdeplot_by_with_degenerate_groups():
+    "Test that groups without a density are skipped in kde plots with <by>"
+
+    np.random.seed(42)
+    df = pd.DataFrame(
+        {
+            "value": np.concatenate([np.random.randn(100), [3.0, 3.0], [np.nan]]),
+            "group": ["normal"] * 100 + ["constant"] * 2 + ["empty"],
+        }
+    )
+
+    with pytest.warns(Warning) as record:
+        p = df.plot_bokeh.kde(y="value", by="group", show_figure=False)
+    skipped = [str(w.message) for w in record if w.category is UserWarning]
+    assert len(skipped) == 2
+    assert "'constant'" in skipped[0] and "'empty'" in skipped[1]
+    assert [item.label["value"].strip() for item in p.legend[0].items] == ["normal"]
+
+    with pytest.raises(ValueError), pytest.warns(Warning):
+        df[df["group"] != "normal"].plot_bokeh.kde(
+            y="value", by="group", show_figure=False
+        )
+
+    # Likewise for data columns without values (e.g. of all numeric columns):
+    df_columns = pd.DataFrame({"a": [1.0, 2, 3], "c": [np.nan] * 3})
+    with pytest.warns(Warning) as record:
+        p = df_columns.plot_bokeh(kind="kde", show_figure=False)
+    assert any(w.category is UserWarning and "'c'" in str(w.message) for w in record)
+    assert [renderer.glyph.y for renderer in p.renderers] == ["a"]
+
+
+def test_ecdfplot(df_hist):
+    "Test ecdf plots"
+
+    df_hist["weights"] = np.random.random(len(df_hist))
+
+    p_ecdf = df_hist.plot_bokeh.ecdf(
+        y=["a", "b", "c"],
+        max_points=100,
+        title="Normal distributions (ECDF)",
+        show_figure=False,
+    )
+
+    p_ecdf_weighted = df_hist.plot_bokeh(
+        kind="ecdf",
+        y="a",
+        weights="weights",
+        max_points=float("inf"),
+        show_figure=False,
+    )
+
+    p_ecdf_pandas_backend = df_hist.plot.ecdf(y=["a", "b"], show_figure=False)
+
+    # Number of vertices is bounded by <max_points>:
+    assert len(p_ecdf.renderers) == 3
+    for renderer in p_ecdf.renderers:
+        assert len(renderer.data_source.data["__x__values"]) == 100
+        assert renderer.glyph.mode == "after"
+    assert len(p_ecdf_weighted.renderers[0].data_source.data["a"]) == len(df_hist)
+
+    layout = pandas_bokeh.plot_grid(
+        [[p_ecdf, p_ecdf_weighted, p_ecdf_pandas_backend]],
+        width=450,
+        height=300,
+        show_plot=False,
+    )
+
+    pandas_bokeh.output_file(os.path.join(DIRECTORY, "Plots", "ECDF.html"))
+    pandas_bokeh.save(layout)
+
+
 def test_area_plots(df_energy):
     "Test area plots"
 
@@ -847,3 +1320,84 @@ def test_autosizing(df_fruits):
     pandas_bokeh.save(p_autoscale)
 
     assert True
+
+
+def test_output_to(df_stock):
+    "Test context-local output configuration"
+
+    output_file = os.path.join(DIRECTORY, "Plots", "Output_To.html")
+    if os.path.exists(output_file):
+        os.remove(output_file)
+
+    p = df_stock.plot_bokeh.line(title="Output to file", show_figure=False)
+    with pandas_bokeh.output_to(output_file, title="Output To"):
+        pandas_bokeh.show(p, browser="none")
+        # Nested contexts override the outer context:
+        with pandas_bokeh.output_to(None):
+            p_suppressed = df_stock.plot_bokeh.line()
+            assert pandas_bokeh.show(p_suppressed) is p_suppressed
+    with open(output_file, encoding="utf-8") as f:
+        html = f.read()
+    assert "<title>Output To</title>" in html
+    assert "Output to file" in html
+
+
+def test_output_module_attributes(df_stock):
+    "Test the module attributes of the output of former versions"
+
+    from pandas_bokeh import base
+
+    assert base.OUTPUT_TYPE == "file"
+    assert base.SUPPRESS_OUTPUT is False
+    with pandas_bokeh.output_to(None):
+        assert base.SUPPRESS_OUTPUT is True
+        assert base.OUTPUT_TYPE is None
+
+    base.SUPPRESS_OUTPUT = True
+    try:
+        p = df_stock.plot_bokeh.line(show_figure=False)
+        assert pandas_bokeh.show(p) is p
+    finally:
+        del base.SUPPRESS_OUTPUT
+    assert base.SUPPRESS_OUTPUT is False
+
+
+def test_concurrent_output(df_stock):
+    "Stress test for rendering plots concurrently into different outputs"
+
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    n_tasks = 48
+    barrier = threading.Barrier(8)
+
+    def render(i):
+        output_file = os.path.join(DIRECTORY, "Plots", f"Concurrent_{i}.html")
+        with pandas_bokeh.output_to(output_file, title=f"Concurrent {i}"):
+            if i < 8:
+                # Start the first tasks of all threads at the same time:
+                barrier.wait()
+            p = df_stock.plot_bokeh(
+                kind=["line", "step", "point", "bar"][i % 4],
+                title=f"Plot number {i}",
+                show_figure=False,
+            )
+            html = pandas_bokeh.embedded_html(
+                df_stock.plot_bokeh.line(
+                    title=f"Embedded number {i}", show_figure=False
+                )
+            )
+            pandas_bokeh.show(p, browser="none")
+        return output_file, html
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(render, range(n_tasks)))
+
+    # Each file & embedded HTML contains only its own plot:
+    for i, (output_file, html) in enumerate(results):
+        with open(output_file, encoding="utf-8") as f:
+            file_html = f.read()
+        assert f"<title>Concurrent {i}</title>" in file_html
+        assert re.findall(r"Plot number \d+", file_html) == [f"Plot number {i}"]
+        assert re.findall(r"Embedded number \d+", html) == [f"Embedded number {i}"]
+        os.remove(output_file)
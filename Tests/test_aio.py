@@ -0,0 +1,170 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pandas_bokeh
+from pandas_bokeh import aio
+
+
+@pytest.fixture(autouse=True)
+def reset_options():
+    yield
+    pandas_bokeh.reset_option("all")
+
+
+@pytest.fixture
+def df():
+    np.random.seed(42)
+    return pd.DataFrame(
+        {"A": np.random.randn(1000).cumsum(), "B": np.random.randn(1000).cumsum()}
+    )
+
+
+def _data(p):
+    source = p.renderers[0].data_source
+    return {key: np.asarray(values) for key, values in source.data.items()}
+
+
+def _assert_same_plot(p_async, p_sync):
+    assert p_async.title.text == p_sync.title.text
+    assert len(p_async.renderers) == len(p_sync.renderers)
+    data_async, data_sync = _data(p_async), _data(p_sync)
+    assert data_async.keys() == data_sync.keys()
+    for key in data_sync:
+        np.testing.assert_array_equal(data_async[key], data_sync[key])
+
+
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_aline(df, pool):
+    "Test that the awaitable plot methods return the same figure as the sync path"
+
+    kwargs = dict(title="Line", precision="float32", show_figure=False)
+    p_sync = df.plot_bokeh.line(**kwargs)
+
+    async def main():
+        with pandas_bokeh.option_context(pool=pool, workers=2):
+            return await asyncio.gather(
+                df.plot_bokeh.aline(**kwargs),
+                df.plot_bokeh.aplot(kind="line", **kwargs),
+                pandas_bokeh.aplot(df, kind="line", **kwargs),
+            )
+
+    for p_async in asyncio.run(main()):
+        _assert_same_plot(p_async, p_sync)
+
+
+def test_aembedded_html(df):
+    p = df.plot_bokeh.hist(title="Histogram", show_figure=False)
+
+    async def main():
+        with pandas_bokeh.option_context(pool="process"):
+            return await pandas_bokeh.aembedded_html(p)
+
+    html = asyncio.run(main())
+    assert html.startswith(pandas_bokeh.base.get_bokeh_resources())
+    assert '"text":"Histogram"' in html.replace(" ", "")
+
+
+def _output_filename():
+    return pandas_bokeh.base._current_output().filename
+
+
+def test_process_pool_options_output_and_warnings(df):
+    "Test that options, output and warnings are passed to and from process workers"
+
+    async def main():
+        with pandas_bokeh.option_context(
+            pool="process", precision="int16", max_payload_bytes=2_000
+        ), pandas_bokeh.output_to("process.html"):
+            p = await df.plot_bokeh.aline(show_figure=False)
+            return p, await aio._run(_output_filename)
+
+    with pytest.warns(UserWarning, match="max_payload_bytes"):
+        p, filename = asyncio.run(main())
+
+    assert filename == "process.html"
+    assert len(_data(p)["A"]) < len(df)
+
+
+def test_custom_executor(df):
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    async def main():
+        with pandas_bokeh.option_context(pool=executor):
+            return await df.plot_bokeh.apoint(show_figure=False)
+
+    p = asyncio.run(main())
+    executor.shutdown()
+    _assert_same_plot(p, df.plot_bokeh.point(show_figure=False))
+
+
+def test_cancellation():
+    "Test that cancelled calls, which have not started yet, are not run"
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    calls = []
+
+    def func(name):
+        calls.append(name)
+        release.wait(10)
+        return name
+
+    async def main():
+        with pandas_bokeh.option_context(pool=executor):
+            first = asyncio.ensure_future(aio._run(func, "first"))
+            second = asyncio.ensure_future(aio._run(func, "second"))
+            await asyncio.sleep(0.1)
+            second.cancel()
+            await asyncio.sleep(0.1)
+            release.set()
+            result = await first
+            with pytest.raises(asyncio.CancelledError):
+                await second
+            return result
+
+    assert asyncio.run(main()) == "first"
+    executor.shutdown()
+    assert calls == ["first"]
+
+
+def test_max_concurrency():
+    lock = threading.Lock()
+    running = [0]
+    max_running = [0]
+
+    def func():
+        with lock:
+            running[0] += 1
+            max_running[0] = max(max_running[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    async def main():
+        with pandas_bokeh.option_context(workers=8, max_concurrency=2):
+            await asyncio.gather(*[aio._run(func) for _ in range(8)])
+
+    asyncio.run(main())
+    assert max_running[0] == 2
+
+
+def test_shutdown_executors_python_38(monkeypatch):
+    "Test the shutdown at exit with the Executor.shutdown of Python 3.8"
+
+    calls = []
+
+    class Executor:
+        def shutdown(self, wait=True):
+            calls.append(wait)
+
+    monkeypatch.setattr(aio.sys, "version_info", (3, 8, 18))
+    monkeypatch.setattr(aio, "_executors", {"thread": (Executor(), 1)})
+    aio._shutdown_executors()
+    assert calls == [False]
+    assert aio._executors == {}
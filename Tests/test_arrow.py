@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pandas_bokeh
+from pandas_bokeh.arrow import _arrow_to_pandas
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def table():
+    n = 1_000
+    return pa.table(
+        {
+            "time": pa.array(
+                pd.date_range("2020-01-01", periods=n, freq="s", tz="Europe/Berlin")
+            ),
+            "A": np.arange(n, dtype=float),
+            "B": pa.array(np.arange(n) % 7, type=pa.int32()),
+            "C": pa.array(np.random.choice(["x", "y", "z"], n)).dictionary_encode(),
+            "D": np.random.choice(["u", "v"], n),
+            "E": pa.array([1.0, None] * (n // 2)),
+        }
+    )
+
+
+def test_arrow_to_pandas(table):
+    df = _arrow_to_pandas(table)
+
+    # Numeric columns share the Arrow buffers:
+    assert np.shares_memory(
+        df["A"].to_numpy(), table.column("A").chunk(0).to_numpy(zero_copy_only=True)
+    )
+    assert df["B"].dtype == np.int32
+    # Strings become Categoricals:
+    assert isinstance(df["C"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["D"].dtype, pd.CategoricalDtype)
+    assert list(df["D"]) == table.column("D").to_pylist()
+    assert str(df["time"].dt.tz) == "Europe/Berlin"
+    assert df["time"].iloc[0] == pd.Timestamp("2020-01-01", tz="Europe/Berlin")
+    assert np.isnan(df["E"].iloc[1])
+
+    # The index stored by pandas is restored:
+    df_in = pd.DataFrame({"A": [1.0, 2.0]}, index=pd.Index(["a", "b"], name="key"))
+    df = _arrow_to_pandas(pa.Table.from_pandas(df_in))
+    assert df.index.name == "key"
+    assert list(df.index) == ["a", "b"]
+
+
+def test_plot_arrow(table):
+    p = pandas_bokeh.plot(table, kind="line", x="time", y="A", show_figure=False)
+    source = p.renderers[0].data_source
+    # The data source uses the Arrow buffer of the column:
+    assert np.shares_memory(
+        source.data["A"], table.column("A").chunk(0).to_numpy(zero_copy_only=True)
+    )
+
+    # Accessor and other plot kinds:
+    p = pandas_bokeh.FramePlotMethods(table).scatter(
+        x="A", y="B", category="D", show_figure=False
+    )
+    assert len(p.renderers) == 2
+    batch = table.to_batches()[0]
+    p = pandas_bokeh.plot(batch, kind="bar", x="D", y="A", show_figure=False)
+    assert p is not None
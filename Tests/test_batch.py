@@ -0,0 +1,126 @@
+import os
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pandas_bokeh
+from pandas_bokeh.batch import _share_frame
+
+
+@pytest.fixture
+def df():
+    np.random.seed(42)
+    return pd.DataFrame(
+        {
+            "customer": np.random.choice(["Alice", "Bob", "Carol/Dave"], 300),
+            "revenue": np.random.randn(300).cumsum(),
+            "cost": np.random.rand(300),
+        }
+    )
+
+
+def test_share_frame(df):
+    "Test that frames are restored from the shared memory block"
+
+    df["category"] = df["customer"].astype("category")
+    for frame in [df, df["revenue"], df.iloc[:0]]:
+        data, block, offsets = _share_frame(frame)
+        try:
+            buffers = [
+                bytes(block.buf[offset : offset + size]) if block else b""
+                for offset, size in offsets
+            ]
+            restored = pickle.loads(data, buffers=buffers)
+        finally:
+            if block is not None:
+                block.close()
+                block.unlink()
+        if isinstance(frame, pd.Series):
+            pd.testing.assert_series_equal(restored, frame)
+        else:
+            pd.testing.assert_frame_equal(restored, frame)
+
+
+def test_render_many(df, tmp_path):
+    jobs = {
+        customer: (df_customer[["revenue", "cost"]], dict(kind="line", title=customer))
+        for customer, df_customer in df.groupby("customer")
+    }
+    jobs["failing"] = (df, dict(kind="unknown"))
+    progress = []
+
+    with pandas_bokeh.option_context(hover="off"):
+        results = pandas_bokeh.render_many(
+            jobs,
+            workers=2,
+            output_dir=str(tmp_path),
+            progress=lambda result, done, total: progress.append((result.name, done)),
+        )
+
+    assert [result.name for result in results] == list(jobs)
+    assert sorted(done for _, done in progress) == [1, 2, 3, 4]
+    for result in results[:3]:
+        assert result.error is None
+        assert set(result.timings) == {"transfer", "plot", "html", "write", "total"}
+        with open(result.path, encoding="utf-8") as f:
+            html = f.read()
+        assert f"<title>{result.name}</title>" in html
+        assert "HoverTool" not in html
+    assert results[2].path == os.path.join(str(tmp_path), "Carol_Dave.html")
+    assert results[3].path is None
+    assert "Allowed plot kinds" in results[3].error
+
+    with pytest.raises(RuntimeError, match="failing"):
+        pandas_bokeh.render_many(
+            [("failing", df, dict(kind="unknown"))],
+            workers=1,
+            output_dir=str(tmp_path),
+            raise_errors=True,
+        )
+
+
+def test_render_many_generator(df, tmp_path):
+    jobs = ((group[["cost"]], dict(kind="hist")) for _, group in df.groupby("customer"))
+    results = pandas_bokeh.render_many(jobs, workers=1, output_dir=str(tmp_path))
+    assert [os.path.basename(result.path) for result in results] == [
+        "0.html",
+        "1.html",
+        "2.html",
+    ]
+
+
+def test_render_many_colliding_names(df, tmp_path):
+    frame = df[["cost"]]
+    jobs = [(name, frame, dict(kind="hist")) for name in ["a/b", "a:b", "A_b", "a_b_2"]]
+    results = pandas_bokeh.render_many(jobs, workers=1, output_dir=str(tmp_path))
+    # Names that sanitize to the same file name do not overwrite each other:
+    assert [os.path.basename(result.path) for result in results] == [
+        "a_b.html",
+        "a_b_2.html",
+        "A_b_3.html",
+        "a_b_2_2.html",
+    ]
+    assert len(os.listdir(tmp_path)) == 4
+
+
+def test_render_many_releases_shared_memory(tmp_path, capfd, monkeypatch):
+    "Test that the workers close the shared memory blocks without errors"
+
+    # Print errors of destructors (like outside of pytest) in the workers:
+    monkeypatch.setattr(sys, "unraisablehook", sys.__unraisablehook__)
+
+    # The integer index of the groups is used as x-values of the plots:
+    df = pd.DataFrame({"group": np.arange(4000) % 40, "value": np.random.randn(4000)})
+    jobs = {
+        group: (df_group[["value"]], dict(kind="line"))
+        for group, df_group in df.groupby("group")
+    }
+    results = pandas_bokeh.render_many(jobs, workers=2, output_dir=str(tmp_path))
+
+    assert all(result.error is None for result in results)
+    captured = capfd.readouterr()
+    assert "BufferError" not in captured.err
+    assert "Traceback" not in captured.err
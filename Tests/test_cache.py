@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pandas_bokeh
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    yield
+    for cache in ["memory", None]:
+        with pandas_bokeh.option_context(cache=cache):
+            pandas_bokeh.clear_cache()
+    pandas_bokeh.reset_option("all")
+
+
+@pytest.fixture
+def df():
+    np.random.seed(42)
+    return pd.DataFrame(
+        {
+            "A": np.random.randn(1000).cumsum(),
+            "B": np.random.randn(1000).cumsum(),
+            "C": np.random.choice(["x", "y"], 1000),
+        }
+    )
+
+
+def test_memory_cache(df):
+    pandas_bokeh.set_option(cache="memory")
+
+    html = df.plot_bokeh.line(y="A", show_figure=False, return_html=True)
+    assert df.plot_bokeh.line(y="A", show_figure=False, return_html=True) == html
+    info = pandas_bokeh.cache_info()
+    assert (info.hits, info.misses, info.entries) == (1, 1, 2)
+
+    # Cached figures are rebuilt from their JSON:
+    p = df.plot_bokeh.line(y="A", show_figure=False, title="Cached")
+    p_cached = df.plot_bokeh.line(y="A", show_figure=False, title="Cached")
+    assert p_cached is not p
+    assert p_cached.document is None
+    assert p_cached.title.text == "Cached"
+    np.testing.assert_array_equal(
+        p_cached.renderers[0].data_source.data["A"],
+        p.renderers[0].data_source.data["A"],
+    )
+    assert pandas_bokeh.cache_info().hits == 2
+
+    pandas_bokeh.clear_cache()
+    assert pandas_bokeh.cache_info() == (0, 0, 0, 0, 256_000_000)
+
+
+def test_cache_key(df):
+    "Test that only changes of the used data, arguments and options are misses"
+
+    pandas_bokeh.set_option(cache="memory")
+    df.plot_bokeh.line(y="A", show_figure=False)
+
+    df_unused_changed = df.copy()
+    df_unused_changed["B"] += 1
+    df_unused_changed.plot_bokeh.line(y="A", show_figure=False)
+    assert pandas_bokeh.cache_info()[:2] == (1, 1)
+
+    df_changed = df.copy()
+    df_changed.loc[500, "A"] += 1
+    df_changed.plot_bokeh.line(y="A", show_figure=False)
+    df.set_index(df.index + 1).plot_bokeh.line(y="A", show_figure=False)
+    df.plot_bokeh.line(y="A", show_figure=False, ylabel="Other")
+    df.plot_bokeh.line(y="A", show_figure=False, hovertool_string="@C")
+    with pandas_bokeh.option_context(precision="float32"):
+        df.plot_bokeh.line(y="A", show_figure=False)
+    assert pandas_bokeh.cache_info()[:2] == (1, 6)
+
+    # Arguments that cannot be hashed disable the cache:
+    df.plot_bokeh.line(y="A", show_figure=False, agg=lambda v: v.mean())
+    assert pandas_bokeh.cache_info()[:2] == (1, 6)
+
+
+def test_memory_cache_eviction(df):
+    pandas_bokeh.set_option(cache="memory")
+    html = df.plot_bokeh.line(y="A", show_figure=False, return_html=True)
+    pandas_bokeh.clear_cache()
+
+    # Only the last two results fit into the cache:
+    pandas_bokeh.set_option(cache_max_bytes=2.5 * len(html))
+    for title in ["1", "2", "3"]:
+        df.plot_bokeh.line(y="A", show_figure=False, return_html=True, title=title)
+    assert pandas_bokeh.cache_info().entries == 2
+    assert pandas_bokeh.cache_info().current_bytes <= 2.5 * len(html)
+
+    df.plot_bokeh.line(y="A", show_figure=False, return_html=True, title="3")
+    df.plot_bokeh.line(y="A", show_figure=False, return_html=True, title="1")
+    assert pandas_bokeh.cache_info()[:2] == (1, 4)
+
+
+def test_disk_cache(df, tmp_path):
+    directory = str(tmp_path / "cache")
+    pandas_bokeh.set_option(cache=directory)
+
+    html = df.plot_bokeh.hist(show_figure=False, return_html=True)
+    assert len(os.listdir(directory)) == 2
+    # A new process would find the files of the cache:
+    pandas_bokeh.cache._caches.clear()
+    assert df.plot_bokeh.hist(show_figure=False, return_html=True) == html
+    assert pandas_bokeh.cache_info()[:3] == (1, 1, 2)
+
+    # The least recently used files are removed above the size limit:
+    size = sum(
+        os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory)
+    )
+    pandas_bokeh.set_option(cache_max_bytes=size * 1.5)
+    df.plot_bokeh.hist(show_figure=False, return_html=True, title="Other")
+    assert (
+        sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory))
+        <= size * 1.5
+    )
+
+    pandas_bokeh.clear_cache()
+    assert os.listdir(directory) == []
+
+
+def test_cache_disabled(df):
+    df.plot_bokeh.line(y="A", show_figure=False)
+    assert pandas_bokeh.cache_info()[:3] == (0, 0, 0)
+    with pytest.raises(ValueError):
+        pandas_bokeh.set_option(cache=42)
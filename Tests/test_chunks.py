@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pandas_bokeh
+from pandas_bokeh.chunks import _HistReducer
+
+
+@pytest.fixture
+def df():
+    np.random.seed(42)
+    n = 50_000
+    return pd.DataFrame(
+        {
+            "time": pd.date_range("2020-01-01", periods=n, freq="s"),
+            "A": np.random.randn(n).cumsum(),
+            "B": np.random.rand(n),
+            "C": np.random.choice(list("abcdef"), n, p=[0.4, 0.2, 0.1, 0.1, 0.1, 0.1]),
+        }
+    )
+
+
+def _chunks(df, chunksize=5_000):
+    return (df.iloc[i : i + chunksize] for i in range(0, len(df), chunksize))
+
+
+def test_line_m4(df):
+    p = pandas_bokeh.plot_chunks(
+        _chunks(df), kind="line", x="time", y="A", buckets=200, show_figure=False
+    )
+    data = p.renderers[0].data_source.data
+    assert len(data["A"]) <= 4 * 200
+    # The extremes and the first and last row are kept:
+    assert data["A"].max() == df["A"].max()
+    assert data["A"].min() == df["A"].min()
+    assert data["__x__values"][0] == df["time"].iloc[0]
+    assert data["__x__values"][-1] == df["time"].iloc[-1]
+
+    # With <xlim>, only the rows in the range are plotted:
+    xlim = (df["time"].iloc[1000], df["time"].iloc[2000])
+    p = pandas_bokeh.plot_chunks(
+        _chunks(df), kind="line", x="time", y="A", xlim=xlim, show_figure=False
+    )
+    x = p.renderers[0].data_source.data["__x__values"]
+    assert len(x) == 1001
+    assert x[0] == xlim[0]
+
+
+def test_hist(df):
+    # Fixed bins are exact:
+    edges = np.linspace(0, 1, 11)
+    p = pandas_bokeh.plot_chunks(
+        _chunks(df), kind="hist", y="B", bins=edges, show_figure=False
+    )
+    expected, _ = np.histogram(df["B"], bins=edges)
+    assert list(p.renderers[0].data_source.data["top"]) == list(expected)
+
+    # Streaming bins of equal width cover all values:
+    reducer = _HistReducer(y="A", bins=20, weights=None)
+    for chunk in _chunks(df):
+        reducer.add(chunk)
+    edges, [counts], [average] = reducer.result()
+    assert len(edges) - 1 <= 20
+    assert np.allclose(np.diff(edges), edges[1] - edges[0])
+    assert edges[0] <= df["A"].min() and df["A"].max() < edges[-1]
+    assert counts.sum() == len(df)
+    assert average == pytest.approx(df["A"].mean())
+
+
+def test_scatter_grid(df):
+    p = pandas_bokeh.plot_chunks(
+        _chunks(df), kind="scatter", x="A", y="B", buckets=50, show_figure=False
+    )
+    data = p.renderers[0].data_source.data
+    assert data["count"].sum() == len(df)
+    assert len(data["count"]) <= 50 * 50
+
+
+def test_bar_top_k(df):
+    p = pandas_bokeh.plot_chunks(
+        _chunks(df), kind="bar", x="C", y="B", top_k=3, show_figure=False
+    )
+    data = p.renderers[0].data_source.data
+    expected = df.groupby("C")["B"].sum().nlargest(3)
+    assert list(data["__x__values_original"]) == list(expected.index)
+    assert np.allclose(data["B"], expected.values)
+
+    # Without numeric columns, the rows of each category are counted:
+    p = pandas_bokeh.plot_chunks(
+        _chunks(df[["C"]]), kind="barh", x="C", top_k=2, show_figure=False
+    )
+    assert list(p.renderers[0].data_source.data["count"]) == list(
+        df["C"].value_counts().head(2)
+    )
+
+
+def test_bar_all_categories():
+    df = pd.DataFrame({"k": np.arange(3000) % 30, "v": np.ones(3000)})
+    p = pandas_bokeh.plot_chunks(
+        _chunks(df), kind="bar", x="k", y="v", show_figure=False
+    )
+    # Without <top_k>, all categories are plotted with exact sums:
+    data = p.renderers[0].data_source.data
+    assert sorted(data["__x__values_original"]) == list(range(30))
+    assert np.all(data["v"] == 100)
+
+
+def test_errors(df):
+    with pytest.raises(ValueError):
+        pandas_bokeh.plot_chunks(_chunks(df), kind="pie")
+    with pytest.raises(ValueError):
+        pandas_bokeh.plot_chunks(_chunks(df), kind="scatter", x="A")
+    with pytest.raises(ValueError):
+        pandas_bokeh.plot_chunks(iter([]), kind="line")
@@ -0,0 +1,105 @@
+import html
+import json
+import re
+import shutil
+import subprocess
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pandas_bokeh
+from pandas_bokeh.compress import _inflate_payload
+
+
+def _figure():
+    df = pd.DataFrame(
+        {"A": np.sin(np.arange(5000) / 100).round(2), "B": np.arange(5000)}
+    )
+    return df.plot_bokeh.line(show_figure=False, title="Compressed")
+
+
+def _documents(page):
+    "Returns the serialized documents (without their ids) of an HTML page."
+
+    match = re.search(r'const payload = "([^"]*)";', page)
+    if match is not None:
+        docs_json = _inflate_payload(match.group(1))
+    else:
+        docs_json = re.search(r"const docs_json = '(.*)';", page).group(1)
+        docs_json = json.loads(html.unescape(docs_json.replace("\\\\", "\\")))
+    return list(docs_json.values())
+
+
+# Minimal browser environment to run the loader script of a page with Node.js:
+_BROWSER_STUB_JS = """\
+globalThis.window = globalThis;
+globalThis.Bokeh = {
+  safely: function(fn) { fn(); },
+  embed: {embed_items: function(docs_json) {
+    console.log("EMBEDDED " + Object.keys(docs_json).length);
+  }},
+};
+globalThis.document = {
+  readyState: "complete",
+  createElement: function() { return {style: {}}; },
+  body: {appendChild: function(element) { console.log(element.textContent); }},
+};
+"""
+
+
+def _run_loader(page):
+    "Runs the loader script of <page> with Node.js and returns its stdout."
+
+    script = re.search(
+        r'<script type="text/javascript">(.*?)</script>', page, re.S
+    ).group(1)
+    result = subprocess.run(
+        ["node", "-e", _BROWSER_STUB_JS + script],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=60,
+    )
+    return result.stdout
+
+
+def test_round_trip():
+    p = _figure()
+    page = pandas_bokeh.embedded_html(p)
+    compressed_page = pandas_bokeh.embedded_html(p, compress=True)
+
+    assert "DecompressionStream" in compressed_page
+    assert "const docs_json = '" not in compressed_page
+    assert len(compressed_page) < len(page) / 2
+    assert _documents(compressed_page) == _documents(page)
+    # The same root div is used:
+    div_pattern = r'<div class="bk-root" id="[^"]*" data-root-id="(\w+)">'
+    assert re.findall(div_pattern, compressed_page) == re.findall(div_pattern, page)
+
+
+def test_report_and_output_file(tmp_path):
+    p = _figure()
+    report = pandas_bokeh.Report(compress=True).add(p)
+    assert _documents(report.to_html()) == _documents(pandas_bokeh.embedded_html(p))
+
+    filename = str(tmp_path / "compressed.html")
+    with pandas_bokeh.output_to(filename, compress=True):
+        pandas_bokeh.show(p, browser="none")
+    with open(filename, encoding="utf-8") as f:
+        page = f.read()
+    assert page.startswith("<!DOCTYPE html>")
+    assert "DecompressionStream" in page
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="Node.js is not installed")
+def test_loader_reports_failures():
+    page = pandas_bokeh.embedded_html(_figure(), compress=True)
+    assert _run_loader(page).strip() == "EMBEDDED 1"
+
+    corrupted_page = re.sub(
+        r'const payload = "([^"]{8})', r'const payload = "AAAAAAAA', page
+    )
+    output = _run_loader(corrupted_page)
+    assert "EMBEDDED" not in output
+    assert "Bokeh: loading the compressed document failed:" in output
@@ -0,0 +1,113 @@
+import pytest
+
+import pandas_bokeh
+
+
+@pytest.fixture(autouse=True)
+def reset_options():
+    yield
+    pandas_bokeh.reset_option("all")
+
+
+def test_get_set_reset_option():
+    assert pandas_bokeh.get_option("precision") == "float64"
+
+    pandas_bokeh.set_option("precision", "float32", "webgl", False)
+    assert pandas_bokeh.get_option("precision") == "float32"
+    assert pandas_bokeh.options.webgl is False
+
+    pandas_bokeh.set_option(max_payload_bytes=None)
+    assert pandas_bokeh.options.max_payload_bytes is None
+
+    pandas_bokeh.options.hover = "off"
+    assert pandas_bokeh.get_option("hover") == "off"
+
+    pandas_bokeh.reset_option("precision")
+    assert pandas_bokeh.options.precision == "float64"
+    assert pandas_bokeh.options.webgl is False
+    pandas_bokeh.reset_option()
+    assert pandas_bokeh.options.webgl is True
+
+
+def test_option_context():
+    with pandas_bokeh.option_context("precision", "int16", downsampling="minmax"):
+        assert pandas_bokeh.options.precision == "int16"
+        assert pandas_bokeh.options.downsampling == "minmax"
+        with pandas_bokeh.option_context(precision="float32"):
+            assert pandas_bokeh.options.precision == "float32"
+        assert pandas_bokeh.options.precision == "int16"
+    assert pandas_bokeh.options.precision == "float64"
+    assert pandas_bokeh.options.downsampling == "lttb"
+
+    # Options are restored after exceptions:
+    with pytest.raises(RuntimeError):
+        with pandas_bokeh.option_context(max_points=10):
+            raise RuntimeError()
+    assert pandas_bokeh.options.max_points == 1000
+
+    # set_option in a context only changes the options of the context:
+    with pandas_bokeh.option_context(precision="int16"):
+        pandas_bokeh.set_option(precision="float32", webgl=False)
+        assert pandas_bokeh.options.precision == "float32"
+        assert pandas_bokeh.options.webgl is False
+    assert pandas_bokeh.options.precision == "float64"
+    assert pandas_bokeh.options.webgl is True
+
+
+def test_max_points_without_limit():
+    pandas_bokeh.set_option(max_points=float("inf"))
+    assert pandas_bokeh.options.max_points == float("inf")
+    pandas_bokeh.set_option(max_points=None)
+    assert pandas_bokeh.options.max_points is None
+
+
+@pytest.mark.parametrize(
+    "name,value",
+    [
+        ("precision", "float16"),
+        ("webgl", "yes"),
+        ("max_payload_bytes", -1),
+        ("max_points", 1),
+        ("downsampling", "every_nth"),
+        ("hover", True),
+    ],
+)
+def test_invalid_option_values(name, value):
+    with pytest.raises(ValueError):
+        pandas_bokeh.set_option(name, value)
+    # Invalid values in a context are rejected before any option is changed:
+    with pytest.raises(ValueError):
+        with pandas_bokeh.option_context("webgl", False, name, value):
+            pass
+    assert pandas_bokeh.options.webgl is True
+
+
+def test_unknown_options():
+    with pytest.raises(ValueError, match="Unknown option"):
+        pandas_bokeh.get_option("unknown_option")
+    with pytest.raises(ValueError):
+        pandas_bokeh.set_option("precision")
+    with pytest.raises(AttributeError):
+        pandas_bokeh.options.unknown_option = 10
+
+
+def test_describe_option():
+    assert "[default: 'float64'] [currently: 'float64']" in (
+        pandas_bokeh.describe_option("precision")
+    )
+    for name in dir(pandas_bokeh.options):
+        assert name in repr(pandas_bokeh.options)
+
+
+def test_option_context_is_context_local():
+    import threading
+
+    values = []
+    with pandas_bokeh.option_context(precision="int16"):
+        thread = threading.Thread(
+            target=lambda: values.append(pandas_bokeh.options.precision)
+        )
+        thread.start()
+        thread.join()
+        assert pandas_bokeh.options.precision == "int16"
+    assert values == ["float64"]
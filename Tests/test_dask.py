@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pandas_bokeh
+
+dd = pytest.importorskip("dask.dataframe")
+
+
+@pytest.fixture
+def df():
+    np.random.seed(42)
+    n = 50_000
+    return pd.DataFrame(
+        {
+            "time": pd.date_range("2020-01-01", periods=n, freq="s"),
+            "A": np.random.randn(n).cumsum(),
+            "B": np.random.rand(n),
+            "C": np.random.choice(list("abcdef"), n, p=[0.4, 0.2, 0.1, 0.1, 0.1, 0.1]),
+        }
+    )
+
+
+@pytest.fixture
+def ddf(df):
+    return dd.from_pandas(df, npartitions=8)
+
+
+def _data(p):
+    return p.renderers[0].data_source.data
+
+
+def test_line_m4(df, ddf):
+    p = ddf.plot_bokeh.line(x="time", y="A", buckets=200, show_figure=False)
+    data = _data(p)
+    assert len(data["A"]) <= 4 * 200
+    assert data["A"].max() == df["A"].max()
+    assert data["A"].min() == df["A"].min()
+    assert data["__x__values"][0] == df["time"].iloc[0]
+    assert data["__x__values"][-1] == df["time"].iloc[-1]
+
+
+def test_hist(df, ddf):
+    p = ddf.plot_bokeh.hist(y="B", bins=7, show_figure=False)
+    expected, _ = np.histogram(df["B"], bins=7)
+    assert list(_data(p)["top"]) == list(expected)
+
+
+def test_scatter_grid(df, ddf):
+    p = ddf.plot_bokeh.scatter(x="A", y="B", buckets=50, show_figure=False)
+    data = _data(p)
+    assert data["count"].sum() == len(df)
+    assert len(data["count"]) <= 50 * 50
+
+
+def test_bar_top_k(df, ddf):
+    p = ddf.plot_bokeh.bar(x="C", y="B", top_k=3, show_figure=False)
+    expected = df.groupby("C")["B"].sum().nlargest(3)
+    assert list(_data(p)["__x__values_original"]) == list(expected.index)
+    assert np.allclose(_data(p)["B"], expected.values)
+
+
+def test_bar_all_categories():
+    df = pd.DataFrame({"k": np.arange(3000) % 30, "v": np.ones(3000)})
+    p = dd.from_pandas(df, npartitions=4).plot_bokeh.bar(
+        x="k", y="v", show_figure=False
+    )
+    # Without <top_k>, all categories are plotted with exact sums:
+    assert sorted(_data(p)["__x__values_original"]) == list(range(30))
+    assert np.all(_data(p)["v"] == 100)
+
+
+def test_other_kinds(df, ddf):
+    p = ddf.plot_bokeh(kind="area", x="time", y=["A", "B"], show_figure=False)
+    assert {"A", "B"} <= set(_data(p))
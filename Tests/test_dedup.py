@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+from bokeh.models import ColumnDataSource, GlyphRenderer
+from bokeh.plotting import figure
+
+import pandas_bokeh
+
+
+def _frame():
+    return pd.DataFrame(
+        {"a": np.arange(500.0), "b": np.sin(np.arange(500.0)), "c": np.arange(500)},
+        index=pd.date_range("2020-01-01", periods=500, freq="H"),
+    )
+
+
+def _sources(layout):
+    return [
+        model for model in layout.references() if isinstance(model, ColumnDataSource)
+    ]
+
+
+def _rendered_data(layout):
+    "Returns the data of each glyph renderer (by its y-field)."
+
+    return [
+        {
+            name: np.asarray(renderer.data_source.data[name]).tolist()
+            for name in ("__x__values", renderer.glyph.y)
+        }
+        for renderer in layout.select({"type": GlyphRenderer})
+    ]
+
+
+def test_grid_of_same_frame():
+    df = _frame()
+    plots = [
+        df.plot_bokeh(kind=kind, y=y, show_figure=False)
+        for kind in ("line", "point", "step")
+        for y in ("a", "b")
+    ]
+    layout = pandas_bokeh.plot_grid(plots, ncols=2, show_plot=False)
+    expected = _rendered_data(layout)
+
+    result = pandas_bokeh.deduplicate_sources(layout)
+    assert result.sources_before == 6
+    assert result.sources_after == len(_sources(layout)) == 1
+    assert result.bytes_saved > 5 * 500 * 8
+    assert _rendered_data(layout) == expected
+
+    # A second pass has nothing to merge:
+    result = pandas_bokeh.deduplicate_sources(layout)
+    assert result.sources_before == result.sources_after == 1
+    assert result.bytes_saved == 0
+
+
+def test_different_data_is_not_merged():
+    df = _frame()
+    p1 = df.plot_bokeh(kind="line", y="a", show_figure=False)
+    p2 = (df + 1).plot_bokeh(kind="line", y="a", show_figure=False)
+    p3 = df.iloc[:100].plot_bokeh(kind="line", y="a", show_figure=False)
+    layout = pandas_bokeh.plot_grid([[p1, p2, p3]], show_plot=False, deduplicate=True)
+    assert len(_sources(layout)) == 3
+
+
+def test_sources_without_common_columns_are_not_merged():
+    p1 = figure()
+    p1.line(x="x1", y="y1", source=ColumnDataSource({"x1": [0, 1], "y1": [2, 3]}))
+    p2 = figure()
+    p2.line(x="x2", y="y2", source=ColumnDataSource({"x2": [4, 5], "y2": [6, 7]}))
+
+    result = pandas_bokeh.deduplicate_sources([p1, p2])
+    assert result.sources_after == 2
+    assert p1.renderers[0].data_source is not p2.renderers[0].data_source
+
+
+def test_report_deduplicates_batches():
+    df = _frame()
+    report = pandas_bokeh.Report(deduplicate=True)
+    for y in ("a", "b", "c"):
+        report.add(df.plot_bokeh(kind="line", y=y, show_figure=False))
+    html = report.to_html()
+    assert report.bytes_saved > 0
+    assert html.count('"type":"ColumnDataSource"') == 1
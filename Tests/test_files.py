@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pandas_bokeh
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def df():
+    np.random.seed(42)
+    n = 20_000
+    return pd.DataFrame(
+        {
+            "A": np.random.randn(n).cumsum(),
+            "B": np.random.rand(n),
+            "sensor": np.repeat(["s1", "s2"], n // 2),
+            "unused": np.random.rand(n),
+        },
+        index=pd.date_range("2020-01-01", periods=n, freq="s", name="time"),
+    )
+
+
+def test_plot_parquet(df, tmp_path, monkeypatch):
+    path = tmp_path / "data.parquet"
+    pq.write_table(pa.Table.from_pandas(df), path, row_group_size=2_000)
+
+    # Record the batches read from the file:
+    read_chunks = []
+    plot_chunks = pandas_bokeh.files.plot_chunks
+
+    def recording_plot_chunks(chunks, **kwargs):
+        def record(chunks):
+            for chunk in chunks:
+                read_chunks.append(chunk)
+                yield chunk
+
+        return plot_chunks(record(chunks), **kwargs)
+
+    monkeypatch.setattr(pandas_bokeh.files, "plot_chunks", recording_plot_chunks)
+    p = pandas_bokeh.plot_file(
+        path,
+        kind="line",
+        y="A",
+        filters=[("sensor", "==", "s2")],
+        batch_size=1_000,
+        show_figure=False,
+    )
+
+    # Only the needed columns and rows are read, the index is restored:
+    assert all(list(chunk.columns) == ["A"] for chunk in read_chunks)
+    assert sum(len(chunk) for chunk in read_chunks) == len(df) // 2
+    assert read_chunks[0].index.name == "time"
+    data = p.renderers[0].data_source.data
+    assert data["A"].max() == df["A"].iloc[len(df) // 2 :].max()
+
+
+def test_plot_feather(df, tmp_path):
+    path = tmp_path / "data.feather"
+    df.reset_index().to_feather(path)
+
+    p = pandas_bokeh.plot_file(
+        path, kind="hist", y="B", bins=np.linspace(0, 1, 5), show_figure=False
+    )
+    expected, _ = np.histogram(df["B"], bins=np.linspace(0, 1, 5))
+    assert list(p.renderers[0].data_source.data["top"]) == list(expected)
+
+    # Other plot kinds read the projected table at once:
+    p = pandas_bokeh.plot_file(
+        path, kind="area", x="time", y=["A", "B"], show_figure=False
+    )
+    assert set(p.renderers[0].data_source.data) == {
+        "A",
+        "B",
+        "__x__values",
+        "__x__values_original",
+    }
+
+    with pytest.raises(ValueError):
+        pandas_bokeh.plot_file(path, kind="line", x="time", y="missing")
+
+
+def test_plot_file_projection_of_plot_arguments(df, tmp_path):
+    path = tmp_path / "data.parquet"
+    pq.write_table(pa.Table.from_pandas(df), path)
+
+    # Columns named by other plot arguments than <x> and <y> are read, too:
+    p = pandas_bokeh.plot_file(path, kind="kde", y="A", by="sensor", show_figure=False)
+    assert {"s1", "s2"} <= set(p.renderers[0].data_source.data)
+
+    schema = pq.read_schema(path)
+    columns = pandas_bokeh.files._projected_columns(
+        schema, "A", "B", {"category": "sensor", "hovertool_string": "@{unused}"}
+    )
+    assert columns == ["time", "A", "B", "sensor", "unused"]
+
+    p = pandas_bokeh.plot_file(
+        path, kind="area", y="A", hovertool_string="@{sensor}", show_figure=False
+    )
+    assert "sensor" in p.renderers[0].data_source.data
+
+    p = pandas_bokeh.plot_file(
+        path, kind="area", y="A", freq="1min", agg={"A": "max"}, show_figure=False
+    )
+    assert p.renderers[0].data_source.data["A"].max() == df["A"].max()
+
+
+def test_plot_file_range_index(tmp_path, monkeypatch):
+    df = pd.DataFrame({"A": np.arange(10.0)}, index=pd.RangeIndex(5, 25, 2))
+    path = tmp_path / "data.parquet"
+    df.to_parquet(path)
+
+    read_chunks = []
+    plot_chunks = pandas_bokeh.files.plot_chunks
+
+    def recording_plot_chunks(chunks, **kwargs):
+        def record(chunks):
+            for chunk in chunks:
+                read_chunks.append(chunk)
+                yield chunk
+
+        return plot_chunks(record(chunks), **kwargs)
+
+    monkeypatch.setattr(pandas_bokeh.files, "plot_chunks", recording_plot_chunks)
+    p = pandas_bokeh.plot_file(
+        path, kind="line", y="A", batch_size=4, buckets=1, show_figure=False
+    )
+
+    # The RangeIndex (only stored as metadata) is continued across the batches:
+    assert len(read_chunks) == 3
+    index = np.concatenate([chunk.index for chunk in read_chunks])
+    np.testing.assert_array_equal(index, df.index)
+    data = p.renderers[0].data_source.data
+    np.testing.assert_array_equal(data["__x__values"], [5, 23])
+    np.testing.assert_array_equal(data["A"], [0, 9])
+
+    with pytest.raises(ValueError):
+        pandas_bokeh.plot_file(
+            path, kind="line", y="A", filters=[("A", ">", 3)], show_figure=False
+        )
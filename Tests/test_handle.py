@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from bokeh.document import Document
+from bokeh.document.events import ColumnsPatchedEvent, ColumnsStreamedEvent
+
+import pandas_bokeh
+from pandas_bokeh.handle import _source_delta
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {"A": np.arange(10.0), "B": np.arange(10.0) ** 2},
+        index=pd.date_range("2020-01-01", periods=10, freq="D"),
+    )
+
+
+def _recorded_events(handle):
+    "Adds the figure of <handle> to a document and returns the list of its events."
+
+    doc = Document()
+    doc.add_root(handle.figure)
+    events = []
+    # Stream and patch events are sent as hints of the change events:
+    doc.on_change(lambda event: events.append(getattr(event, "hint", None) or event))
+    return events
+
+
+def test_append_and_patch(df):
+    handle = df.plot_bokeh.line(notebook_handle=True, show_figure=False)
+    assert isinstance(handle, pandas_bokeh.PlotHandle)
+    assert handle.comms_handle is None
+    events = _recorded_events(handle)
+    source = handle.figure.renderers[0].data_source
+
+    # Unchanged data sends nothing:
+    handle.update(df.copy())
+    assert events == []
+
+    # New rows are streamed:
+    tail = pd.DataFrame(
+        {"A": [10.0, 11.0], "B": [100.0, 121.0]},
+        index=pd.date_range("2020-01-11", periods=2, freq="D"),
+    )
+    handle.append(tail)
+    # One stream per line:
+    assert len(events) == 2
+    assert all(isinstance(event, ColumnsStreamedEvent) for event in events)
+    assert len(events[0].data["A"]) == 2
+    assert len(source.data["A"]) == 12
+    assert len(handle.df) == 12
+
+    # Changed values are patched:
+    handle.patch(pd.DataFrame({"B": [-1.0]}, index=[df.index[3]]))
+    assert len(events) == 4
+    assert isinstance(events[-1], ColumnsPatchedEvent)
+    assert list(events[-1].patches) == ["B"]
+    assert source.data["B"][3] == -1.0
+    assert source.data["A"][3] == 3.0
+
+
+def test_source_delta():
+    old = {"x": np.arange(6), "y": np.array([1.0, 2, 3, 4, 5, np.nan])}
+    assert _source_delta(old, {k: v.copy() for k, v in old.items()}) is None
+
+    new = {"x": np.arange(7), "y": np.array([1.0, 9, 9, 4, 5, np.nan, 7])}
+    kind, (new_rows, patches) = _source_delta(old, new)
+    assert kind == "stream+patch"
+    assert list(new_rows["x"]) == [6]
+    # Consecutive changed rows are patched with a single slice:
+    [(rows, values)] = patches["y"]
+    assert rows == slice(1, 3)
+    assert list(values) == [9, 9]
+
+    assert _source_delta(old, {"x": np.arange(3), "y": np.ones(3)})[0] == "replace"
+
+
+def test_handle_errors(df):
+    with pytest.raises(ValueError):
+        df.plot_bokeh.line(notebook_handle=True, return_html=True, show_figure=False)
+
+    df_bar = pd.DataFrame({"A": [1, 2]}, index=["a", "b"])
+    handle = df_bar.plot_bokeh.bar(notebook_handle=True, show_figure=False)
+    # New categories change the axis of the plot:
+    with pytest.raises(ValueError):
+        handle.append(pd.DataFrame({"A": [3]}, index=["c"]))
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pandas_bokeh
+
+pl = pytest.importorskip("polars")
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def df():
+    n = 50_000
+    rng = np.random.default_rng(42)
+    return pl.DataFrame(
+        {
+            "time": pd.date_range("2020-01-01", periods=n, freq="s"),
+            "A": rng.standard_normal(n).cumsum(),
+            "B": rng.random(n),
+            "C": rng.choice(list("abcdef"), n),
+        }
+    )
+
+
+def _data(p):
+    return p.renderers[0].data_source.data
+
+
+def test_line(df):
+    # Small frames are plotted as they are, sharing the buffers of Polars:
+    small = df.head(1000)
+    p = small.plot_bokeh.line(x="time", y="A", show_figure=False)
+    assert np.shares_memory(_data(p)["A"], small["A"].to_numpy())
+
+    # Large frames are reduced to M4 buckets:
+    p = df.plot_bokeh.line(x="time", y="A", buckets=200, show_figure=False)
+    data = _data(p)
+    assert len(data["A"]) <= 4 * 200
+    assert data["A"].max() == df["A"].max()
+    assert data["A"].min() == df["A"].min()
+
+    # Filters of LazyFrames, row numbers as x-values:
+    p = df.lazy().plot_bokeh(
+        kind="line", y="B", filters=pl.col("C") == "a", show_figure=False
+    )
+    x = _data(p)["__x__values"]
+    rows = np.flatnonzero(df["C"].to_numpy() == "a")
+    assert np.all(np.isin(x, rows))
+    assert x[0] == rows[0] and x[-1] == rows[-1]
+
+
+def test_scatter_grid(df):
+    p = df.plot_bokeh.scatter(x="A", y="B", buckets=50, show_figure=False)
+    data = _data(p)
+    assert data["count"].sum() == len(df)
+    assert len(data["count"]) <= 50 * 50
+
+
+def test_hist(df):
+    edges = np.linspace(0, 1, 11)
+    p = df.plot_bokeh.hist(y="B", bins=edges, show_figure=False)
+    expected, _ = np.histogram(df["B"].to_numpy(), bins=edges)
+    assert list(_data(p)["top"]) == list(expected)
+
+    p = df.lazy().plot_bokeh.hist(y="A", bins=7, show_figure=False)
+    expected, _ = np.histogram(df["A"].to_numpy(), bins=7)
+    assert list(_data(p)["top"]) == list(expected)
+
+
+def test_bar(df):
+    p = df.plot_bokeh.bar(x="C", y="B", top_k=3, show_figure=False)
+    expected = df.to_pandas().groupby("C")["B"].sum().nlargest(3)
+    assert list(_data(p)["__x__values_original"]) == list(expected.index)
+    assert np.allclose(_data(p)["B"], expected.values)
+
+    p = df.select("C").plot_bokeh.barh(x="C", show_figure=False)
+    assert _data(p)["count"].sum() == len(df)
+
+
+def test_other_kinds(df):
+    p = df.head(100).plot_bokeh.area(x="time", y=["A", "B"], show_figure=False)
+    assert {"A", "B"} <= set(_data(p))
+    assert isinstance(df.plot_bokeh.df, pd.DataFrame)
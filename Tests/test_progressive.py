@@ -0,0 +1,85 @@
+import json
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+from bokeh.models import ColumnDataSource
+
+import pandas_bokeh
+from pandas_bokeh.sidecar import _decode_sidecar
+
+
+@pytest.fixture
+def df():
+    np.random.seed(42)
+    return pd.DataFrame(
+        {
+            "A": np.random.randn(20_000).cumsum(),
+            "B": np.random.rand(20_000),
+            "C": np.random.choice(["x", "y", "z"], 20_000),
+        },
+        index=pd.date_range("2020-01-01", periods=20_000, freq="min"),
+    )
+
+
+def _sources(p):
+    return p.select({"type": ColumnDataSource})
+
+
+def test_progressive_line(df, tmp_path):
+    p = df.plot_bokeh.line(y=["A", "B"], progressive=400, show_figure=False)
+    (source,) = _sources(p)
+    n_coarse = len(source.data["A"])
+    assert 100 < n_coarse <= 400
+    # The coarse data keeps the extrema of the lines:
+    assert source.data["A"].max() == df["A"].max()
+
+    with pandas_bokeh.option_context(progressive_chunk_rows=8_000):
+        report = pandas_bokeh.Report(data="sidecar", data_dir=str(tmp_path))
+        page = report.add(p).to_html()
+    (sidecar,) = json.loads(re.search(r"const sidecars = (.*);", page).group(1))
+    assert sidecar["id"] == source.id
+    urls = [chunk["url"] for chunk in sidecar["chunks"]]
+    assert len(urls) == 3
+    assert all(url.startswith(f"{tmp_path.name}/") for url in urls)
+    assert sidecar["chunks"][-1]["cut"] == n_coarse
+
+    chunks = [
+        _decode_sidecar((tmp_path / url.split("/")[-1]).read_bytes()) for url in urls
+    ]
+    for col in ["A", "B"]:
+        full = np.concatenate([chunk[col] for chunk in chunks])
+        np.testing.assert_array_equal(full, df[col].values)
+    # The coarse rows before the end of each chunk are replaced by the chunk:
+    x = source.data["__x__values"].astype("datetime64[ms]").astype(float)
+    for chunk, description in zip(chunks, sidecar["chunks"]):
+        assert np.searchsorted(x, chunk["__x__values"][-1], "right") == (
+            description["cut"]
+        )
+
+
+def test_progressive_scatter(df):
+    p = df.plot_bokeh.scatter(
+        x="A", y="B", category="C", progressive=300, show_figure=False
+    )
+    sources = _sources(p)
+    assert len(sources) == 3
+    assert 250 < sum(len(source.data["y"]) for source in sources) <= 300
+
+    # Small plots are not reduced:
+    p = df.iloc[:100].plot_bokeh.point(progressive=True, show_figure=False)
+    assert len(_sources(p)[0].data["A"]) == 100
+
+
+def test_progressive_options(df):
+    with pytest.raises(ValueError, match="progressive"):
+        df.plot_bokeh.bar(progressive=True, show_figure=False)
+    with pytest.raises(ValueError):
+        df.plot_bokeh.line(progressive=1, show_figure=False)
+
+    # Progressive plots are not cached:
+    with pandas_bokeh.option_context(cache="memory"):
+        pandas_bokeh.clear_cache()
+        df.plot_bokeh.line(progressive=True, show_figure=False)
+        assert pandas_bokeh.cache_info().entries == 0
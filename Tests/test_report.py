@@ -0,0 +1,68 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from bokeh.layouts import row
+
+import pandas_bokeh
+
+
+@pytest.fixture
+def figures():
+    np.random.seed(42)
+    df = pd.DataFrame({"A": np.random.randn(50).cumsum(), "B": np.random.rand(50)})
+    return [
+        df.plot_bokeh.line(show_figure=False, title=f"Figure {i}") for i in range(5)
+    ]
+
+
+def test_report(figures):
+    report = pandas_bokeh.Report(title="Report <1>")
+    report.add_heading("Lines & more").add(figures[0])
+    report.add(row(figures[1], figures[2]), heading="Row")
+    report.add_html("<p>Text</p>")
+    page = report.to_html()
+
+    assert "<title>Report &lt;1&gt;</title>" in page
+    assert page.count("bokeh-2.4.3.min.js") == 1
+    # All figures are serialized in a single document:
+    assert page.count("embed_items") == 1
+    assert page.count('class="bk-root"') == 2
+    positions = [
+        page.index(text)
+        for text in ["<h2>Lines &amp; more</h2>", "<h2>Row</h2>", "<p>Text</p>"]
+    ]
+    assert positions == sorted(positions)
+
+    # Writing the page does not consume the items:
+    assert report.to_html().count('class="bk-root"') == 2
+
+
+def test_report_streaming(figures):
+    f = io.StringIO()
+    with pandas_bokeh.Report(f, batch_size=2) as report:
+        for i, p in enumerate(figures):
+            report.add(p, heading=f"Heading {i}")
+            if i == 1:
+                # The first batch has already been written:
+                assert f.getvalue().count("embed_items") == 1
+                assert report._items == []
+    page = f.getvalue()
+
+    assert page.endswith("</html>\n")
+    assert page.count("embed_items") == 3
+    assert page.count('class="bk-root"') == 5
+    with pytest.raises(ValueError):
+        report.add(figures[0])
+
+
+def test_report_errors(figures):
+    with pytest.raises(ValueError):
+        pandas_bokeh.Report().add("no figure")
+    with pytest.raises(ValueError):
+        pandas_bokeh.Report().add_heading("Heading", level=7)
+    with pytest.raises(ValueError):
+        pandas_bokeh.Report(batch_size=0)
+    with pytest.raises(ValueError):
+        pandas_bokeh.Report(io.StringIO()).to_html()
@@ -0,0 +1,138 @@
+import functools
+import html
+import http.server
+import json
+import re
+import threading
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+from bokeh.plotting import figure
+
+import pandas_bokeh
+from pandas_bokeh.sidecar import _decode_sidecar, _encode_sidecar
+
+
+@pytest.fixture
+def server(tmp_path):
+    "Serves <tmp_path> with a local http.server."
+
+    handler = functools.partial(
+        http.server.SimpleHTTPRequestHandler, directory=str(tmp_path)
+    )
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    handler.log_message = lambda *args: None
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _get(url):
+    with urllib.request.urlopen(url) as response:
+        return response.read()
+
+
+def test_encode_decode_sidecar():
+    data = {
+        "float": np.array([1.5, np.nan, 3.0]),
+        "int": np.array([1, 2, 3], dtype=np.int64),
+        "large": np.array([0, 2**40, 1], dtype=np.int64),
+        "float32": np.array([1, 2, 3], dtype=np.float32),
+        "time": pd.date_range("2020-01-01", periods=3).values,
+        "text": np.array(["a", "b", None], dtype=object),
+    }
+    decoded = _decode_sidecar(_encode_sidecar(data))
+
+    assert list(decoded) == list(data)
+    np.testing.assert_array_equal(decoded["float"], data["float"])
+    assert decoded["int"].dtype == np.int32
+    np.testing.assert_array_equal(decoded["large"], data["large"])
+    assert decoded["float32"].dtype == np.float32
+    assert decoded["time"][1] == pd.Timestamp("2020-01-02").value / 1e6
+    assert decoded["text"] == ["a", "b", None]
+    for column in decoded.values():
+        if isinstance(column, np.ndarray):
+            assert column.ctypes.data % 8 == 0 or column.nbytes == 0
+
+    # Nested columns (e.g. of patches) are not written to sidecar files:
+    assert _encode_sidecar({"xs": [np.arange(3), np.arange(2)]}) is None
+
+
+def test_output_file_sidecar(tmp_path, server):
+    df = pd.DataFrame(
+        {"A": np.arange(2000.0), "B": np.random.rand(2000)},
+        index=pd.date_range("2020-01-01", periods=2000, freq="H"),
+    )
+    with pandas_bokeh.output_to(tmp_path / "page.html", data="sidecar"):
+        p = df.plot_bokeh.line(hovertool_string="@A")
+    source = p.renderers[0].data_source
+
+    page = _get(f"{server}/page.html").decode("utf-8")
+    sidecars = json.loads(re.search(r"const sidecars = (.*);", page).group(1))
+    (url,) = [sidecar["url"] for sidecar in sidecars if sidecar["id"] == source.id]
+    assert re.fullmatch(r"page_data/[0-9a-f]{16}\.bin", url)
+    # The page only contains empty placeholder columns:
+    assert len(page) < 20_000
+    docs_json = re.search(r"const docs_json = '(.*)';", page).group(1)
+    docs_json = json.loads(html.unescape(docs_json.replace("\\\\", "\\")))
+    (doc,) = docs_json.values()
+    (reference,) = [ref for ref in doc["roots"]["references"] if ref["id"] == source.id]
+    assert reference["attributes"]["data"] == {name: [] for name in source.data}
+
+    # The sidecar files are served next to the page:
+    for sidecar in sidecars:
+        data = _decode_sidecar(_get(f"{server}/{sidecar['url']}"))
+        assert data
+    data = _decode_sidecar(_get(f"{server}/{url}"))
+    np.testing.assert_array_equal(data["A"], df["A"].values)
+    np.testing.assert_array_equal(data["B"], df["B"].values)
+
+    # The figure itself keeps its data:
+    assert len(source.data["A"]) == 2000
+
+
+def test_sidecar_shared_data_dir(tmp_path):
+    "Test that documents writing to one data directory keep their files apart"
+
+    data_dir = str(tmp_path / "data")
+    pages = []
+    for values in [np.arange(10.0), np.arange(10.0) ** 2, np.arange(10.0)]:
+        p = figure()
+        p.line(x=np.arange(10), y=values)
+        report = pandas_bokeh.Report(data="sidecar", data_dir=data_dir).add(p)
+        page = report.to_html()
+        pages.append(json.loads(re.search(r"const sidecars = (.*);", page).group(1)))
+
+    # Files are named by their content (not by the per-process ids of the
+    # sources), so equal data shares a file and different data never collides:
+    (first,), (second,), (third,) = pages
+    assert first["url"] != second["url"]
+    assert first["url"] == third["url"]
+    assert len(list((tmp_path / "data").iterdir())) == 2
+    data = _decode_sidecar((tmp_path / first["url"]).read_bytes())
+    np.testing.assert_array_equal(data["y"], np.arange(10.0))
+
+
+def test_report_sidecar(tmp_path):
+    p = figure()
+    p.patches(xs=[[0, 1, 2], [3, 4]], ys=[[0, 1, 0], [1, 0]])
+    p.line(x=np.arange(10), y=np.arange(10))
+    report = pandas_bokeh.Report(
+        data="sidecar", data_dir=str(tmp_path / "data"), data_url="/static/data"
+    ).add(p)
+    page = report.to_html()
+
+    # Only the source of the line is written to a sidecar file:
+    sidecars = json.loads(re.search(r"const sidecars = (.*);", page).group(1))
+    assert len(sidecars) == 1
+    assert sidecars[0]["url"].startswith("/static/data/")
+    assert len(list((tmp_path / "data").iterdir())) == 1
+
+    with pytest.raises(ValueError):
+        pandas_bokeh.Report(data="sidecar")
+    with pytest.raises(ValueError):
+        pandas_bokeh.output_file(str(tmp_path / "page.html"), data="external")
@@ -0,0 +1,103 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from bokeh.model import Model
+
+import pandas_bokeh
+
+
+@pytest.fixture
+def df():
+    np.random.seed(42)
+    return pd.DataFrame(
+        {
+            "A": np.random.randn(100).cumsum(),
+            "B": np.random.rand(100),
+            "label": np.random.choice(["x", "y"], 100),
+        },
+        index=pd.date_range("2020-01-01", periods=100, freq="H"),
+    )
+
+
+def _contains_model(value):
+    if isinstance(value, Model):
+        return True
+    if isinstance(value, dict):
+        return any(_contains_model(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_contains_model(v) for v in value)
+    return False
+
+
+@pytest.mark.parametrize(
+    "kind", ["line", "step", "point", "bar", "barh", "hist", "kde", "ecdf", "area"]
+)
+def test_prepare_plot_is_picklable(df, kind):
+    spec = pandas_bokeh.prepare_plot(df[["A", "B"]], kind=kind, title="Spec")
+
+    assert isinstance(spec, pandas_bokeh.PlotSpec)
+    assert spec.kind == kind
+    assert not _contains_model(spec)
+
+    restored = pickle.loads(pickle.dumps(spec))
+    assert restored == spec
+    assert hash(restored) == hash(spec)
+    assert len({spec, restored}) == 1
+
+
+def test_render_plot(df):
+    "Test that render_plot creates the same figure as plot without changing the spec"
+
+    kwargs = dict(kind="scatter", x="A", y="B", category="label", title="Scatter")
+    spec = pandas_bokeh.prepare_plot(df, **kwargs)
+    fingerprint = spec.fingerprint
+
+    p_spec = pandas_bokeh.render_plot(spec)
+    p_plot = pandas_bokeh.plot(df, show_figure=False, **kwargs)
+    pandas_bokeh.render_plot(spec)
+    assert spec.fingerprint == fingerprint
+
+    assert p_spec.title.text == p_plot.title.text == "Scatter"
+    assert len(p_spec.renderers) == len(p_plot.renderers) == 2
+    for renderer_spec, renderer_plot in zip(p_spec.renderers, p_plot.renderers):
+        data_spec = renderer_spec.data_source.data
+        data_plot = renderer_plot.data_source.data
+        assert data_spec.keys() == data_plot.keys()
+        for key in data_plot:
+            np.testing.assert_array_equal(data_spec[key], data_plot[key])
+
+
+def test_prepare_plot_data(df):
+    "Test the data transformations of prepare_plot without Bokeh"
+
+    spec = pandas_bokeh.prepare_plot(df, kind="bar", y="A")
+    source = spec.data["source"]
+    np.testing.assert_array_equal(source["__x__values"], np.arange(len(df)))
+    np.testing.assert_array_equal(source["A"], df["A"].values)
+    assert spec.options["x_labels_dict"][1] == "2020/01/01 01:00"
+    assert spec.options["figure_options"]["y_axis_label"] == "A"
+
+    spec = pandas_bokeh.prepare_plot(df, kind="hist", y="B", bins=5, normed=100)
+    bins = np.linspace(df["B"].min(), df["B"].max(), 6)
+    np.testing.assert_array_equal(spec.data["bins"], bins)
+    aggregate, _ = np.histogram(df["B"], bins=bins)
+    np.testing.assert_allclose(spec.data["aggregates"][0], aggregate / len(df) * 100)
+    assert spec.data["aggregates"][0].sum() == pytest.approx(100)
+    assert spec.data["averages"] == [pytest.approx(df["B"].mean())]
+
+
+def test_fingerprint(df):
+    spec = pandas_bokeh.prepare_plot(df, kind="line", y="A")
+
+    assert spec == pandas_bokeh.prepare_plot(df.copy(), kind="line", y="A")
+    assert spec != pandas_bokeh.prepare_plot(df, kind="line", y="A", title="Other")
+    df_changed = df.copy()
+    df_changed.iloc[0, 0] += 1
+    assert spec != pandas_bokeh.prepare_plot(df_changed, kind="line", y="A")
+
+
+def test_prepare_map_plot(df):
+    with pytest.raises(ValueError, match="Map plots"):
+        pandas_bokeh.prepare_plot(df, kind="map", x="A", y="B")
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from pandas_bokeh.stats import _binned_kde, _ecdf, _kde_bandwidth, _kde_grid
+
+
+def _exact_kde(values, ind, bandwidth, weights=None):
+    if weights is None:
+        weights = np.ones(len(values))
+    kernel = np.exp(-0.5 * ((ind[:, None] - values[None, :]) / bandwidth) ** 2)
+    return (kernel * weights).sum(axis=1) / (
+        weights.sum() * bandwidth * np.sqrt(2 * np.pi)
+    )
+
+
+class TestBinnedKDE:
+    @pytest.mark.parametrize("bw_method", [None, "scott", "silverman", 0.2])
+    def test_binned_kde_matches_exact_kde(self, bw_method):
+        np.random.seed(42)
+        values = np.concatenate([np.random.randn(3000), np.random.randn(1000) + 5])
+        ind = _kde_grid(values.min(), values.max(), 200)
+        bandwidth = _kde_bandwidth(values, bw_method)
+
+        np.testing.assert_allclose(
+            _binned_kde(values, ind, bandwidth),
+            _exact_kde(values, ind, bandwidth),
+            atol=1e-4,
+        )
+
+    def test_binned_kde_with_weights(self):
+        np.random.seed(42)
+        values = np.random.randn(2000)
+        weights = np.random.random(2000)
+        ind = np.linspace(-4, 4, 81)
+        bandwidth = _kde_bandwidth(values, weights=weights)
+
+        np.testing.assert_allclose(
+            _binned_kde(values, ind, bandwidth, weights),
+            _exact_kde(values, ind, bandwidth, weights),
+            atol=1e-4,
+        )
+
+    @pytest.mark.parametrize("bw_method", ["unknown", -1, True])
+    def test_kde_bandwidth__raise_exception(self, bw_method):
+        with pytest.raises(ValueError):
+            _kde_bandwidth(np.random.randn(100), bw_method)
+
+    def test_kde_bandwidth__constant_values(self):
+        with pytest.raises(ValueError):
+            _kde_bandwidth(np.ones(100))
+
+    @pytest.mark.parametrize("weights", [None, np.empty(0)])
+    def test_kde_bandwidth__no_values(self, weights):
+        with pytest.raises(ValueError, match="without values"):
+            _kde_bandwidth(np.empty(0), weights=weights)
+
+
+class TestECDF:
+    @staticmethod
+    def exact_ecdf(values, weights, x):
+        return np.array([weights[values <= xi].sum() for xi in x]) / weights.sum()
+
+    @pytest.mark.parametrize("weighted", [False, True])
+    @pytest.mark.parametrize("max_points", [2, 50, 1000, None])
+    def test_ecdf_error_bound(self, weighted, max_points):
+        np.random.seed(42)
+        values = np.random.exponential(10, 5000)
+        weights = np.random.random(5000) if weighted else None
+        x, y = _ecdf(values, weights, max_points)
+
+        if max_points is None:
+            assert len(x) == len(values)
+        else:
+            assert len(x) <= max_points
+        assert np.all(np.diff(x) >= 0)
+        assert x[0] == values.min() and x[-1] == values.max()
+        assert y[-1] == pytest.approx(1)
+
+        # Vertices lie exactly on the ECDF:
+        exact_weights = np.ones(len(values)) if weights is None else weights
+        np.testing.assert_allclose(y, self.exact_ecdf(values, exact_weights, x))
+
+        # Between vertices, the step curve deviates less than the grid spacing:
+        if max_points is not None:
+            probe = np.sort(values)
+            step_y = y[np.searchsorted(x, probe, side="right") - 1]
+            deviation = self.exact_ecdf(values, exact_weights, probe) - step_y
+            assert deviation.max() <= 1 / (max_points - 1) + 1e-12
+
+    @pytest.mark.parametrize("weighted", [False, True])
+    @pytest.mark.parametrize("max_points", [100, None])
+    def test_ecdf__empty(self, weighted, max_points):
+        x, y = _ecdf(np.empty(0), np.empty(0) if weighted else None, max_points)
+        assert len(x) == 0 and len(y) == 0
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from bokeh.document import Document
+
+import pandas_bokeh
+
+
+def _batches(n_batches, n_rows, start=0):
+    for i in range(n_batches):
+        index = np.arange(start + i * n_rows, start + (i + 1) * n_rows)
+        yield pd.DataFrame({"A": np.sin(index / 50), "B": index % 7}, index=index)
+
+
+def _source(p):
+    return p.renderers[0].data_source
+
+
+def test_stream_rollover():
+    p = pandas_bokeh.stream(
+        _batches(10, 100), kind="line", rollover=250, fps=1e6, show_figure=False
+    )
+    assert len(p.renderers) == 2
+    data = _source(p).data
+    assert len(data["A"]) == 250
+    assert list(data["__x__values"][[0, -1]]) == [750, 999]
+
+
+def test_stream_downsampling():
+    p = pandas_bokeh.stream(
+        _batches(20, 500),
+        kind="line",
+        y="A",
+        rollover=5000,
+        max_points=500,
+        fps=1e6,
+        show_figure=False,
+    )
+    x = np.asarray(_source(p).data["__x__values"])
+    assert 400 <= len(x) <= 500
+    assert np.all(np.diff(x) > 0)
+    # The window spans the last <rollover> rows:
+    assert x[-1] == 9999
+    assert 4500 <= x[0] <= 5600
+
+
+def test_astream_queue():
+    async def run():
+        queue = asyncio.Queue()
+        task = asyncio.create_task(
+            pandas_bokeh.astream(queue, kind="point", y="A", show_figure=False)
+        )
+        for batch in _batches(5, 20):
+            await queue.put(batch)
+            await asyncio.sleep(0)
+        await queue.put(None)
+        return await task
+
+    p = asyncio.run(run())
+    assert len(_source(p).data["A"]) == 100
+
+
+def test_stream_to_document():
+    doc = Document()
+    # Record the next tick callbacks (run in order by the server session):
+    callbacks = []
+    doc.add_next_tick_callback = callbacks.append
+    p = pandas_bokeh.stream(_batches(5, 20), kind="line", y="A", fps=1e6, doc=doc)
+    source = _source(p)
+
+    n_applied = 0
+    deadline = time.monotonic() + 10
+    while len(source.data["A"]) < 100 and time.monotonic() < deadline:
+        for callback in callbacks[n_applied:]:
+            callback()
+            n_applied += 1
+        time.sleep(0.01)
+    assert doc.roots == [p]
+    assert list(source.data["__x__values"]) == list(range(100))
+
+
+def test_stream_errors():
+    with pytest.raises(ValueError):
+        pandas_bokeh.stream(_batches(2, 10), kind="bar", show_figure=False)
+    with pytest.raises(ValueError):
+        pandas_bokeh.stream(_batches(2, 10), rollover=100, max_points=200)
+
+    def categorical_batches():
+        yield pd.DataFrame({"A": [1, 2]}, index=["a", "b"])
+        yield pd.DataFrame({"A": [3]}, index=["c"])
+
+    with pytest.raises(ValueError):
+        pandas_bokeh.stream(categorical_batches(), kind="point", show_figure=False)
@@ -1,8 +1,21 @@
+import time
+
 import numpy as np
 import pandas as pd
 import pytest
 
 from pandas_bokeh.plot import _determine_data_columns
+from pandas_bokeh.utils import (
+    _categorical_codes,
+    _datetime_to_epoch_ms,
+    _dictionary_encode,
+    _estimate_column_bytes,
+    _extract_additional_columns,
+    _lttb_indices,
+    _minmax_indices,
+    _reduce_precision,
+    _to_numpy,
+)
 
 
 class TestDetermineDataColumns:
@@ -51,3 +64,231 @@ def test_determine_data_columns__raise_exception(self, y):
         df = self.df()
         with pytest.raises(ValueError):
             _determine_data_columns(y=y, df=df)
+
+
+class TestToNumpy:
+    @pytest.mark.parametrize(
+        "dtype,numpy_dtype",
+        [("Int64", np.int64), ("Float64", np.float64), ("boolean", np.bool_)],
+    )
+    def test_to_numpy__nullable_without_missing_values(self, dtype, numpy_dtype):
+        series = pd.Series([1, 0, 1], dtype=dtype)
+        values = _to_numpy(series)
+        assert values.dtype == numpy_dtype
+        # No copy of the underlying data:
+        assert np.shares_memory(values, series.array._data)
+
+    @pytest.mark.parametrize("dtype", ["Int64", "Float64", "boolean"])
+    def test_to_numpy__nullable_with_missing_values(self, dtype):
+        values = _to_numpy(pd.Series([1, None, 0], dtype=dtype))
+        assert values.dtype == np.float64
+        np.testing.assert_array_equal(values, [1, np.nan, 0])
+
+    def test_to_numpy__index_and_numpy_dtypes(self):
+        index = pd.Index([1, 2, 3], dtype="Int64")
+        assert _to_numpy(index).dtype == np.int64
+        series = pd.Series(pd.date_range("2020-01-01", periods=3, tz="UTC"))
+        assert _to_numpy(series).dtype == "datetime64[ns]"
+
+    def test_categorical_codes(self):
+        categorical = pd.Categorical(["b", None, "a", "b"], categories=["a", "b", "c"])
+        codes, categories = _categorical_codes(categorical)
+        np.testing.assert_array_equal(codes, [1, -1, 0, 1])
+        assert list(categories) == ["a", "b", "c"]
+
+
+class TestDictionaryEncode:
+    def test_dictionary_encode(self):
+        values = np.array(["web-01", "web-02", None, "web-01"] * 10, dtype=object)
+        codes, labels = _dictionary_encode(values)
+        assert codes.dtype == np.int8
+        assert labels == ["web-01", "web-02"]
+        np.testing.assert_array_equal(codes[:4], [0, 1, -1, 0])
+
+    def test_dictionary_encode__categorical(self):
+        categorical = pd.Categorical(["b", None, "a", "b"], categories=["a", "b", "c"])
+        codes, labels = _dictionary_encode(categorical)
+        assert codes.dtype == np.int8
+        assert labels == ["a", "b", "c"]
+        np.testing.assert_array_equal(codes, [1, -1, 0, 1])
+
+    def test_dictionary_encode__large_number_of_labels(self):
+        values = np.array([str(i % 1000) for i in range(10000)])
+        codes, labels = _dictionary_encode(values)
+        assert codes.dtype == np.int16
+        assert len(labels) == 1000
+
+    @pytest.mark.parametrize(
+        "values",
+        [np.arange(100), np.array([str(i) for i in range(100)], dtype=object)],
+    )
+    def test_dictionary_encode__not_encoded(self, values):
+        assert _dictionary_encode(values) is None
+
+
+def test_extract_additional_columns():
+    df = pd.DataFrame(columns=["host", "value", "user id"])
+    hovertool_string = "<b>@{host}</b>: @value (@{user id})"
+    assert _extract_additional_columns(df, hovertool_string) == [
+        "value",
+        "host",
+        "user id",
+    ]
+
+
+class TestReducePrecision:
+    @staticmethod
+    def values():
+        np.random.seed(42)
+        values = np.random.randn(10000).cumsum() * 1000
+        values[[3, 7]] = np.nan
+        return values
+
+    def test_reduce_precision__float32(self):
+        values = self.values()
+        encoded, quantization = _reduce_precision(values, "float32")
+        assert encoded.dtype == np.float32
+        assert quantization is None
+        np.testing.assert_allclose(encoded, values, rtol=6e-8)
+
+    @pytest.mark.parametrize("precision", ["int32", "int16"])
+    def test_reduce_precision__quantization(self, precision):
+        values = self.values()
+        encoded, quantization = _reduce_precision(values, precision)
+        assert encoded.dtype == np.dtype(precision)
+
+        decoded = quantization["offset"] + encoded * quantization["scale"]
+        decoded[encoded == quantization["sentinel"]] = np.nan
+        value_range = np.nanmax(values) - np.nanmin(values)
+        max_error = (1 + 1e-6) / (4 * np.iinfo(precision).max)
+        np.testing.assert_array_equal(np.isnan(decoded), np.isnan(values))
+        assert np.nanmax(np.abs(decoded - values)) <= max_error * value_range
+
+    def test_reduce_precision__raise_exception(self):
+        with pytest.raises(ValueError):
+            _reduce_precision(self.values(), "float16")
+
+    def test_datetime_to_epoch_ms(self):
+        values = np.array(["1970-01-01T00:00:01.5", "NaT"], dtype="datetime64[ns]")
+        np.testing.assert_array_equal(_datetime_to_epoch_ms(values), [1500, np.nan])
+
+
+class TestPayloadEstimation:
+    @pytest.mark.parametrize(
+        "values",
+        [
+            np.random.randn(3000),
+            np.random.randn(3000).astype(np.float32),
+            np.arange(3000, dtype=np.int16),
+            np.arange(3000, dtype=np.int64),
+            pd.date_range("2020-01-01", periods=3000).values,
+            np.array(["Apple", "Pear", "Plum"] * 1000, dtype=object),
+        ],
+    )
+    def test_estimate_column_bytes(self, values):
+        from bokeh.core.json_encoder import serialize_json
+        from bokeh.util.serialization import transform_array
+
+        size = len(serialize_json(transform_array(values)))
+        assert _estimate_column_bytes(values) == pytest.approx(size, rel=0.05)
+
+    def test_lttb_indices(self):
+        np.random.seed(42)
+        x = np.arange(10000.0)
+        y = np.random.randn(10000).cumsum()
+        y[[1234, 5678]] = [1000, -1000]
+        y[2000:2100] = np.nan
+
+        indices = _lttb_indices(x, y, 500)
+        assert len(indices) <= 500
+        assert np.all(np.diff(indices) > 0)
+        # First & last point, peaks and the beginning of the gap are kept:
+        for index in [0, 9999, 1234, 5678, 2000]:
+            assert index in indices
+
+        np.testing.assert_array_equal(_lttb_indices(x, y, 20000), np.arange(10000))
+        with pytest.raises(ValueError):
+            _lttb_indices(x, y, 2)
+
+    @staticmethod
+    def sequential_lttb(x, y, n_out):
+        "Reference implementation of LTTB with a loop over the buckets."
+
+        edges = np.linspace(1, len(x) - 1, n_out - 1).astype(np.int64)
+        expected = [0]
+        for i in range(n_out - 2):
+            start, stop = edges[i], edges[i + 1]
+            if i + 2 < len(edges):
+                next_x = x[stop : edges[i + 2]].mean()
+                next_y = y[stop : edges[i + 2]].mean()
+            else:
+                next_x, next_y = x[-1], y[-1]
+            a = expected[-1]
+            area = np.abs(
+                (x[a] - next_x) * (y[start:stop] - y[a])
+                - (x[a] - x[start:stop]) * (next_y - y[a])
+            )
+            expected.append(start + int(np.argmax(area)))
+        expected.append(len(x) - 1)
+        return expected
+
+    def test_lttb_indices__sequential_selection(self):
+        # The vectorized selection equals the sequential algorithm:
+        np.random.seed(42)
+        x = np.sort(np.random.rand(20000))
+        y = np.random.randn(20000).cumsum()
+        n_out = 700
+
+        np.testing.assert_array_equal(
+            _lttb_indices(x, y, n_out), self.sequential_lttb(x, y, n_out)
+        )
+
+    @pytest.mark.parametrize(
+        "y", [np.tile([1.0, -1.0], 5000), np.tile([1.0, 0.0, -1.0], 3334)[:10000]]
+    )
+    @pytest.mark.parametrize("n_out", [5001, 3334, 1000])
+    def test_lttb_indices__propagating_selection(self, y, n_out):
+        # For zigzag lines, a changed selection propagates through all following
+        # buckets (more than the iterations of the vectorized selection):
+        x = np.arange(len(y), dtype=float)
+        np.testing.assert_array_equal(
+            _lttb_indices(x, y, n_out), self.sequential_lttb(x, y, n_out)
+        )
+
+    def test_lttb_indices__performance(self):
+        x = np.arange(2_000_000.0)
+        y = np.random.randn(2_000_000).cumsum()
+        start = time.perf_counter()
+        _lttb_indices(x, y, 200_000)
+        # A loop over the buckets takes several seconds:
+        assert time.perf_counter() - start < 3
+
+    def test_minmax_indices(self):
+        np.random.seed(42)
+        y = np.random.randn(10001)
+        y[2000:2500] = np.nan
+
+        n_out = 300
+        edges = np.linspace(0, len(y), n_out // 2).astype(np.int64)
+        expected = {0, len(y) - 1}
+        for start, stop in zip(edges[:-1], edges[1:]):
+            bucket = y[start:stop]
+            # Buckets of missing values keep their first point:
+            expected.add(
+                start + int(np.argmin(np.where(np.isnan(bucket), np.inf, bucket)))
+            )
+            expected.add(
+                start + int(np.argmax(np.where(np.isnan(bucket), -np.inf, bucket)))
+            )
+
+        np.testing.assert_array_equal(_minmax_indices(y, n_out), sorted(expected))
+        np.testing.assert_array_equal(_minmax_indices(y[:10], 20), np.arange(10))
+        with pytest.raises(ValueError):
+            _minmax_indices(y, 3)
+
+    def test_minmax_indices__performance(self):
+        y = np.random.randn(5_000_000)
+        start = time.perf_counter()
+        _minmax_indices(y, 1_000_000)
+        # A loop over the buckets takes several seconds:
+        assert time.perf_counter() - start < 2
@@ -6,9 +6,36 @@
 from bokeh.io import save
 from bokeh.layouts import column, layout, row
 
-from .base import embedded_html, output_file, output_notebook, plot_grid, show
+from .aio import aembedded_html, aplot
+from .base import (
+    embedded_html,
+    output_file,
+    output_notebook,
+    output_to,
+    plot_grid,
+    show,
+)
+from .batch import render_many
+from .cache import cache_info, clear_cache
+from .chunks import plot_chunks
+from .config import (
+    describe_option,
+    get_option,
+    option_context,
+    options,
+    reset_option,
+    set_option,
+)
+from .daskplot import DaskPlotMethods
+from .dedup import deduplicate_sources
+from .files import plot_file
 from .geoplot import geoplot
-from .plot import FramePlotMethods, plot
+from .handle import PlotHandle
+from .plot import FramePlotMethods, plot, prepare_plot, render_plot
+from .polarsplot import PolarsPlotMethods
+from .report import Report
+from .spec import PlotSpec
+from .stream import astream, stream
 
 __version__ = "0.6.0"
 
@@ -33,6 +60,9 @@
         "area",
         "pie",
         "hist",
+        "kde",
+        "density",
+        "ecdf",
         "map",
     )
 
@@ -54,7 +84,12 @@ def stepplot(self, **kwargs):
 
     pd.DataFrame.plot.step = stepplot
 
-    for kind in ["map", "point", "step"]:
+    def ecdfplot(self, **kwargs):
+        return self(kind="ecdf", **kwargs)
+
+    pd.DataFrame.plot.ecdf = ecdfplot
+
+    for kind in ["map", "point", "step", "ecdf"]:
         getattr(pd.DataFrame.plot, kind).__doc__ = getattr(
             FramePlotMethods, kind
         ).__doc__
@@ -62,6 +97,7 @@ def stepplot(self, **kwargs):
     # Define API methods on pandas.plotting:
     pd.plotting.output_notebook = output_notebook
     pd.plotting.output_file = output_file
+    pd.plotting.output_to = output_to
     pd.plotting.plot_grid = plot_grid
     pd.plotting.show = show
     pd.plotting.embedded_html = embedded_html
@@ -90,3 +126,22 @@ def stepplot(self, **kwargs):
     pyspark.sql.dataframe.DataFrame.plot_bokeh = plot_bokeh
 except ImportError:
     pass
+
+
+# Register plot_bokeh namespace for Polars DataFrames and LazyFrames:
+try:
+    import polars as pl
+
+    pl.api.register_dataframe_namespace("plot_bokeh")(PolarsPlotMethods)
+    pl.api.register_lazyframe_namespace("plot_bokeh")(PolarsPlotMethods)
+except ImportError:
+    pass
+
+
+# Register plot_bokeh accessor for Dask DataFrames:
+try:
+    import dask.dataframe as dd
+
+    dd.extensions.register_dataframe_accessor("plot_bokeh")(DaskPlotMethods)
+except ImportError:
+    pass
@@ -0,0 +1,213 @@
+"""Awaitable plotting API, which runs the data preparation and serialization of
+plots in a worker pool instead of blocking the event loop:
+
+>>> p = await df.plot_bokeh.aline(show_figure=False)
+>>> html = await pandas_bokeh.aembedded_html(p)
+
+The worker pool is configured via the options "pool" ("thread", "process" or a
+concurrent.futures.Executor), "workers" and "max_concurrency"."""
+
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import functools
+import sys
+import threading
+import warnings
+import weakref
+
+from bokeh.document import Document
+from bokeh.model import Model
+
+from . import base, config
+from .base import embedded_html
+from .plot import FramePlotMethods, plot
+
+# Options that configure the worker pool itself (not passed to process workers):
+_POOL_OPTIONS = ["pool", "workers", "max_concurrency"]
+
+_executors = {}
+_executors_lock = threading.Lock()
+# Semaphores for the concurrency limit of each event loop:
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _get_executor(pool=None):
+    """Returns the executor for option "pool" (created on first use and replaced if
+    the number of workers changes)."""
+
+    if pool is None:
+        pool = config.get_option("pool")
+    if isinstance(pool, concurrent.futures.Executor):
+        return pool
+
+    workers = config.get_option("workers")
+    with _executors_lock:
+        executor, executor_workers = _executors.get(pool, (None, None))
+        if executor is None or executor_workers != workers:
+            if executor is not None:
+                executor.shutdown(wait=False)
+            if pool == "thread":
+                executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="pandas_bokeh"
+                )
+            else:
+                executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+            _executors[pool] = (executor, workers)
+    return executor
+
+
+@atexit.register
+def _shutdown_executors():
+    with _executors_lock:
+        for executor, _ in _executors.values():
+            # <cancel_futures> is only available for Python >= 3.9:
+            if sys.version_info >= (3, 9):
+                executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                executor.shutdown(wait=False)
+        _executors.clear()
+
+
+def _get_semaphore():
+    "Returns the semaphore limiting the concurrency in the running event loop."
+
+    limit = config.get_option("max_concurrency")
+    if limit is None:
+        return None
+    loop = asyncio.get_running_loop()
+    semaphore_limit, semaphore = _semaphores.get(loop, (None, None))
+    if semaphore_limit != limit:
+        semaphore = asyncio.Semaphore(limit)
+        _semaphores[loop] = (limit, semaphore)
+    return semaphore
+
+
+def _call_in_process(options, output, func, args, kwargs):
+    """Calls func(*args, **kwargs) in a process worker with the options and output
+    of the caller. Figures are returned as JSON of their document (Bokeh models
+    cannot be pickled), warnings are returned to be reissued by the caller."""
+
+    with warnings.catch_warnings(record=True) as caught_warnings:
+        warnings.simplefilter("always")
+        token = base._CONTEXT_OUTPUT.set(output)
+        try:
+            with config.option_context(**options):
+                result = func(*args, **kwargs)
+        finally:
+            base._CONTEXT_OUTPUT.reset(token)
+
+    if isinstance(result, Model):
+        document = Document()
+        document.add_root(result)
+        result = document.to_json()
+    else:
+        result = (result,)
+    return result, [(w.message, w.category) for w in caught_warnings]
+
+
+def _from_process(result):
+    "Restores the result of _call_in_process."
+
+    if isinstance(result, tuple):
+        return result[0]
+    return Document.from_json(result).roots[0]
+
+
+async def _run(func, *args, _pool=None, **kwargs):
+    """Runs func(*args, **kwargs) in the worker pool and returns its result.
+
+    The output and options of the current context are used in the worker. If the
+    awaiting task is cancelled, the call is removed from the pool if it has not
+    started yet (a running call is finished, but its result is discarded)."""
+
+    semaphore = _get_semaphore()
+    if semaphore is not None:
+        async with semaphore:
+            return await _submit(func, args, kwargs, _pool)
+    return await _submit(func, args, kwargs, _pool)
+
+
+async def _submit(func, args, kwargs, pool):
+    loop = asyncio.get_running_loop()
+    executor = _get_executor(pool)
+
+    if not isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await loop.run_in_executor(executor, call)
+
+    options = {
+        name: config.get_option(name)
+        for name in config._REGISTERED_OPTIONS
+        if name not in _POOL_OPTIONS
+    }
+    output = base._current_output()
+    result, caught_warnings = await loop.run_in_executor(
+        executor,
+        functools.partial(_call_in_process, options, output, func, args, kwargs),
+    )
+    for message, category in caught_warnings:
+        warnings.warn(message, category)
+    return await loop.run_in_executor(None, _from_process, result)
+
+
+def _plot_method(data, kind, args, kwargs):
+    "Calls the plot method <kind> of the plot_bokeh accessor of <data>."
+
+    plot_methods = FramePlotMethods(data)
+    if kind is None:
+        return plot_methods(*args, **kwargs)
+    return getattr(plot_methods, kind)(*args, **kwargs)
+
+
+async def aplot(df_in, *args, **kwargs):
+    """Awaitable version of pandas_bokeh.plot (see its documentation), which runs
+    in the worker pool."""
+
+    return await _run(plot, df_in, *args, **kwargs)
+
+
+async def aembedded_html(fig, resources="CDN"):
+    """Awaitable version of pandas_bokeh.embedded_html, which serializes the
+    figure in the worker pool. Since figures cannot be sent to other processes, a
+    thread pool is used if option "pool" is "process"."""
+
+    pool = config.get_option("pool")
+    if pool == "process" or isinstance(pool, concurrent.futures.ProcessPoolExecutor):
+        pool = "thread"
+    return await _run(embedded_html, fig, resources=resources, _pool=pool)
+
+
+def _async_plot_method(kind):
+    async def method(self, *args, **kwargs):
+        return await _run(_plot_method, self._parent, kind, args, kwargs)
+
+    name = "aplot" if kind is None else f"a{kind}"
+    method.__name__ = method.__qualname__ = name
+    method.__doc__ = (
+        f"Awaitable version of df.plot_bokeh{'' if kind is None else '.' + kind}"
+        "(...), which runs in the worker pool (see pandas_bokeh.aio)."
+    )
+    return method
+
+
+# Awaitable counterparts of the plot methods (df.plot_bokeh.aline(...), ...):
+for _kind in [
+    None,
+    "line",
+    "step",
+    "point",
+    "scatter",
+    "bar",
+    "barh",
+    "hist",
+    "kde",
+    "ecdf",
+    "area",
+    "pie",
+    "map",
+]:
+    _method = _async_plot_method(_kind)
+    setattr(FramePlotMethods, _method.__name__, _method)
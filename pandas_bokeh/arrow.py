@@ -0,0 +1,123 @@
+"""Arrow input: pyarrow Tables and RecordBatches can be plotted directly
+
+>>> pandas_bokeh.plot(table, kind="line", x="time", y="temperature")
+
+They are converted to DataFrames that share the buffers of the Arrow columns
+instead of copying them (see _arrow_to_pandas), and the plot data is prepared
+from these DataFrames without the usual defensive copy."""
+
+import weakref
+
+import numpy as np
+import pandas as pd
+
+# DataFrames created by _arrow_to_pandas (by id), which do not have to be copied
+# before the plot data is prepared:
+_ARROW_FRAMES = weakref.WeakValueDictionary()
+
+
+def _is_arrow(data):
+    "Returns whether <data> is a pyarrow Table or RecordBatch."
+
+    return type(data).__module__.startswith("pyarrow") and type(data).__name__ in (
+        "Table",
+        "RecordBatch",
+    )
+
+
+def _is_arrow_frame(df):
+    "Returns whether <df> has been created by _arrow_to_pandas."
+
+    return _ARROW_FRAMES.get(id(df)) is df
+
+
+def _categorical(dictionary_array):
+    "Returns a Categorical of the codes and labels of a DictionaryArray."
+
+    import pyarrow.compute as pc
+
+    codes = pc.fill_null(dictionary_array.indices, -1).to_numpy(zero_copy_only=False)
+    return pd.Categorical.from_codes(
+        codes, categories=pd.Index(dictionary_array.dictionary.to_pandas())
+    )
+
+
+def _arrow_column(column):  # noqa C901
+    """Returns the values of the Arrow (Chunked)Array <column> for a DataFrame:
+    - numeric columns as NumPy array sharing the Arrow buffer (floats with NaN if
+      there are missing values)
+    - dictionary-encoded and string columns as Categorical of codes and labels
+    - timestamps as int64 view of the Arrow buffer (in nanoseconds, with their
+      timezone)
+    - other types via pyarrow's to_pandas."""
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if isinstance(column, pa.ChunkedArray):
+        if pa.types.is_dictionary(column.type) and column.num_chunks > 1:
+            column = column.unify_dictionaries()
+        # Chunks have to be concatenated (copied) for a single NumPy array:
+        if column.num_chunks == 1:
+            column = column.chunk(0)
+        else:
+            column = column.combine_chunks()
+
+    data_type = column.type
+    if pa.types.is_dictionary(data_type):
+        return _categorical(column)
+    if pa.types.is_string(data_type) or pa.types.is_large_string(data_type):
+        return _categorical(column.dictionary_encode())
+    if pa.types.is_timestamp(data_type):
+        values = column.view(pa.int64())
+        if column.null_count:
+            values = pc.fill_null(values, np.iinfo(np.int64).min)
+        values = values.to_numpy(zero_copy_only=False).view(
+            f"datetime64[{data_type.unit}]"
+        )
+        if data_type.unit != "ns":
+            values = values.astype("datetime64[ns]")
+        if data_type.tz is None:
+            return values
+        return pd.arrays.DatetimeArray(
+            values, dtype=pd.DatetimeTZDtype(tz=data_type.tz)
+        )
+    if pa.types.is_integer(data_type) or pa.types.is_floating(data_type):
+        if column.null_count:
+            return pc.cast(column, pa.float64()).to_numpy(zero_copy_only=False)
+        return column.to_numpy(zero_copy_only=True)
+    if pa.types.is_boolean(data_type):
+        if column.null_count:
+            return pc.cast(column, pa.float64()).to_numpy(zero_copy_only=False)
+        return column.to_numpy(zero_copy_only=False)
+    return column.to_pandas()
+
+
+def _arrow_to_pandas(data):
+    """Returns the pyarrow Table or RecordBatch <data> as DataFrame, whose columns
+    share the buffers of <data> where possible (see _arrow_column). The index
+    stored by pandas (schema metadata) is restored."""
+
+    metadata = data.schema.pandas_metadata or {}
+    index_columns = [
+        col for col in metadata.get("index_columns", []) if isinstance(col, str)
+    ]
+    columns = {
+        name: _arrow_column(column)
+        for name, column in zip(data.schema.names, data.columns)
+    }
+    index = None
+    if index_columns and all(col in columns for col in index_columns):
+        arrays = [columns.pop(col) for col in index_columns]
+        index = (
+            pd.MultiIndex.from_arrays(arrays)
+            if len(arrays) > 1
+            else pd.Index(arrays[0])
+        )
+        # Unnamed indices are stored as "__index_level_<i>__":
+        index.names = [
+            None if col.startswith("__index_level_") else col for col in index_columns
+        ]
+    df = pd.DataFrame(columns, index=index, copy=False)
+    _ARROW_FRAMES[id(df)] = df
+    return df
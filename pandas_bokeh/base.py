@@ -1,13 +1,51 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import contextvars
+import os
+from collections import namedtuple
+from contextlib import contextmanager
+
 import bokeh.plotting
-from bokeh.embed import components
+from bokeh.embed import components, file_html
 from bokeh.layouts import gridplot
-from bokeh.resources import CDN
+from bokeh.resources import CDN, Resources
+from bokeh.util.browser import view
+
+from .compress import compressed_components
+from .dedup import deduplicate_sources
+from .report import Report
+
+# Output configuration: <output_type> is "file", "jupyter", "zeppelin" or None (no
+# output). <filename> is None if no file has been set by the user (Bokeh's default
+# output is used). <compress> and <data> are only used for file output:
+_OutputState = namedtuple(
+    "_OutputState",
+    ["output_type", "filename", "title", "mode", "root_dir", "compress", "data"],
+    defaults=[False, "inline"],
+)
+
+# Process-wide output (set by output_file/output_notebook):
+_GLOBAL_OUTPUT = _OutputState("file", None, "Bokeh Plot", "cdn", None)
+# Output of the current thread/asyncio task (set by output_to), which overrides the
+# process-wide output:
+_CONTEXT_OUTPUT = contextvars.ContextVar("pandas_bokeh_output", default=None)
+
+
+def _current_output():
+    "Returns the output configuration of the current context."
+
+    output = _CONTEXT_OUTPUT.get()
+    return _GLOBAL_OUTPUT if output is None else output
 
-OUTPUT_TYPE = "file"
-SUPPRESS_OUTPUT = False
+
+def __getattr__(name):
+    # Read access to the module attributes of former versions:
+    if name == "OUTPUT_TYPE":
+        return _current_output().output_type
+    if name == "SUPPRESS_OUTPUT":
+        return _current_output().output_type is None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _set_fontsize(figure, fontsize, where):
@@ -48,7 +86,7 @@ def set_fontsizes_of_figure(
         figure.legend.label_text_font_size = fontsize_legend
 
 
-def plot_grid(children, show_plot=True, return_html=False, **kwargs):
+def plot_grid(children, show_plot=True, return_html=False, deduplicate=False, **kwargs):
     """Create a grid of plots rendered on separate canvases and shows the layout.
     plot_grid is designed to layout a set of plots.
 
@@ -79,6 +117,10 @@ def plot_grid(children, show_plot=True, return_html=False, **kwargs):
         none is supplied, ToolbarBox’s defaults will be used.
     - merge_tools (True, False) – Combine tools from all child plots into a single
         toolbar.
+    - deduplicate (bool, default=False) - Merge data sources of the plots with
+        identical columns (e.g. plots of the same DataFrame), such that the data is
+        serialized only once (see deduplicate_sources). This links the selections
+        of the merged plots.
 
     -------------------------------------------------------------------
     Returns:
@@ -88,6 +130,8 @@ def plot_grid(children, show_plot=True, return_html=False, **kwargs):
         The grid is always a Column of Rows of plots."""
 
     layout = gridplot(children=children, **kwargs)
+    if deduplicate:
+        deduplicate_sources(layout)
 
     if show_plot:
         show(layout)
@@ -121,8 +165,8 @@ def output_notebook(notebook_type="auto", **kwargs):
     else:
         raise ValueError('<notebook_type> can only be "jupyter", "zeppelin" or "auto"')
 
-    global OUTPUT_TYPE
-    OUTPUT_TYPE = notebook_type
+    global _GLOBAL_OUTPUT
+    _GLOBAL_OUTPUT = _OutputState(notebook_type, None, None, None, None)
 
     # Reset Bokeh output:
     bokeh.plotting.reset_output()
@@ -144,7 +188,14 @@ def detect_notebook_server():
         return "zeppelin"
 
 
-def output_file(filename, title="Bokeh Plot", mode="cdn", root_dir=None):
+def output_file(
+    filename,
+    title="Bokeh Plot",
+    mode="cdn",
+    root_dir=None,
+    compress=False,
+    data="inline",
+):
     """Set the output of Bokeh to the the provided filename.
 
     Parameters:
@@ -157,38 +208,115 @@ def output_file(filename, title="Bokeh Plot", mode="cdn", root_dir=None):
     root_dir (str, optional) – root directory to use for ‘absolute’ resources.
                               (default: None) This value is ignored for other
                               resource types, e.g. INLINE or CDN.
+    compress (bool, optional) – embed the plot data deflate compressed, it is
+                                inflated by the browser (default: False). Only
+                                used by pandas_bokeh.show and plotting methods.
+    data (str, optional) – "inline" (default) embeds the plot data into the HTML
+                           document, "sidecar" writes the data of each data
+                           source to a binary file in the directory
+                           "<filename without extension>_data", which is loaded
+                           asynchronously by the page (the page has to be served
+                           via HTTP). Only used by pandas_bokeh.show and plotting
+                           methods.
 
     Returns:
     ----------------------------------------------------------------
     None"""
-    global OUTPUT_TYPE
-    OUTPUT_TYPE = "file"
+    if data not in ("inline", "sidecar"):
+        raise ValueError('<data> has to be "inline" or "sidecar".')
+
+    global _GLOBAL_OUTPUT
+    _GLOBAL_OUTPUT = _OutputState(
+        "file", filename, title, mode, root_dir, compress, data
+    )
 
+    # Keep Bokeh's own output in sync (for bokeh.plotting.show/save):
     bokeh.plotting.reset_output()
     bokeh.plotting.output_file(filename, title=title, mode=mode, root_dir=root_dir)
 
 
+@contextmanager
+def output_to(
+    target, title="Bokeh Plot", mode="cdn", root_dir=None, compress=False, data="inline"
+):
+    """Context manager that sets the output of pandas_bokeh.show (and of all plots
+    with show_figure=True) only for the current thread or asyncio task. Other
+    threads keep their output, such that plots can be rendered concurrently.
+
+    Parameters:
+    ----------------------------------------------------------------
+    target (str, path or None) – a filename for saving the HTML document, "jupyter"
+                                 or "zeppelin" for notebook output (the notebook
+                                 has to be initialized via output_notebook), or
+                                 None to suppress the output
+    title, mode, root_dir, compress, data – see output_file
+
+    Example:
+    ----------------------------------------------------------------
+    >>> with pandas_bokeh.output_to("report.html"):
+    ...     df.plot_bokeh.line()"""
+
+    if target is None or target in ("jupyter", "zeppelin"):
+        output = _OutputState(target, None, None, None, None)
+    else:
+        if data not in ("inline", "sidecar"):
+            raise ValueError('<data> has to be "inline" or "sidecar".')
+        output = _OutputState(
+            "file", str(target), title, mode, root_dir, compress, data
+        )
+
+    token = _CONTEXT_OUTPUT.set(output)
+    try:
+        yield
+    finally:
+        _CONTEXT_OUTPUT.reset(token)
+
+
 def show(
     obj, browser=None, new="tab", notebook_handle=False, notebook_url="localhost:8888"
 ):
-    global SUPPRESS_OUTPUT
-    if SUPPRESS_OUTPUT:
+    output = _current_output()
+    # SUPPRESS_OUTPUT may still be set as module attribute (former versions):
+    if output.output_type is None or globals().get("SUPPRESS_OUTPUT"):
         return obj
 
-    if OUTPUT_TYPE != "zeppelin":
-        bokeh.plotting.show(obj, browser, new, notebook_handle, notebook_url)
-    else:
+    if output.output_type == "zeppelin":
         html_embedded = embedded_html(obj, resources=None)
         print("%html\n\n" + html_embedded)
+    elif output.output_type == "file" and output.filename is not None:
+        # Write the file without Bokeh's global output state (which is shared by
+        # all threads):
+        if output.compress or output.data == "sidecar":
+            html = (
+                Report(
+                    title=output.title,
+                    mode=output.mode,
+                    root_dir=output.root_dir,
+                    compress=output.compress,
+                    data=output.data,
+                    data_dir=os.path.splitext(output.filename)[0] + "_data",
+                )
+                .add(obj)
+                .to_html()
+            )
+        else:
+            resources = Resources(mode=output.mode, root_dir=output.root_dir)
+            html = file_html(obj, resources, title=output.title)
+        with open(output.filename, mode="w", encoding="utf-8") as f:
+            f.write(html)
+        view(output.filename, browser=browser, new=new)
+    else:
+        return bokeh.plotting.show(obj, browser, new, notebook_handle, notebook_url)
 
 
 show.__doc__ = bokeh.plotting.show.__doc__
 
 
-def embedded_html(fig, resources="CDN"):
+def embedded_html(fig, resources="CDN", compress=False):
     """Returns an html string that contains all neccessary CSS&JS files,
     together with the div containing the Bokeh plot. As input, a figure fig
-    is expected."""
+    is expected. With compress=True, the plot data is embedded deflate
+    compressed and inflated by the browser (via DecompressionStream)."""
 
     html_embedded = ""
     if resources == "CDN":
@@ -202,7 +330,7 @@ def embedded_html(fig, resources="CDN"):
         raise ValueError("<resources> only accept 'CDN', 'raw' or None.")
 
     # Add plot script and div
-    script, div = components(fig)
+    script, div = compressed_components(fig) if compress else components(fig)
     html_embedded += "\n\n" + div + "\n\n" + script
 
     return html_embedded
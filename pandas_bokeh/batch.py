@@ -0,0 +1,237 @@
+"""Batch rendering of many plots to HTML files in a process pool:
+
+>>> jobs = {
+...     customer: (df_customer, dict(kind="line", y="revenue", title=customer))
+...     for customer, df_customer in df.groupby("customer")
+... }
+>>> results = pandas_bokeh.render_many(jobs, workers=8, output_dir="reports")
+
+The frames are sent to the workers via shared memory (pickle protocol 5 with
+out-of-band buffers), such that their data is not copied through pipes."""
+
+import concurrent.futures
+import os
+import pickle
+import re
+import time
+import traceback
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+from bokeh.embed import file_html
+from bokeh.resources import CDN
+
+from . import config
+from .plot import plot
+
+RenderResult = namedtuple("RenderResult", ["name", "path", "error", "timings"])
+RenderResult.__doc__ = """Result of a job of render_many: <path> of the written
+HTML file (None if the job failed), <error> (the formatted traceback of a failed
+job or None) and <timings> (seconds for "transfer", "plot", "html", "write" and
+"total")."""
+
+# Options that configure worker pools or caches (not passed to the workers):
+_POOL_OPTIONS = ["pool", "workers", "max_concurrency"]
+
+
+def _share_frame(frame):
+    """Pickles <frame> with its array buffers in a shared memory block. Returns the
+    pickle data, the shared memory block (None if there are no buffers) and the
+    (offset, size) of each buffer in the block."""
+
+    buffers = []
+    data = pickle.dumps(frame, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [buffer.raw() for buffer in buffers]
+    size = sum(raw_buffer.nbytes for raw_buffer in raw_buffers)
+    if size == 0:
+        return data, None, [(0, 0)] * len(raw_buffers)
+
+    block = shared_memory.SharedMemory(create=True, size=size)
+    offsets = []
+    offset = 0
+    for raw_buffer in raw_buffers:
+        block.buf[offset : offset + raw_buffer.nbytes] = raw_buffer
+        offsets.append((offset, raw_buffer.nbytes))
+        offset += raw_buffer.nbytes
+    return data, block, offsets
+
+
+def _copy_frame(frame):
+    "Returns a copy of the DataFrame or Series <frame> including its index."
+
+    frame = frame.copy(deep=True)
+    # Deep copies of pandas only create views of the index:
+    frame.index = frame.index.copy(deep=True)
+    return frame
+
+
+def _release_block(block):
+    block.close()
+    block.unlink()
+
+
+def _safe_filename(name, used):
+    """Returns the HTML file name of the job <name> with all characters except
+    letters, digits, "." and "-" replaced by "_". If the name is already in
+    <used> (case-insensitive), a suffix "_2", "_3", ... is appended. The name is
+    added to <used>."""
+
+    stem = re.sub(r"[^\w.-]", "_", str(name))
+    filename = f"{stem}.html"
+    n = 1
+    while filename.lower() in used:
+        n += 1
+        filename = f"{stem}_{n}.html"
+    used.add(filename.lower())
+    return filename
+
+
+def _render_job(name, data, block_name, offsets, kwargs, options, path):
+    "Renders a job in a worker process and writes its HTML file <path>."
+
+    timings = {}
+    start = time.perf_counter()
+    try:
+        if block_name is None:
+            frame = pickle.loads(data, buffers=[b""] * len(offsets))
+        else:
+            # The frame is copied out of the shared memory, such that the block
+            # can be closed (the plot would keep views of its buffers):
+            block = shared_memory.SharedMemory(name=block_name)
+            try:
+                frame = _copy_frame(
+                    pickle.loads(
+                        data,
+                        buffers=[
+                            block.buf[offset : offset + size]
+                            for offset, size in offsets
+                        ],
+                    )
+                )
+            finally:
+                block.close()
+        timings["transfer"] = time.perf_counter() - start
+
+        with config.option_context(**options):
+            p = plot(frame, **dict(kwargs, show_figure=False, return_html=False))
+        timings["plot"] = time.perf_counter() - start - sum(timings.values())
+
+        html = file_html(p, CDN, title=kwargs.get("title") or str(name))
+        timings["html"] = time.perf_counter() - start - sum(timings.values())
+
+        with open(path, mode="w", encoding="utf-8") as f:
+            f.write(html)
+        timings["write"] = time.perf_counter() - start - sum(timings.values())
+        error = None
+    except Exception:
+        path = None
+        error = traceback.format_exc()
+    timings["total"] = time.perf_counter() - start
+    return RenderResult(name, path, error, timings)
+
+
+def _iterate_jobs(jobs):
+    "Yields (name, frame, kwargs) of <jobs>."
+
+    if isinstance(jobs, dict):
+        for name, job in jobs.items():
+            yield (name,) + tuple(job)
+    else:
+        for i, job in enumerate(jobs):
+            job = tuple(job)
+            yield job if len(job) == 3 else (i,) + job
+
+
+def render_many(  # noqa C901
+    jobs, workers=None, output_dir=".", progress=None, raise_errors=False
+):
+    """Renders many plots to standalone HTML files in a process pool.
+
+    Parameters:
+    ----------------------------------------------------------------
+    jobs (dict or iterable) – the plots as mapping of a name to (frame, kwargs) or
+                              as iterable of (frame, kwargs) or (name, frame,
+                              kwargs), where kwargs are the keyword arguments of
+                              pandas_bokeh.plot (e.g. kind="line"). A generator
+                              (e.g. over df.groupby(...)) is consumed lazily.
+    workers (int, optional) – number of worker processes (default: option
+                              "workers")
+    output_dir (str) – directory of the HTML files "<name>.html" (characters
+                       other than letters, digits, "." and "-" are replaced by
+                       "_", names that collide get a suffix "_2", "_3", ...)
+    progress (callable, optional) – called after each finished job with its
+                                    RenderResult, the number of finished jobs
+                                    and the number of submitted jobs
+    raise_errors (bool) – raise a RuntimeError at the first failed job instead
+                          of reporting the failure in its RenderResult
+
+    Returns:
+    ----------------------------------------------------------------
+    List of RenderResult (name, path, error, timings) in the order of the jobs.
+    The options of the calling context are used in the workers."""
+
+    if workers is None:
+        workers = config.get_option("workers")
+    os.makedirs(output_dir, exist_ok=True)
+    options = {
+        name: config.get_option(name)
+        for name in config._REGISTERED_OPTIONS
+        if name not in _POOL_OPTIONS
+    }
+
+    results = {}
+    pending = {}
+    filenames = set()
+    n_submitted = 0
+    # Limit the number of submitted jobs (and their shared memory blocks):
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+
+    def collect(return_when):
+        done, _ = concurrent.futures.wait(pending, return_when=return_when)
+        for future in done:
+            i, block = pending.pop(future)
+            if block is not None:
+                _release_block(block)
+            result = future.result()
+            results[i] = result
+            if progress is not None:
+                progress(result, len(results), n_submitted)
+            if raise_errors and result.error is not None:
+                raise RuntimeError(
+                    f"Rendering of job '{result.name}' failed:\n{result.error}"
+                )
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for i, (name, frame, kwargs) in enumerate(_iterate_jobs(jobs)):
+                while len(pending) >= max_pending:
+                    collect(concurrent.futures.FIRST_COMPLETED)
+                data, block, offsets = _share_frame(frame)
+                try:
+                    future = executor.submit(
+                        _render_job,
+                        name,
+                        data,
+                        None if block is None else block.name,
+                        offsets,
+                        dict(kwargs),
+                        options,
+                        os.path.join(output_dir, _safe_filename(name, filenames)),
+                    )
+                except BaseException:
+                    if block is not None:
+                        _release_block(block)
+                    raise
+                pending[future] = (i, block)
+                n_submitted += 1
+            while pending:
+                collect(concurrent.futures.FIRST_COMPLETED)
+        finally:
+            for future in pending:
+                future.cancel()
+            concurrent.futures.wait(pending)
+            for _, block in pending.values():
+                if block is not None:
+                    _release_block(block)
+
+    return [results[i] for i in sorted(results)]
@@ -0,0 +1,265 @@
+"""Content-addressed cache for the results of pandas_bokeh.plot. If enabled via the
+option "cache" ("memory" or a directory), plot calls with the same data and
+arguments return the cached figure (rebuilt from its JSON) or HTML:
+
+>>> pandas_bokeh.set_option(cache="memory", cache_max_bytes=500_000_000)
+>>> df.plot_bokeh.line(return_html=True)  # computed
+>>> df.plot_bokeh.line(return_html=True)  # from cache
+>>> pandas_bokeh.cache_info()
+CacheInfo(hits=1, misses=1, entries=1, current_bytes=..., max_bytes=500000000)
+
+The cache key is a hash of the used columns and index of the DataFrame (via
+pd.util.hash_pandas_object), the call arguments and the other options."""
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict, namedtuple
+
+import bokeh
+import pandas as pd
+from bokeh.document import Document
+from bokeh.embed.util import OutputDocumentFor
+
+from . import config
+from .spec import _update_fingerprint
+from .utils import _extract_additional_columns
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "entries", "current_bytes", "max_bytes"]
+)
+
+# Options that do not change the result of a plot call:
+_IGNORED_OPTIONS = ["pool", "workers", "max_concurrency", "cache", "cache_max_bytes"]
+
+_caches = {}
+_lock = threading.Lock()
+_counters = {"hits": 0, "misses": 0}
+
+
+class _MemoryCache:
+    "LRU cache of strings, evicting the least recently used ones above max_bytes."
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key).encode("utf-8"))
+            if size > self.max_bytes:
+                return
+            self._entries[key] = value
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.encode("utf-8"))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self):
+        with self._lock:
+            return len(self._entries), self._bytes
+
+
+class _DiskCache:
+    """Cache of strings as files in <directory>, evicting the least recently used
+    files (by modification time) above max_bytes."""
+
+    suffix = ".pandas_bokeh"
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def _files(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.suffix):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return value
+
+    def set(self, key, value):
+        data = value.encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        # Write to a temporary file first, such that readers never see partial files:
+        path = self._path(key)
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as f:
+            f.write(data)
+        os.replace(temporary_path, path)
+
+        files = sorted(self._files())
+        total_bytes = sum(size for _, size, _ in files)
+        for _, size, file_path in files:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+    def clear(self):
+        for _, _, path in self._files():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def info(self):
+        files = self._files()
+        return len(files), sum(size for _, size, _ in files)
+
+
+def _get_cache():
+    "Returns the cache selected by option 'cache' (None if caching is disabled)."
+
+    location = config.get_option("cache")
+    if location is None:
+        return None
+    max_bytes = config.get_option("cache_max_bytes")
+    location = location if location == "memory" else os.path.abspath(location)
+    with _lock:
+        cache = _caches.get(location)
+        if cache is None:
+            if location == "memory":
+                cache = _MemoryCache(max_bytes)
+            else:
+                cache = _DiskCache(location, max_bytes)
+            _caches[location] = cache
+    cache.max_bytes = max_bytes
+    return cache
+
+
+def _count(hit):
+    with _lock:
+        _counters["hits" if hit else "misses"] += 1
+
+
+def _used_columns(df, arguments):
+    """Returns the columns of <df> that are used by a plot call with <arguments>
+    (all columns, if <y> is not given)."""
+
+    if arguments.get("y") is None:
+        return list(df.columns)
+
+    names = []
+    for name in ["x", "y", "category", "weights"]:
+        value = arguments.get(name)
+        names += list(value) if isinstance(value, (list, tuple)) else [value]
+    names += list(arguments.get("kwargs", {}).values())
+    if isinstance(arguments.get("agg"), dict):
+        names += list(arguments["agg"])
+    names += _extract_additional_columns(df, arguments.get("hovertool_string"))
+
+    columns = []
+    for name in names:
+        try:
+            if name in df.columns and name not in columns:
+                columns.append(name)
+        except TypeError:
+            # Unhashable arguments are no column names:
+            continue
+    return columns
+
+
+def _cache_key(df, arguments):
+    """Returns the cache key of a plot call of <df> with <arguments> or None if the
+    arguments cannot be hashed."""
+
+    if isinstance(df, pd.Series):
+        df = pd.DataFrame(df)
+    columns = _used_columns(df, arguments)
+
+    hash_object = hashlib.sha1()
+    try:
+        _update_fingerprint(
+            hash_object,
+            (
+                bokeh.__version__,
+                [str(col) for col in columns],
+                [str(df[col].dtype) for col in columns],
+                df.index.dtype.str if hasattr(df.index.dtype, "str") else "",
+                pd.util.hash_pandas_object(df[columns], index=True).values,
+                arguments,
+                {
+                    name: config.get_option(name)
+                    for name in config._REGISTERED_OPTIONS
+                    if name not in _IGNORED_OPTIONS
+                },
+            ),
+        )
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+    return hash_object.hexdigest()
+
+
+def _figure_to_json(fig):
+    with OutputDocumentFor([fig]) as document:
+        return document.to_json_string()
+
+
+def _figure_from_json(json_string):
+    document = Document.from_json_string(json_string)
+    fig = document.roots[0]
+    document.remove_root(fig)
+    return fig
+
+
+def cache_info():
+    """Returns the hits and misses of the plot cache and the number of entries and
+    bytes of the cache selected by option 'cache'."""
+
+    cache = _get_cache()
+    entries, current_bytes = (0, 0) if cache is None else cache.info()
+    with _lock:
+        hits, misses = _counters["hits"], _counters["misses"]
+    return CacheInfo(
+        hits, misses, entries, current_bytes, config.get_option("cache_max_bytes")
+    )
+
+
+def clear_cache():
+    """Removes all entries of the cache selected by option 'cache' and resets the
+    hit and miss counters."""
+
+    cache = _get_cache()
+    if cache is not None:
+        cache.clear()
+    with _lock:
+        _counters["hits"] = _counters["misses"] = 0
@@ -0,0 +1,541 @@
+"""Out-of-core plotting of iterators of DataFrames (e.g. pd.read_csv(...,
+chunksize=...)): each chunk is folded into a mergeable one-pass reducer of the
+plot kind, such that the memory is bounded by the chunk size and the size of the
+reduced data:
+
+>>> chunks = pd.read_csv("sensors.csv", chunksize=1_000_000, parse_dates=["time"])
+>>> pandas_bokeh.plot_chunks(chunks, kind="line", x="time")
+
+- line, step, point: M4 buckets of the x-range (the first, last, minimum and
+  maximum row of each bucket and data column)
+- scatter: counts of a 2D grid, drawn as colored squares
+- hist: counts of fixed bins (<bins> as bin edges) or of streaming bins
+- bar, barh: sums (or counts of rows) of the top-K categories
+
+Without a known range (<xlim> / <ylim> or bin edges), the buckets are aligned
+multiples of a width, which doubles whenever the data exceeds the number of
+buckets (then pairs of buckets are merged). Reducers of the same buckets (fixed
+limits or bin edges) of different parts of the data can be merged (see
+daskplot)."""
+
+import numpy as np
+import pandas as pd
+
+from .arrow import _arrow_to_pandas, _is_arrow
+from .base import embedded_html, show
+from .plot import _determine_data_columns, plot, prepare_plot, render_plot
+
+CHUNK_KINDS = ["line", "step", "point", "scatter", "hist", "bar", "barh"]
+
+# Number of buckets (of the x-axis resp. of both axes for scatter plots):
+_DEFAULT_BUCKETS = {"line": 1000, "step": 1000, "point": 1000, "scatter": 200}
+
+
+def _to_keys(values):
+    "Returns <values> as float keys for bucketing (datetimes as nanoseconds)."
+
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return pd.DatetimeIndex(values).asi8.astype(float)
+    return np.asarray(values, dtype=float)
+
+
+def _limits_to_keys(limits, is_datetime):
+    limits = pd.Index(list(limits))
+    if is_datetime and not pd.api.types.is_datetime64_any_dtype(limits):
+        limits = pd.to_datetime(limits)
+    return _to_keys(limits)
+
+
+class _Buckets:
+    """Buckets of the keys of an axis: <n_buckets> equally sized buckets of the
+    range <limits> or, without limits, the buckets floor(key / width) of an
+    aligned width (10**k * 2**j), which doubles whenever the keys seen so far
+    span more than <n_buckets> buckets."""
+
+    def __init__(self, n_buckets, limits=None):
+        self.n_buckets = n_buckets
+        self.limits = limits
+        self.width = None
+        self.lo = None
+        self.hi = None
+        self.is_datetime = None
+
+    def mask(self, values):
+        "Returns the keys of <values> and the mask of the keys inside the buckets."
+
+        if self.is_datetime is None:
+            self.is_datetime = pd.api.types.is_datetime64_any_dtype(values)
+            if self.limits is not None:
+                self.lo, self.hi = _limits_to_keys(self.limits, self.is_datetime)
+                if not self.hi > self.lo:
+                    raise ValueError("The upper limit has to be larger than the lower.")
+                self.width = (self.hi - self.lo) / self.n_buckets
+        keys = _to_keys(values)
+        mask = np.isfinite(keys)
+        if self.limits is not None:
+            mask &= (keys >= self.lo) & (keys <= self.hi)
+        return keys, mask
+
+    def update(self, keys):
+        """Extends the buckets by the (valid) <keys>. Returns the factor by which
+        the width has grown (1 if unchanged)."""
+
+        if self.limits is not None or len(keys) == 0:
+            return 1
+        self.lo = keys.min() if self.lo is None else min(self.lo, keys.min())
+        self.hi = keys.max() if self.hi is None else max(self.hi, keys.max())
+        width = self.width
+        if width is None:
+            span = self.hi - self.lo
+            width = 10.0 ** np.floor(np.log10(span / self.n_buckets)) if span else 1.0
+        while np.floor(self.hi / width) - np.floor(self.lo / width) >= self.n_buckets:
+            width *= 2
+        factor = 1 if self.width is None else int(round(width / self.width))
+        self.width = width
+        return factor
+
+    def index(self, keys):
+        "Returns the buckets of <keys>."
+
+        if self.limits is not None:
+            buckets = np.floor((keys - self.lo) / self.width)
+            return np.clip(buckets, 0, self.n_buckets - 1).astype(np.int64)
+        return np.floor(keys / self.width).astype(np.int64)
+
+    def position(self, buckets, offset=0.0):
+        """Returns the keys at <offset> (0: start, 0.5: center) of <buckets> as
+        values of the axis (datetimes for datetime axes)."""
+
+        keys = (np.asarray(buckets) + offset) * self.width
+        if self.limits is not None:
+            keys = keys + self.lo
+        if self.is_datetime:
+            return pd.to_datetime(np.round(keys).astype(np.int64))
+        return keys
+
+
+def _regroup(counts, factors):
+    """Merges the buckets of <counts> (Series indexed by the buckets of each axis)
+    after their widths have grown by <factors>."""
+
+    if counts is None or all(factor == 1 for factor in factors):
+        return counts
+    levels = [
+        counts.index.get_level_values(i) // factor for i, factor in enumerate(factors)
+    ]
+    return counts.groupby(levels).sum()
+
+
+class _M4Reducer:
+    "Keeps the first, last, minimum and maximum row of each bucket and data column."
+
+    def __init__(self, x, y, n_buckets, xlim):
+        self.x = x
+        self.y = y
+        self.buckets = _Buckets(n_buckets, xlim)
+        self.data_cols = None
+        self.rows = None
+        self.keys = None
+
+    def add(self, chunk):
+        if self.data_cols is None:
+            self.data_cols = [
+                col for col in _determine_data_columns(self.y, chunk) if col != self.x
+            ]
+        columns = self.data_cols if self.x is None else [self.x] + self.data_cols
+        frame = chunk[columns]
+        keys, mask = self.buckets.mask(chunk.index if self.x is None else chunk[self.x])
+        frame, keys = frame[mask], keys[mask]
+        self.buckets.update(keys)
+        if self.rows is not None:
+            frame = pd.concat([self.rows, frame])
+            keys = np.concatenate([self.keys, keys])
+
+        table = pd.DataFrame({"bucket": self.buckets.index(keys), "key": keys})
+        for i, col in enumerate(self.data_cols):
+            table[f"__{i}"] = np.asarray(frame[col], dtype=float)
+        grouped = table.groupby("bucket")
+        selected = [grouped["key"].idxmin(), grouped["key"].idxmax()]
+        for i in range(len(self.data_cols)):
+            selected += [grouped[f"__{i}"].idxmin(), grouped[f"__{i}"].idxmax()]
+        rows = np.unique(pd.concat(selected).dropna().to_numpy(dtype=np.int64))
+        self.rows, self.keys = frame.iloc[rows], keys[rows]
+
+    def merge(self, other):
+        "Merges the rows selected by the reducer <other> of the same buckets."
+
+        self.add(other.result())
+
+    def result(self):
+        "Returns the selected rows sorted by their x-values."
+
+        return self.rows.iloc[np.argsort(self.keys, kind="stable")]
+
+
+class _GridReducer:
+    "Counts the rows in the cells of a 2D grid of the x- and y-values."
+
+    def __init__(self, x, y, n_buckets, xlim, ylim):
+        if x is None or y is None or isinstance(y, (list, tuple)):
+            raise ValueError(
+                "For scatter plots of chunks, <x> and <y> have to be column names."
+            )
+        self.x = x
+        self.y = y
+        self.axes = [_Buckets(n_buckets, xlim), _Buckets(n_buckets, ylim)]
+        self.counts = None
+
+    def add(self, chunk):
+        (x_keys, x_mask), (y_keys, y_mask) = [
+            axis.mask(chunk[col]) for axis, col in zip(self.axes, [self.x, self.y])
+        ]
+        mask = x_mask & y_mask
+        keys = [x_keys[mask], y_keys[mask]]
+        factors = [axis.update(axis_keys) for axis, axis_keys in zip(self.axes, keys)]
+        self.counts = _regroup(self.counts, factors)
+        cells = [axis.index(axis_keys) for axis, axis_keys in zip(self.axes, keys)]
+        counts = pd.Series(np.ones(len(keys[0]), dtype=np.int64)).groupby(cells).sum()
+        self.counts = (
+            counts if self.counts is None else self.counts.add(counts, fill_value=0)
+        )
+
+    def merge(self, other):
+        "Merges the counts of the reducer <other> of the same (fixed) grid."
+
+        self.counts = self.counts.add(other.counts, fill_value=0)
+
+    def result(self):
+        "Returns the centers of the non-empty cells and their number of rows."
+
+        if self.counts is None or len(self.counts) == 0:
+            raise ValueError("The chunks do not contain any rows to plot.")
+        return pd.DataFrame(
+            {
+                self.x: self.axes[0].position(
+                    self.counts.index.get_level_values(0), 0.5
+                ),
+                self.y: self.axes[1].position(
+                    self.counts.index.get_level_values(1), 0.5
+                ),
+                "count": self.counts.to_numpy(dtype=np.int64),
+            }
+        )
+
+
+class _HistReducer:
+    """Sums the (weighted) counts of the bins of each data column: fixed bins for
+    bin edges <bins>, otherwise at most <bins> streaming bins."""
+
+    def __init__(self, y, bins, weights):
+        if bins is None:
+            bins = 10
+        if isinstance(bins, int):
+            if bins < 1:
+                raise ValueError(
+                    "<bins> can only be an integer>0, a list or a range of numbers."
+                )
+            self.edges = None
+            self.buckets = _Buckets(bins)
+        else:
+            self.edges = np.asarray(bins, dtype=float)
+            self.buckets = None
+        self.y = y
+        self.weights = weights
+        self.data_cols = None
+        self.counts = None
+        self.sums = None
+        self.totals = None
+
+    def add(self, chunk):
+        if self.data_cols is None:
+            self.data_cols = [
+                col
+                for col in _determine_data_columns(self.y, chunk)
+                if col != self.weights
+            ]
+            self.counts = {col: None for col in self.data_cols}
+            self.sums = {col: 0.0 for col in self.data_cols}
+            self.totals = {col: 0.0 for col in self.data_cols}
+        if self.weights is not None and self.weights not in chunk.columns:
+            raise ValueError(
+                f"Column '{self.weights}' for <weights> is not in provided DataFrame."
+            )
+
+        weights = (
+            np.ones(len(chunk))
+            if self.weights is None
+            else np.asarray(chunk[self.weights], dtype=float)
+        )
+        values = {}
+        for col in self.data_cols:
+            col_values = np.asarray(chunk[col], dtype=float)
+            valid = ~(np.isnan(col_values) | np.isnan(weights))
+            values[col] = (col_values[valid], weights[valid])
+            self.sums[col] += np.sum(col_values[valid] * weights[valid])
+            self.totals[col] += np.sum(weights[valid])
+
+        if self.edges is not None:
+            for col, (col_values, col_weights) in values.items():
+                counts, _ = np.histogram(
+                    col_values, bins=self.edges, weights=col_weights
+                )
+                self.counts[col] = (
+                    counts if self.counts[col] is None else self.counts[col] + counts
+                )
+            return
+
+        # Streaming bins (shared by all data columns):
+        factor = self.buckets.update(
+            np.concatenate([col_values for col_values, _ in values.values()])
+        )
+        for col, (col_values, col_weights) in values.items():
+            counts = _regroup(self.counts[col], [factor])
+            chunk_counts = (
+                pd.Series(col_weights).groupby(self.buckets.index(col_values)).sum()
+            )
+            self.counts[col] = (
+                chunk_counts
+                if counts is None
+                else counts.add(chunk_counts, fill_value=0)
+            )
+
+    def merge(self, other):
+        "Merges the counts of the reducer <other> of the same fixed bins."
+
+        for col in self.data_cols:
+            self.counts[col] = self.counts[col] + other.counts[col]
+            self.sums[col] += other.sums[col]
+            self.totals[col] += other.totals[col]
+
+    def result(self):
+        "Returns the bin edges, the counts and the averages of each data column."
+
+        averages = [
+            self.sums[col] / self.totals[col] if self.totals[col] else np.nan
+            for col in self.data_cols
+        ]
+        if self.edges is not None:
+            return (
+                list(self.edges),
+                [self.counts[col] for col in self.data_cols],
+                averages,
+            )
+
+        if self.buckets.width is None:
+            raise ValueError("The chunks do not contain any values to plot.")
+        first, last = [
+            int(np.floor(key / self.buckets.width))
+            for key in [self.buckets.lo, self.buckets.hi]
+        ]
+        buckets = np.arange(first, last + 1)
+        aggregates = [
+            self.counts[col].reindex(buckets, fill_value=0).to_numpy(dtype=float)
+            for col in self.data_cols
+        ]
+        edges = self.buckets.position(np.arange(first, last + 2))
+        return list(edges), aggregates, averages
+
+
+class _TopKReducer:
+    """Sums the data columns (or counts the rows) per category. With <top_k>, only
+    the <capacity> categories with the largest totals are kept if there are more
+    than 2 * <capacity> categories (the result is exact if there are at most
+    <capacity> categories). Without <top_k>, all categories are kept."""
+
+    def __init__(self, x, y, top_k=None):
+        self.x = x
+        self.y = y
+        self.top_k = top_k
+        self.capacity = None if top_k is None else max(100 * top_k, 10_000)
+        self.data_cols = None
+        self.totals = None
+
+    def add(self, chunk):
+        keys = chunk.index if self.x is None else chunk[self.x]
+        if self.data_cols is None:
+            columns = chunk.drop(columns=[self.x]) if self.x is not None else chunk
+            if self.y is None and not any(
+                pd.api.types.is_numeric_dtype(dtype) for dtype in columns.dtypes
+            ):
+                self.data_cols = ["count"]
+            else:
+                self.data_cols = _determine_data_columns(self.y, columns)
+        if self.data_cols == ["count"]:
+            totals = pd.Series(keys).value_counts().to_frame("count")
+        else:
+            totals = chunk[self.data_cols].groupby(np.asarray(keys)).sum()
+        self.totals = (
+            totals if self.totals is None else self.totals.add(totals, fill_value=0)
+        )
+        if self.capacity is not None and len(self.totals) > 2 * self.capacity:
+            self.totals = self._largest(self.capacity)
+
+    def merge(self, other):
+        "Merges the totals of the reducer <other>."
+
+        self.totals = self.totals.add(other.totals, fill_value=0)
+        if self.capacity is not None and len(self.totals) > 2 * self.capacity:
+            self.totals = self._largest(self.capacity)
+
+    def _largest(self, n):
+        return self.totals.loc[self.totals.sum(axis=1).nlargest(n).index]
+
+    def result(self):
+        "Returns the <top_k> categories with the largest totals (or all)."
+
+        result = self.totals if self.top_k is None else self._largest(self.top_k)
+        result.index.name = self.x
+        return result
+
+
+def _plot_histogram(
+    result, data_cols, normed, cumulative, show_figure, return_html, kwargs
+):
+    """Plots the histogram <result> (bin edges, counts and averages of the data
+    columns) like plot(kind='hist')."""
+
+    edges, aggregates, averages = result
+    for i, aggregate in enumerate(aggregates):
+        if normed:
+            aggregate = aggregate / np.sum(aggregate) * normed
+        if cumulative:
+            aggregate = np.cumsum(aggregate)
+        aggregates[i] = aggregate
+
+    # Prepare the plot for a DataFrame of bin centers and replace its counts:
+    centers = (np.asarray(edges[:-1]) + np.asarray(edges[1:])) / 2
+    template = pd.DataFrame({col: centers for col in data_cols})
+    spec = prepare_plot(template, kind="hist", y=data_cols, bins=edges, **kwargs)
+    spec = spec._replace(data=dict(spec.data, aggregates=aggregates, averages=averages))
+    p = render_plot(spec)
+
+    if show_figure:
+        show(p)
+    if return_html:
+        return embedded_html(p)
+    return p
+
+
+def _plot_reduced(
+    kind, result, data_cols, x, buckets, show_figure, return_html, kwargs
+):
+    """Plots the <result> of a reducer (see the reducers above) of the plot <kind>
+    with the data columns <data_cols>."""
+
+    if kind == "hist":
+        normed = kwargs.pop("normed", False)
+        cumulative = kwargs.pop("cumulative", False)
+        return _plot_histogram(
+            result, data_cols, normed, cumulative, show_figure, return_html, kwargs
+        )
+    if kind == "scatter":
+        # The cells are colored by their number of rows:
+        kwargs.pop("category", None)
+        kwargs.setdefault("marker", "square")
+        kwargs.setdefault("line_color", None)
+        width = kwargs["figsize"][0] if kwargs.get("figsize") else 600
+        kwargs.setdefault("size", max(round(width / buckets), 2))
+        return plot(
+            result,
+            kind=kind,
+            x=x,
+            y=data_cols[0],
+            category="count",
+            show_figure=show_figure,
+            return_html=return_html,
+            **kwargs,
+        )
+    if kind in ["bar", "barh"]:
+        x = None
+    return plot(
+        result,
+        kind=kind,
+        x=x,
+        y=data_cols,
+        show_figure=show_figure,
+        return_html=return_html,
+        **kwargs,
+    )
+
+
+def plot_chunks(  # noqa C901
+    chunks,
+    kind="line",
+    x=None,
+    y=None,
+    buckets=None,
+    top_k=None,
+    show_figure=True,
+    return_html=False,
+    **kwargs,
+):
+    """Plots the data of an iterator of DataFrames (e.g. pd.read_csv(...,
+    chunksize=...)) without materializing it: each chunk is reduced by a
+    mergeable one-pass reducer, such that the memory is bounded by the chunk size.
+
+    Parameters:
+    ----------------------------------------------------------------
+    chunks (iterable) – DataFrames, Series or pyarrow RecordBatches/Tables with
+                        the rows of the data
+    kind (str) – "line", "step", "point", "scatter", "hist", "bar" or "barh":
+                 - line, step, point: the first, last, minimum and maximum row of
+                   each of <buckets> buckets of the x-range (M4) are plotted. With
+                   <xlim>, the buckets divide this range (rows outside are
+                   dropped), otherwise the buckets grow with the data.
+                 - scatter: the number of rows in each cell of a grid of
+                   <buckets> x <buckets> cells (of <xlim> and <ylim> if given)
+                   is drawn as colored square; <x> and <y> are required.
+                 - hist: counts of the bins <bins> if bin edges are given,
+                   otherwise of at most <bins> (default: 10) streaming bins of
+                   equal, aligned width. Supports <weights>, <normed> and
+                   <cumulative>.
+                 - bar, barh: sums of the data columns (or the number of rows
+                   if there are no numeric columns) per category of <x>
+                   (default: the index). With <top_k>, only the categories with
+                   the largest totals are plotted.
+    x, y – columns like for plot()
+    buckets (int, optional) – number of buckets (default: 1000 for lines, 200
+                              per axis for scatter plots)
+    top_k (int, optional) – number of categories with the largest totals of
+                            bar plots (default: all)
+    show_figure, return_html, **kwargs – like for plot()
+
+    Returns:
+    ----------------------------------------------------------------
+    The figure (or its HTML for return_html=True)."""
+
+    if kind not in CHUNK_KINDS:
+        allowed_kinds = "', '".join(CHUNK_KINDS)
+        raise ValueError(f"For chunks, the allowed plot kinds are '{allowed_kinds}'.")
+    if buckets is None:
+        buckets = _DEFAULT_BUCKETS.get(kind)
+    if buckets is not None and (not isinstance(buckets, int) or buckets < 1):
+        raise ValueError("<buckets> has to be an integer >= 1.")
+    if top_k is not None and (not isinstance(top_k, int) or top_k < 1):
+        raise ValueError("<top_k> has to be an integer >= 1.")
+
+    if kind in ["line", "step", "point"]:
+        reducer = _M4Reducer(x, y, buckets, kwargs.get("xlim"))
+    elif kind == "scatter":
+        reducer = _GridReducer(x, y, buckets, kwargs.get("xlim"), kwargs.get("ylim"))
+    elif kind == "hist":
+        reducer = _HistReducer(y, kwargs.pop("bins", None), kwargs.pop("weights", None))
+    else:
+        reducer = _TopKReducer(x, y, top_k)
+
+    n_rows = 0
+    for chunk in chunks:
+        if _is_arrow(chunk):
+            chunk = _arrow_to_pandas(chunk)
+        if isinstance(chunk, pd.Series):
+            chunk = chunk.to_frame()
+        if len(chunk) > 0:
+            reducer.add(chunk)
+            n_rows += len(chunk)
+    if n_rows == 0:
+        raise ValueError("The chunks do not contain any rows to plot.")
+
+    data_cols = [y] if kind == "scatter" else reducer.data_cols
+    return _plot_reduced(
+        kind, reducer.result(), data_cols, x, buckets, show_figure, return_html, kwargs
+    )
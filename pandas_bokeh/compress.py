@@ -0,0 +1,94 @@
+"""Compressed embedding of Bokeh documents: the serialized document is deflate
+compressed and base64 encoded. A small loader inflates it in the browser via the
+native DecompressionStream API (supported by all current browsers) before it is
+handed to BokehJS:
+
+>>> html = pandas_bokeh.embedded_html(p, compress=True)
+>>> pandas_bokeh.output_file("report.html", compress=True)"""
+
+import base64
+import json
+import zlib
+from textwrap import indent
+
+from bokeh.core.json_encoder import serialize_json
+from bokeh.core.templates import DOC_JS, MACROS, ROOT_DIV
+from bokeh.embed.elements import script_for_render_items
+from bokeh.embed.util import OutputDocumentFor, standalone_docs_json_and_render_items
+from bokeh.embed.wrappers import wrap_in_onload, wrap_in_safely, wrap_in_script_tag
+from bokeh.model import Model
+
+_LOADER_JS = """\
+const payload = "%(payload)s";
+Promise.resolve().then(function() {
+  if (typeof DecompressionStream === "undefined")
+    throw new Error("this browser does not support DecompressionStream");
+  const bytes = Uint8Array.from(atob(payload), function(c) { return c.charCodeAt(0); });
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("deflate"));
+  return new Response(stream).text();
+}).then(function(text) {
+%(doc_js)s
+}).catch(function(error) {
+  console.error("Bokeh: loading the compressed document failed:", error);
+  const message = document.createElement("pre");
+  message.style.color = "red";
+  message.textContent = "Bokeh: loading the compressed document failed: " + error;
+  document.body.appendChild(message);
+});"""
+
+
+def _deflate_docs_json(docs_json):
+    "Returns the deflate compressed and base64 encoded JSON of <docs_json>."
+
+    data = serialize_json(docs_json, pretty=False).encode("utf-8")
+    return base64.b64encode(zlib.compress(data, 9)).decode("ascii")
+
+
+def _inflate_payload(payload):
+    "Returns the documents of a compressed payload (see _deflate_docs_json)."
+
+    return json.loads(zlib.decompress(base64.b64decode(payload)).decode("utf-8"))
+
+
+def _serialize_models(models):
+    """Returns the documents JSON and the render item of <models> (a Model or a
+    list of models) and whether a single Model was given."""
+
+    was_single_object = isinstance(models, Model)
+    models = [models] if was_single_object else list(models)
+    with OutputDocumentFor(models):
+        docs_json, [render_item] = standalone_docs_json_and_render_items(models)
+    return docs_json, render_item, was_single_object
+
+
+def _document_script(docs_json, render_item, compress=False):
+    "Returns the <script> tag that embeds the documents <docs_json>."
+
+    if not compress:
+        return wrap_in_script_tag(script_for_render_items(docs_json, [render_item]))
+
+    doc_js = DOC_JS.render(
+        docs_json="JSON.parse(text)",
+        render_items=serialize_json([render_item.to_json()], pretty=False),
+    )
+    js = _LOADER_JS % dict(
+        payload=_deflate_docs_json(docs_json), doc_js=indent(doc_js, "  ")
+    )
+    return wrap_in_script_tag(wrap_in_onload(wrap_in_safely(js)))
+
+
+def _root_divs(render_item, was_single_object):
+    divs = tuple(
+        ROOT_DIV.render(root=root, macros=MACROS) for root in render_item.roots
+    )
+    return divs[0] if was_single_object else divs
+
+
+def compressed_components(models):
+    """Like bokeh.embed.components, but the script contains the compressed
+    document. Returns the script and a single div (if <models> is a Model) or a
+    tuple of divs (for a list of models)."""
+
+    docs_json, render_item, was_single_object = _serialize_models(models)
+    script = _document_script(docs_json, render_item, compress=True)
+    return script, _root_divs(render_item, was_single_object)
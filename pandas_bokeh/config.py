@@ -0,0 +1,344 @@
+"""Registry of global default options of Pandas-Bokeh (similar to the options of
+pandas), e.g.:
+
+>>> pandas_bokeh.set_option("max_payload_bytes", 5_000_000)
+>>> pandas_bokeh.options.precision = "float32"
+>>> with pandas_bokeh.option_context(webgl=False, hover="off"):
+...     df.plot_bokeh.line()
+
+Keyword arguments of the plotting functions always take precedence over the
+options. Options set via option_context only apply to the current thread or
+asyncio task (and to the plots it renders in the worker pool)."""
+
+import concurrent.futures
+import contextvars
+import math
+import numbers
+import os
+from contextlib import contextmanager
+
+from .utils import PRECISIONS
+
+# Registered options: name -> (default, description, validator):
+_REGISTERED_OPTIONS = {}
+# Process-wide values of the options:
+_values = {}
+# Values of the options set via option_context in the current context:
+_CONTEXT_VALUES = contextvars.ContextVar("pandas_bokeh_options", default=None)
+
+
+def register_option(name, default, description, validator=None):
+    """Registers option <name> with its <default> value. <validator> is called with
+    each new value and raises a ValueError for invalid values."""
+
+    if name in _REGISTERED_OPTIONS:
+        raise ValueError(f"Option '{name}' is already registered.")
+    if validator is not None:
+        validator(default)
+    _REGISTERED_OPTIONS[name] = (default, description, validator)
+    _values[name] = default
+
+
+def _check_name(name):
+    if name not in _REGISTERED_OPTIONS:
+        available_options = "', '".join(_REGISTERED_OPTIONS)
+        raise ValueError(
+            f"Unknown option '{name}'. Available options are '{available_options}'."
+        )
+
+
+def _pairs(args, kwargs):
+    "Returns the (name, value) pairs of <args> = (name1, value1, ...) and <kwargs>."
+
+    if len(args) % 2 != 0:
+        raise ValueError("Options have to be passed as pairs of name and value.")
+    return list(zip(args[::2], args[1::2])) + list(kwargs.items())
+
+
+def _validate(pairs):
+    for name, value in pairs:
+        _check_name(name)
+        validator = _REGISTERED_OPTIONS[name][2]
+        if validator is not None:
+            validator(value)
+
+
+def get_option(name):
+    """Returns the current value of option <name>."""
+
+    _check_name(name)
+    context_values = _CONTEXT_VALUES.get()
+    if context_values is not None and name in context_values:
+        return context_values[name]
+    return _values[name]
+
+
+def set_option(*args, **kwargs):
+    """Sets the value of one or multiple options, either passed as pairs of name
+    and value or as keyword arguments:
+
+    >>> set_option("precision", "float32", "webgl", False)
+    >>> set_option(precision="float32", webgl=False)
+
+    Inside an option_context, the options are only changed until the context
+    exits."""
+
+    pairs = _pairs(args, kwargs)
+    # Validate all values before setting any of them:
+    _validate(pairs)
+    context_values = _CONTEXT_VALUES.get()
+    if context_values is not None:
+        _CONTEXT_VALUES.set(dict(context_values, **dict(pairs)))
+        return
+    for name, value in pairs:
+        _values[name] = value
+
+
+def reset_option(name="all"):
+    """Resets option <name> (or all options for "all") to its default value."""
+
+    names = list(_REGISTERED_OPTIONS) if name == "all" else [name]
+    defaults = []
+    for name in names:
+        _check_name(name)
+        defaults += [name, _REGISTERED_OPTIONS[name][0]]
+    set_option(*defaults)
+
+
+def describe_option(name=None):
+    """Returns the description, default and current value of option <name> (or of
+    all options)."""
+
+    names = list(_REGISTERED_OPTIONS) if name is None else [name]
+    descriptions = []
+    for name in names:
+        _check_name(name)
+        default, description, _ = _REGISTERED_OPTIONS[name]
+        descriptions.append(
+            f"{name}: {description}\n"
+            f"    [default: {default!r}] [currently: {get_option(name)!r}]"
+        )
+    return "\n".join(descriptions)
+
+
+@contextmanager
+def option_context(*args, **kwargs):
+    """Context manager to temporarily set options (passed like for set_option) for
+    the current thread or asyncio task:
+
+    >>> with option_context("precision", "int16"):
+    ...     df.plot_bokeh.line()
+    """
+
+    pairs = _pairs(args, kwargs)
+    _validate(pairs)
+    token = _CONTEXT_VALUES.set(dict(_CONTEXT_VALUES.get() or {}, **dict(pairs)))
+    try:
+        yield
+    finally:
+        _CONTEXT_VALUES.reset(token)
+
+
+class _Options:
+    """Attribute access to the options: pandas_bokeh.options.precision = "int16"."""
+
+    def __getattr__(self, name):
+        if name not in _REGISTERED_OPTIONS:
+            raise AttributeError(f"Unknown option '{name}'.")
+        return get_option(name)
+
+    def __setattr__(self, name, value):
+        if name not in _REGISTERED_OPTIONS:
+            raise AttributeError(f"Unknown option '{name}'.")
+        set_option(name, value)
+
+    def __dir__(self):
+        return list(_REGISTERED_OPTIONS)
+
+    def __repr__(self):
+        return describe_option()
+
+
+options = _Options()
+
+
+# Validators:
+def _is_one_of(allowed_values):
+    def validator(value):
+        if value not in allowed_values:
+            raise ValueError(f"Value has to be one of {allowed_values}, not {value!r}.")
+
+    return validator
+
+
+def _is_bool(value):
+    if not isinstance(value, bool):
+        raise ValueError(f"Value has to be True or False, not {value!r}.")
+
+
+def _is_positive_number_or_none(value):
+    if value is None:
+        return
+    if (
+        not isinstance(value, numbers.Number)
+        or isinstance(value, bool)
+        or not value > 0
+    ):
+        raise ValueError(f"Value has to be None or a positive number, not {value!r}.")
+
+
+def _is_positive_number(value):
+    if value is None:
+        raise ValueError("Value has to be a positive number, not None.")
+    _is_positive_number_or_none(value)
+
+
+def _is_positive_integer_or_none(value):
+    if value is None:
+        return
+    if not isinstance(value, numbers.Integral) or isinstance(value, bool) or value < 1:
+        raise ValueError(f"Value has to be None or an integer >= 1, not {value!r}.")
+
+
+def _is_positive_integer(value):
+    if value is None:
+        raise ValueError("Value has to be an integer >= 1, not None.")
+    _is_positive_integer_or_none(value)
+
+
+def _is_pool(value):
+    if value not in ("thread", "process") and not isinstance(
+        value, concurrent.futures.Executor
+    ):
+        raise ValueError(
+            f'Value has to be "thread", "process" or an Executor, not {value!r}.'
+        )
+
+
+def _is_cache(value):
+    if (
+        value is not None
+        and value != "memory"
+        and not isinstance(value, (str, os.PathLike))
+    ):
+        raise ValueError(
+            f'Value has to be None, "memory" or a directory, not {value!r}.'
+        )
+
+
+def _is_integer_larger_1_or_none(value):
+    if value is None:
+        return
+    if not isinstance(value, numbers.Integral) or isinstance(value, bool) or value < 2:
+        raise ValueError(f"Value has to be None or an integer >= 2, not {value!r}.")
+
+
+def _is_integer_larger_1_or_unlimited(value):
+    if value == math.inf:
+        return
+    _is_integer_larger_1_or_none(value)
+
+
+def _is_integer_larger_1(value):
+    if value is None:
+        raise ValueError("Value has to be an integer >= 2, not None.")
+    _is_integer_larger_1_or_none(value)
+
+
+# Default options:
+register_option(
+    "webgl",
+    True,
+    "Use the WebGL backend of Bokeh for rendering the glyphs (<webgl>).",
+    _is_bool,
+)
+register_option(
+    "precision",
+    "float64",
+    "Precision of the numeric plot data sent to the browser (<precision>).",
+    _is_one_of(PRECISIONS),
+)
+register_option(
+    "max_payload_bytes",
+    20_000_000,
+    "Budget for the estimated size of the plot data in bytes, None for no limit "
+    "(<max_payload_bytes>).",
+    _is_positive_number_or_none,
+)
+register_option(
+    "downsampling",
+    "lttb",
+    "Downsampling method for line, step and area plots exceeding the payload "
+    'budget: "lttb" (Largest-Triangle-Three-Buckets), "minmax" (minimum and '
+    'maximum of equally sized buckets) or "sample" (random sample).',
+    _is_one_of(["lttb", "minmax", "sample"]),
+)
+register_option(
+    "max_points",
+    1000,
+    "Maximum number of vertices of ECDF plots, None or float('inf') to draw every "
+    "value (<max_points>).",
+    _is_integer_larger_1_or_unlimited,
+)
+register_option(
+    "progressive_points",
+    2000,
+    "Number of rows embedded into progressive plots before their full data is "
+    "loaded (<progressive>=True).",
+    _is_integer_larger_1,
+)
+register_option(
+    "progressive_chunk_rows",
+    100_000,
+    "Number of rows per sidecar file of the full data of progressive plots.",
+    _is_positive_integer,
+)
+register_option(
+    "stream_fps",
+    10,
+    "Maximum number of updates per second of live plots (pandas_bokeh.stream).",
+    _is_positive_number,
+)
+register_option(
+    "hover",
+    "dictionary",
+    'Hovertool strategy: "dictionary" (hovertools, repeated strings of columns only '
+    'shown in the hovertool are dictionary-encoded), "raw" (hovertools without '
+    'encoding) or "off" (no hovertools unless <hovertool>=True).',
+    _is_one_of(["dictionary", "raw", "off"]),
+)
+register_option(
+    "pool",
+    "thread",
+    'Worker pool of the awaitable plotting API (e.g. df.plot_bokeh.aline): "thread", '
+    '"process" or a concurrent.futures.Executor.',
+    _is_pool,
+)
+register_option(
+    "workers",
+    min(4, os.cpu_count() or 1),
+    'Number of workers of the "thread" or "process" pool, None for the default of '
+    "concurrent.futures.",
+    _is_positive_integer_or_none,
+)
+register_option(
+    "max_concurrency",
+    None,
+    "Maximum number of awaitable plotting calls that are running or queued in the "
+    "worker pool at the same time (per event loop), None for no limit.",
+    _is_positive_integer_or_none,
+)
+register_option(
+    "cache",
+    None,
+    'Cache for the results of plot calls: None (no caching), "memory" or the path '
+    "of a directory.",
+    _is_cache,
+)
+register_option(
+    "cache_max_bytes",
+    256_000_000,
+    "Maximum size of the cached results in bytes (least recently used results are "
+    "evicted first).",
+    _is_positive_number,
+)
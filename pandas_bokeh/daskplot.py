@@ -0,0 +1,161 @@
+"""Plotting of Dask DataFrames via their plot_bokeh accessor (registered if
+dask.dataframe is installed):
+
+>>> ddf = dd.read_parquet("sensors/*.parquet")
+>>> ddf.plot_bokeh.line(x="time", y="temperature")
+
+Line, step, point, scatter, hist, bar and barh plots are reduced by the
+reducers of plot_chunks: each partition is reduced in parallel by a Dask task
+and only the reducers are collected and merged. As the merged reducers need
+the same buckets, the limits of the buckets (resp. the bin edges) are computed
+by Dask beforehand if not given via <xlim>, <ylim> or <bins>. Other plot kinds
+compute the columns used by the plot into a pandas DataFrame."""
+
+import functools
+
+import numpy as np
+import pandas as pd
+
+from .cache import _used_columns
+from .chunks import (
+    _DEFAULT_BUCKETS,
+    CHUNK_KINDS,
+    _GridReducer,
+    _HistReducer,
+    _M4Reducer,
+    _plot_reduced,
+    _TopKReducer,
+)
+from .plot import FramePlotMethods, _determine_data_columns, plot
+
+
+def _limits(ddf, columns):
+    """Returns the minimum and maximum of the <columns> of the Dask DataFrame
+    <ddf> (None for its index) as limits of buckets."""
+
+    import dask
+
+    aggregates = []
+    for col in columns:
+        values = ddf.index if col is None else ddf[col]
+        aggregates += [values.min(), values.max()]
+    aggregates = [value for value in dask.compute(*aggregates) if not pd.isna(value)]
+    if not aggregates:
+        raise ValueError("The DataFrame does not contain any values to plot.")
+    lo, hi = min(aggregates), max(aggregates)
+    if lo == hi:
+        delta = pd.Timedelta(1, "s") if isinstance(lo, pd.Timestamp) else 0.5
+        lo, hi = lo - delta, hi + delta
+    return lo, hi
+
+
+def _reduce_partition(partition, reducer_factory):
+    "Returns a reducer of the rows of <partition> (None for empty partitions)."
+
+    if isinstance(partition, pd.Series):
+        partition = partition.to_frame()
+    if len(partition) == 0:
+        return None
+    reducer = reducer_factory()
+    reducer.add(partition)
+    return reducer
+
+
+class DaskPlotMethods(FramePlotMethods):
+    """Dask DataFrame plotting accessor and method
+
+    Examples
+    --------
+    >>> ddf.plot_bokeh.line(x="time", y="temperature")
+    >>> ddf.plot_bokeh(kind="hist", y="temperature", bins=50)
+    """
+
+    def __call__(  # noqa C901
+        self, x=None, y=None, kind="line", buckets=None, top_k=None, **kwargs
+    ):
+        """Plots the Dask DataFrame like plot(), reducing its partitions in
+        parallel (see the module docstring and plot_chunks for the reductions of
+        the plot kinds).
+
+        Parameters (in addition to plot()):
+        ----------------------------------------------------------------
+        buckets (int, optional) – number of buckets of line, step and point plots
+                                  (default: 1000) resp. of each axis of scatter
+                                  plots (default: 200)
+        top_k (int, optional) – number of categories with the largest totals of
+                                bar plots (default: all)"""
+
+        import dask
+
+        ddf = self._parent
+        columns = _used_columns(ddf._meta, dict(kwargs, x=x, y=y, kwargs=kwargs))
+        if kind not in CHUNK_KINDS:
+            return plot(ddf[columns].compute(), x=x, y=y, kind=kind, **kwargs)
+
+        if buckets is None:
+            buckets = _DEFAULT_BUCKETS.get(kind)
+        if buckets is not None and (not isinstance(buckets, int) or buckets < 1):
+            raise ValueError("<buckets> has to be an integer >= 1.")
+        if top_k is not None and (not isinstance(top_k, int) or top_k < 1):
+            raise ValueError("<top_k> has to be an integer >= 1.")
+        ddf = ddf[columns]
+
+        if kind in ["line", "step", "point"]:
+            xlim = kwargs.get("xlim") or _limits(ddf, [x])
+            reducer_factory = functools.partial(_M4Reducer, x, y, buckets, xlim)
+        elif kind == "scatter":
+            if x is None or y is None or isinstance(y, (list, tuple)):
+                raise ValueError(
+                    "For scatter plots of Dask DataFrames, <x> and <y> have to be "
+                    "column names."
+                )
+            xlim = kwargs.get("xlim") or _limits(ddf, [x])
+            ylim = kwargs.get("ylim") or _limits(ddf, [y])
+            reducer_factory = functools.partial(_GridReducer, x, y, buckets, xlim, ylim)
+        elif kind == "hist":
+            bins = kwargs.pop("bins", None)
+            weights = kwargs.pop("weights", None)
+            if bins is None or isinstance(bins, int):
+                if bins is not None and bins < 1:
+                    raise ValueError(
+                        "<bins> can only be an integer>0, a list or a range of "
+                        "numbers."
+                    )
+                data_cols = [
+                    col
+                    for col in _determine_data_columns(y, ddf._meta)
+                    if col != weights
+                ]
+                lo, hi = _limits(ddf, data_cols)
+                bins = np.linspace(lo, hi, (bins or 10) + 1)
+            reducer_factory = functools.partial(_HistReducer, y, bins, weights)
+        else:
+            reducer_factory = functools.partial(_TopKReducer, x, y, top_k)
+
+        # Reduce the partitions in parallel and merge their reducers:
+        tasks = [
+            dask.delayed(_reduce_partition)(partition, reducer_factory)
+            for partition in ddf.to_delayed()
+        ]
+        reducers = [reducer for reducer in dask.compute(*tasks) if reducer is not None]
+        if not reducers:
+            raise ValueError("The DataFrame does not contain any rows to plot.")
+        reducer = reducers[0]
+        for other in reducers[1:]:
+            reducer.merge(other)
+
+        data_cols = [y] if kind == "scatter" else reducer.data_cols
+        return _plot_reduced(
+            kind,
+            reducer.result(),
+            data_cols,
+            x,
+            buckets,
+            kwargs.pop("show_figure", True),
+            kwargs.pop("return_html", False),
+            kwargs,
+        )
+
+    @property
+    def df(self):
+        return self._parent.compute()
@@ -0,0 +1,149 @@
+"""Deduplication of identical columns across the data sources of figures, grids
+and reports: plots of the same DataFrame contain the same x-values (and often the
+same y-columns) in separate ColumnDataSources, which are all serialized.
+
+Sources with the same length, whose common columns are identical (compared by a
+hash of their buffers), are merged into a single shared source:
+
+>>> layout = pandas_bokeh.plot_grid([[p1, p2], [p3, p4]], show_plot=False)
+>>> pandas_bokeh.deduplicate_sources(layout)
+DeduplicationResult(sources_before=8, sources_after=1, bytes_saved=...)"""
+
+import hashlib
+from collections import namedtuple
+
+from bokeh.models import CDSView, ColumnDataSource, GlyphRenderer
+
+from .progressive import _FULL_DATA
+from .spec import _update_fingerprint
+from .utils import _estimate_column_bytes
+
+DeduplicationResult = namedtuple(
+    "DeduplicationResult", ["sources_before", "sources_after", "bytes_saved"]
+)
+
+# References to data sources that can be redirected to a merged source:
+_REDIRECTABLE_REFERENCES = [(GlyphRenderer, "data_source"), (CDSView, "source")]
+
+
+def _contains(value, source):
+    if value is source:
+        return True
+    if isinstance(value, (list, tuple)):
+        return any(_contains(element, source) for element in value)
+    if isinstance(value, dict):
+        return any(_contains(element, source) for element in value.values())
+    return False
+
+
+def _is_redirectable(model, name):
+    return any(
+        isinstance(model, cls) and name == attribute
+        for cls, attribute in _REDIRECTABLE_REFERENCES
+    )
+
+
+def _column_hash(values):
+    hash_object = hashlib.sha1()
+    _update_fingerprint(hash_object, values)
+    return hash_object.digest()
+
+
+def _models(obj):
+    "Returns all models referenced by <obj> (a model, Report or list of these)."
+
+    from .report import Report
+
+    if isinstance(obj, Report):
+        obj = [item for kind, item in obj._items if kind == "model"]
+    if isinstance(obj, (list, tuple)):
+        models = {}
+        for element in obj:
+            models.update((model.id, model) for model in _models(element))
+        return list(models.values())
+    return list(obj.references())
+
+
+def deduplicate_sources(obj):  # noqa C901
+    """Merges the ColumnDataSources of <obj> (a figure, layout, Report or list of
+    these) that have the same length, share at least one column and have
+    identical values in all their common columns into shared sources, such that
+    each column is serialized only once.
+
+    Only plain ColumnDataSources that are exclusively referenced by glyph
+    renderers (and their views) and have no callbacks are merged (sources of
+    progressive plots are kept). Since merged
+    sources are shared, selections are linked between the affected glyphs.
+
+    Returns a DeduplicationResult with the number of sources before and after the
+    merge and the estimated number of saved bytes of the serialized data."""
+
+    models = _models(obj)
+    sources = [
+        model
+        for model in models
+        if type(model) is ColumnDataSource
+        and model not in _FULL_DATA
+        and not model.js_property_callbacks
+        and not model.js_event_callbacks
+    ]
+    n_sources = len([model for model in models if isinstance(model, ColumnDataSource)])
+    if len(sources) < 2:
+        return DeduplicationResult(n_sources, n_sources, 0)
+
+    # Find all references to the sources:
+    references = {source.id: [] for source in sources}
+    for model in models:
+        for name in model.properties_with_refs():
+            value = getattr(model, name)
+            for source in sources:
+                if _contains(value, source):
+                    references[source.id].append((model, name))
+    sources = [
+        source
+        for source in sources
+        if all(_is_redirectable(model, name) for model, name in references[source.id])
+    ]
+
+    # Merge each source into the first compatible merged source:
+    merged = []  # [target, {column: hash}, length]
+    bytes_saved = 0
+    n_merged = 0
+    for source in sources:
+        lengths = {len(values) for values in source.data.values()}
+        if len(lengths) > 1:
+            continue
+        length = lengths.pop() if lengths else 0
+        hashes = {name: _column_hash(values) for name, values in source.data.items()}
+        for target, target_hashes, target_length in merged:
+            common = [name for name in hashes if name in target_hashes]
+            # Sources without common columns would be linked without saving bytes:
+            if (
+                target_length == length
+                and common
+                and all(target_hashes[name] == hashes[name] for name in common)
+            ):
+                break
+        else:
+            merged.append([source, hashes, length])
+            continue
+
+        # Add the new columns to the target and redirect all references:
+        new_columns = {
+            name: values
+            for name, values in source.data.items()
+            if name not in target_hashes
+        }
+        bytes_saved += sum(
+            _estimate_column_bytes(values)
+            for name, values in source.data.items()
+            if name in target_hashes
+        )
+        if new_columns:
+            target.data = dict(target.data, **new_columns)
+            target_hashes.update((name, hashes[name]) for name in new_columns)
+        for model, name in references[source.id]:
+            setattr(model, name, target)
+        n_merged += 1
+
+    return DeduplicationResult(n_sources, n_sources - n_merged, int(bytes_saved))
@@ -0,0 +1,215 @@
+"""Plotting of Parquet and Feather (Arrow IPC) files via pyarrow: only the columns
+needed by the plot are read, row groups are skipped via the <filters> on their
+statistics, and Feather files are memory-mapped. The record batches are streamed
+through the reducers of plot_chunks (line, step, point, scatter, hist, bar and
+barh plots), such that the file never has to fit into memory:
+
+>>> pandas_bokeh.plot_file(
+...     "sensors.parquet", kind="line", x="time", y="temperature",
+...     filters=[("sensor", "==", "A")],
+... )
+
+Other plot kinds read the projected and filtered table at once."""
+
+import os
+
+import pandas as pd
+
+from .arrow import _arrow_to_pandas
+from .cache import _used_columns
+from .chunks import CHUNK_KINDS, plot_chunks
+from .plot import plot
+
+_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "ipc",
+    ".arrow": "ipc",
+    ".ipc": "ipc",
+}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow.dataset as ds
+        import pyarrow.fs
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError(
+            "pandas_bokeh.plot_file requires pyarrow, please install it via "
+            "'pip install pyarrow'."
+        )
+    return ds, pyarrow.fs, pq
+
+
+def _filter_expression(filters, ds, pq):
+    """Returns the dataset expression of <filters>: a pyarrow expression or
+    predicates like for pd.read_parquet (a list of (column, op, value) tuples
+    combined by AND, or a list of such lists combined by OR)."""
+
+    if filters is None or isinstance(filters, ds.Expression):
+        return filters
+    if hasattr(pq, "filters_to_expression"):
+        return pq.filters_to_expression(filters)
+    return pq._filters_to_expression(filters)
+
+
+def _index_columns(schema):
+    "Returns the columns of <schema> that store the index of a pandas DataFrame."
+
+    metadata = schema.pandas_metadata or {}
+    # RangeIndexes are only stored as metadata (dicts):
+    return [col for col in metadata.get("index_columns", []) if isinstance(col, str)]
+
+
+def _range_index(schema):
+    """Returns the metadata (a dict with name, start and step) of the RangeIndex
+    stored by pandas in <schema> or None."""
+
+    metadata = schema.pandas_metadata or {}
+    for index in metadata.get("index_columns", []):
+        if isinstance(index, dict) and index.get("kind") == "range":
+            return index
+    return None
+
+
+def _projected_columns(schema, x, y, kwargs):
+    """Returns the columns of <schema> needed for the plot (the index columns
+    stored by pandas and every column named by the plot arguments, e.g. <x>, <y>,
+    <by>, <category>, <agg> or the hovertool string) or None if all columns are
+    needed (no <y> given)."""
+
+    if y is None:
+        return None
+    for name in [x] + (list(y) if isinstance(y, (list, tuple)) else [y]):
+        if name is not None and name not in schema.names:
+            raise ValueError(f"Could not find '{name}' in the columns of the file.")
+    columns = _index_columns(schema)
+    columns += [
+        col
+        for col in _used_columns(
+            pd.DataFrame(columns=schema.names), dict(kwargs, x=x, y=y, kwargs=kwargs)
+        )
+        if col not in columns
+    ]
+    return columns
+
+
+def _to_frame(batch, index_columns, range_index=None, offset=0):
+    """Returns the record batch <batch> as DataFrame with the index stored by pandas.
+    A RangeIndex (only stored as metadata) is continued from the row <offset> of
+    the batch in the file."""
+
+    df = _arrow_to_pandas(batch)
+    index_columns = [col for col in index_columns if col in df.columns]
+    if index_columns:
+        df = df.set_index(index_columns)
+        # Unnamed indices are stored as "__index_level_<i>__":
+        df.index.names = [
+            None if str(name).startswith("__index_level_") else name
+            for name in df.index.names
+        ]
+    elif range_index is not None:
+        step = range_index.get("step", 1)
+        start = range_index.get("start", 0) + offset * step
+        df.index = pd.RangeIndex(
+            start, start + len(df) * step, step, name=range_index.get("name")
+        )
+    return df
+
+
+def _frames(batches, index_columns, range_index):
+    "Yields the record batches <batches> as DataFrames (see _to_frame)."
+
+    offset = 0
+    for batch in batches:
+        yield _to_frame(batch, index_columns, range_index, offset)
+        offset += batch.num_rows
+
+
+def plot_file(
+    path,
+    kind="line",
+    x=None,
+    y=None,
+    filters=None,
+    file_format=None,
+    batch_size=1_000_000,
+    **kwargs,
+):
+    """Plots the data of a Parquet or Feather (Arrow IPC) file without loading all
+    of its columns and rows (requires pyarrow).
+
+    Parameters:
+    ----------------------------------------------------------------
+    path (str or path) – the file (or a directory of files of a dataset)
+    kind (str) – the plot kind. Line, step, point, scatter, hist, bar and barh
+                 plots stream the record batches through the reducers of
+                 plot_chunks (see there, e.g. for <buckets> and <top_k>), other
+                 kinds read the projected and filtered table at once.
+    x, y – columns like for plot(). Only the columns named by the arguments
+           (<x>, <y>, <by>, <category>, <weights>, <agg>, <hovertool_string>,
+           ...) and the index stored by pandas are read (all columns if <y> is
+           not given).
+    filters (list or pyarrow.dataset.Expression, optional) – predicates on the
+             rows like for pd.read_parquet, e.g. [("sensor", "==", "A")]. Row
+             groups of Parquet files that cannot match (by their statistics) are
+             skipped. Without <x>, the file has to store the index as column
+             (the row numbers of the filtered rows are not known).
+    file_format (str, optional) – "parquet" or "ipc" (default: from the file
+                                  extension .parquet/.pq resp. .feather/.arrow/
+                                  .ipc)
+    batch_size (int) – maximum number of rows per record batch (default:
+                       1_000_000)
+    **kwargs – arguments of the plot method (e.g. title, show_figure)
+
+    Returns:
+    ----------------------------------------------------------------
+    The figure (or its HTML for return_html=True)."""
+
+    ds, fs, pq = _import_pyarrow()
+
+    if file_format is None:
+        extension = os.path.splitext(str(path))[1].lower()
+        if extension not in _FORMATS:
+            raise ValueError(
+                f"Could not determine the format of '{path}', please provide "
+                '<file_format> ("parquet" or "ipc").'
+            )
+        file_format = _FORMATS[extension]
+    if file_format not in ("parquet", "ipc"):
+        raise ValueError('<file_format> has to be "parquet" or "ipc".')
+
+    # Feather files are memory-mapped, such that their batches are not copied:
+    filesystem = fs.LocalFileSystem(use_mmap=file_format == "ipc")
+    dataset = ds.dataset(
+        os.path.abspath(path), format=file_format, filesystem=filesystem
+    )
+    columns = _projected_columns(dataset.schema, x, y, kwargs)
+    index_columns = _index_columns(dataset.schema)
+    range_index = None
+    if not index_columns:
+        # Files without an index column are indexed by their row numbers:
+        range_index = _range_index(dataset.schema) or {}
+        if x is None and kind != "hist" and filters is not None:
+            # The row numbers of the filtered rows are not known:
+            raise ValueError(
+                "Without <x>, <filters> can only be used for files that store the "
+                "index of the DataFrame as column."
+            )
+    scanner = dataset.scanner(
+        columns=columns,
+        filter=_filter_expression(filters, ds, pq),
+        batch_size=batch_size,
+    )
+
+    if kind in CHUNK_KINDS:
+        chunks = _frames(scanner.to_batches(), index_columns, range_index)
+        return plot_chunks(chunks, kind=kind, x=x, y=y, **kwargs)
+    return plot(
+        _to_frame(scanner.to_table(), index_columns, range_index),
+        kind=kind,
+        x=x,
+        y=y,
+        **kwargs,
+    )
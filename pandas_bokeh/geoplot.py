@@ -7,7 +7,8 @@
 from bokeh.models import NumeralTickFormatter, TickFormatter
 from bokeh.tile_providers import get_provider
 
-from .base import embedded_html
+from .base import embedded_html, show
+from .config import get_option
 
 blue_colormap = [RGB(255 - i, 255 - i, 255) for i in range(256)]
 
@@ -158,7 +159,7 @@ def geoplot(  # noqa C901
     colorbar_tick_format=None,
     xrange=None,
     yrange=None,
-    hovertool=True,
+    hovertool=None,
     hovertool_columns=[],
     hovertool_string=None,
     simplify_shapes=None,
@@ -173,11 +174,17 @@ def geoplot(  # noqa C901
     return_figure=True,
     return_html=False,
     legend=True,
-    webgl=True,
+    webgl=None,
     **kwargs,
 ):
     """Doc-String: TODO"""
 
+    # Use global options for keyword arguments that are not given:
+    if webgl is None:
+        webgl = get_option("webgl")
+    if hovertool is None:
+        hovertool = get_option("hover") != "off"
+
     # Imports:
     import bokeh.plotting
     from bokeh.layouts import column, row
@@ -198,7 +205,6 @@ def geoplot(  # noqa C901
     from bokeh.models.callbacks import CustomJS
     from bokeh.models.widgets import Dropdown
     from bokeh.palettes import all_palettes
-    from bokeh.plotting import show
 
     # Make a copy of the input geodataframe:
     gdf = gdf_in.copy()
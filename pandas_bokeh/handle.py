@@ -0,0 +1,203 @@
+"""Incremental updates of displayed plots: plot(..., notebook_handle=True) returns
+a PlotHandle, which sends only the changed rows of the data sources to the
+notebook (as Bokeh stream and patch events) instead of the whole figure:
+
+>>> handle = df.plot_bokeh.line(notebook_handle=True)
+>>> handle.append(df_new_rows)  # streams the new rows
+>>> handle.patch(df_corrected.loc[["2020-01-03"]])  # patches the changed values
+>>> handle.update(df_reloaded)  # computes the minimal stream/patch delta"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+from bokeh.io import push_notebook
+from bokeh.models import GlyphRenderer
+
+from .config import get_option, option_context
+from .spec import _update_fingerprint
+
+# Replace the data of a source if more than this fraction of its values changed:
+_MAX_PATCH_FRACTION = 0.5
+
+
+def _incremental_options():
+    """Options for plots with handles: dictionary-encoded hover columns would have
+    to be re-encoded for new values, so the raw columns are used."""
+
+    return {"hover": "raw"} if get_option("hover") == "dictionary" else {}
+
+
+def _glyph_sources(obj):
+    "Returns the data sources of the glyphs of a figure or layout in order."
+
+    sources = {}
+    for renderer in getattr(obj, "renderers", []):
+        if isinstance(renderer, GlyphRenderer):
+            sources.setdefault(renderer.data_source.id, renderer.data_source)
+    for child in getattr(obj, "children", []):
+        # Children of grids are tuples (child, row, column, ...):
+        child = child[0] if isinstance(child, tuple) else child
+        for source in _glyph_sources(child):
+            sources.setdefault(source.id, source)
+    return list(sources.values())
+
+
+def _equal_values(old, new):
+    "Returns a boolean array of the positions where <old> and <new> are equal."
+
+    old = np.asarray(old)
+    new = np.asarray(new)
+    if old.dtype != new.dtype and (old.dtype.kind == "O" or new.dtype.kind == "O"):
+        return np.zeros(len(new), dtype=bool)
+    equal = old == new
+    if not isinstance(equal, np.ndarray):
+        # Elementwise comparison is not possible (e.g. nested columns):
+        return np.array([np.array_equal(a, b) for a, b in zip(old, new)], dtype=bool)
+    return equal | (pd.isna(old) & pd.isna(new))
+
+
+def _source_delta(old_data, new_data):
+    """Returns the minimal update of a data source from <old_data> to <new_data>:
+    ("stream", new rows), ("patch", patches) for changed rows, ("replace",
+    new_data) or None if the data is unchanged. Appended rows and changed rows
+    are combined as ("stream+patch", (new rows, patches))."""
+
+    if set(old_data) != set(new_data):
+        return "replace", new_data
+    n_old = len(next(iter(old_data.values()), ()))
+    n_new = len(next(iter(new_data.values()), ()))
+    if n_new < n_old:
+        return "replace", new_data
+
+    patches = {}
+    n_patched = 0
+    for name, new_values in new_data.items():
+        changed = np.flatnonzero(
+            ~_equal_values(old_data[name][:n_old], new_values[:n_old])
+        )
+        if len(changed) == 0:
+            continue
+        n_patched += len(changed)
+        # Patch runs of consecutive rows via slices:
+        runs = np.split(changed, np.flatnonzero(np.diff(changed) > 1) + 1)
+        patches[name] = [
+            (slice(int(run[0]), int(run[-1]) + 1), new_values[run[0] : run[-1] + 1])
+            for run in runs
+        ]
+    if n_patched > _MAX_PATCH_FRACTION * n_old * len(new_data):
+        return "replace", new_data
+
+    new_rows = None
+    if n_new > n_old:
+        new_rows = {name: values[n_old:] for name, values in new_data.items()}
+    if new_rows is not None and patches:
+        return "stream+patch", (new_rows, patches)
+    if new_rows is not None:
+        return "stream", new_rows
+    if patches:
+        return "patch", patches
+    return None
+
+
+def _apply_delta(source, delta):
+    kind, value = delta
+    if kind == "replace":
+        source.data = dict(value)
+    if kind in ["patch", "stream+patch"]:
+        source.patch(value[1] if kind == "stream+patch" else value)
+    if kind in ["stream", "stream+patch"]:
+        source.stream(value[0] if kind == "stream+patch" else value)
+
+
+class PlotHandle:
+    """Handle of a plot shown via plot(..., notebook_handle=True). Its methods
+    update the data of the plot and push only the changes (new rows via stream,
+    changed values via patch) to the notebook cell of the plot.
+
+    Attributes:
+    ----------------------------------------------------------------
+    figure – the Bokeh figure (or layout) of the plot
+    df – the data currently shown
+    comms_handle – the CommsHandle of Bokeh (None if the plot is not shown in a
+                   Jupyter notebook, then only the figure is updated)"""
+
+    def __init__(self, figure, df, arguments, spec, comms_handle=None):
+        self.figure = figure
+        self.df = df
+        self.comms_handle = comms_handle
+        self._arguments = arguments
+        self._layout_fingerprint = self._fingerprint(spec)
+
+    @staticmethod
+    def _fingerprint(spec):
+        "Fingerprint of the data of <spec> that is encoded in the figure itself."
+
+        hash_object = hashlib.sha1()
+        _update_fingerprint(
+            hash_object,
+            (
+                spec.data["ticks"],
+                spec.data["quantized"],
+                spec.data["hover_labels"],
+                spec.options["x_labels_dict"],
+            ),
+        )
+        return hash_object.hexdigest()
+
+    def update(self, df):
+        """Shows the data <df> (with the plot arguments of the original call) and
+        pushes the minimal stream/patch delta of the data sources. Returns the
+        handle."""
+
+        from .plot import prepare_plot, render_plot
+
+        arguments = dict(self._arguments)
+        kwargs = arguments.pop("kwargs")
+        with option_context(**_incremental_options()):
+            spec = prepare_plot(df, **arguments, **kwargs)
+            if self._fingerprint(spec) != self._layout_fingerprint:
+                raise ValueError(
+                    "The new data changes the axis labels or the encoding of the plot "
+                    "(e.g. new categories or quantization ranges) and cannot be "
+                    "updated incrementally. Please create a new plot."
+                )
+            new_sources = _glyph_sources(render_plot(spec))
+        sources = _glyph_sources(self.figure)
+        if len(new_sources) != len(sources):
+            raise ValueError(
+                "The new data changes the number of glyphs of the plot and cannot be "
+                "updated incrementally. Please create a new plot."
+            )
+
+        for source, new_source in zip(sources, new_sources):
+            delta = _source_delta(source.data, new_source.data)
+            if delta is not None:
+                _apply_delta(source, delta)
+        self.df = df
+        self._push()
+        return self
+
+    def append(self, df_tail):
+        "Appends the rows <df_tail> to the data and streams them. Returns the handle."
+
+        if isinstance(self.df, pd.Series) and isinstance(df_tail, pd.Series):
+            return self.update(pd.concat([self.df, df_tail]))
+        return self.update(pd.concat([pd.DataFrame(self.df), pd.DataFrame(df_tail)]))
+
+    def patch(self, rows):
+        """Replaces the rows of the data with the same index labels as <rows> (a
+        DataFrame with a subset of the columns) and patches the changed values.
+        Returns the handle."""
+
+        df = self.df.copy()
+        rows = pd.DataFrame(rows)
+        if isinstance(df, pd.Series):
+            df.loc[rows.index] = rows.iloc[:, 0]
+        else:
+            df.loc[rows.index, rows.columns] = rows
+        return self.update(df)
+
+    def _push(self):
+        if self.comms_handle is not None:
+            push_notebook(document=self.comms_handle.doc, handle=self.comms_handle)
@@ -1,15 +1,20 @@
 import datetime
+import json
 import numbers
+import re
 import warnings
 from copy import deepcopy
 from typing import Iterable, List, Optional, Union
 
 import numpy as np
 import pandas as pd
+from bokeh.io.notebook import CommsHandle
 from bokeh.layouts import column
 from bokeh.models import (
     ColorBar,
     ColumnDataSource,
+    CustomJSHover,
+    CustomJSTransform,
     DatetimeTickFormatter,
     FuncTickFormatter,
     HoverTool,
@@ -23,9 +28,27 @@
 from pandas.core.base import PandasObject
 from pandas.errors import ParserError
 
+from .arrow import _arrow_to_pandas, _is_arrow, _is_arrow_frame
 from .base import embedded_html, set_fontsizes_of_figure, show
+from .cache import _cache_key, _count, _figure_from_json, _figure_to_json, _get_cache
+from .config import get_option, option_context
 from .geoplot import geoplot
-from .utils import _extract_additional_columns
+from .handle import PlotHandle, _incremental_options
+from .progressive import PROGRESSIVE_KINDS, _make_progressive
+from .spec import PlotSpec
+from .stats import _binned_kde, _ecdf, _kde_bandwidth, _kde_grid
+from .utils import (
+    PRECISIONS,
+    _categorical_codes,
+    _datetime_to_epoch_ms,
+    _dictionary_encode,
+    _estimate_column_bytes,
+    _extract_additional_columns,
+    _lttb_indices,
+    _minmax_indices,
+    _reduce_precision,
+    _to_numpy,
+)
 
 
 def check_type(data):
@@ -129,6 +152,11 @@ def plot(  # noqa C901
     stacked=False,
     weights=None,
     bins=None,
+    bw_method=None,
+    ind=None,
+    max_points=None,
+    freq=None,
+    agg="mean",
     normed=False,
     cumulative=False,
     show_average=False,
@@ -142,12 +170,16 @@ def plot(  # noqa C901
     zooming=True,
     sizing_mode="fixed",
     toolbar_location="right",
-    hovertool=True,
+    hovertool=None,
     hovertool_string=None,
     rangetool=False,
     vertical_xlabel=False,
     x_axis_location="below",
-    webgl=True,
+    webgl=None,
+    precision=None,
+    max_payload_bytes=None,
+    progressive=False,
+    notebook_handle=False,
     reuse_plot=None,  # This keyword is not used by Pandas-Bokeh, but pandas plotting API adds it for series object calls
     **kwargs,
 ):
@@ -159,6 +191,8 @@ def plot(  # noqa C901
     * scatter
     * bar / barh
     * hist
+    * kde / density
+    * ecdf
     * area
     * pie
     * map
@@ -179,37 +213,320 @@ def plot(  # noqa C901
     If `sizing_mode` is not fixed (default), it will overide the set plot width or height
     depending on which axis it is scaled on.
 
+    For line, step, point, bar, barh and area plots with a datetime x-axis, the data
+    can be aggregated to regular time intervals before plotting by passing a pandas
+    offset alias as `freq` (e.g. ``freq="1min"``) and an aggregation via `agg`
+    (a function name like "mean" or "sum", a callable or a mapping from column
+    names to aggregations). The hovertool then additionally shows the span of the
+    original timestamps of each interval.
+
+    The size of the plot data sent to the browser can be reduced via `precision`
+    (default: pandas_bokeh.options.precision = "float64"):
+
+    * "float32": y-values are downcast to float32 (relative error <= 6e-8) and
+      datetimes are sent as float64 milliseconds since epoch.
+    * "int32" / "int16": y-values of line, step, point and scatter plots are
+      quantized to integers between their minimum and maximum and decoded in the
+      browser. The absolute error of the plotted and hovered values is at most
+      (max - min) / 8.6e9 resp. (max - min) / 131068. Other plot kinds use float32.
+
+    If the estimated size of the plot data exceeds `max_payload_bytes` (default:
+    pandas_bokeh.options.max_payload_bytes, None for no limit), it is reduced before
+    any glyphs are created, in this order until the size fits:
+
+    1. Lossless: line, step and point glyphs share a single data source without
+       duplicated x-values.
+    2. Reduced precision (if `precision` is not given): "float32", then "int16".
+    3. Downsampling: line, step and area plots keep the visual shape of each line
+       (pandas_bokeh.options.downsampling), point and scatter plots a uniform
+       random sample of the points. Bar plots are not downsampled.
+
+    A single warning reports the applied reductions.
+
+    With `progressive=True` (line, step, point and scatter plots), the figure only
+    embeds a coarse subset of pandas_bokeh.options.progressive_points rows (or
+    `progressive` rows if an integer is given): the shape-preserving selection of
+    the lines (pandas_bokeh.options.downsampling) or a random sample of the
+    points. If the figure is written with sidecar data (output_file(...,
+    data="sidecar")), the full data is written in chunks of
+    pandas_bokeh.options.progressive_chunk_rows rows, which are loaded by the page
+    afterwards and spliced into the data sources without resetting the zoom.
+    Progressive plots are not cached and are not reduced to the payload budget.
+
+    With `notebook_handle=True`, a PlotHandle is returned instead of the figure.
+    Its methods update(df), append(df_tail) and patch(rows) change the data of the
+    plot and push only the minimal delta (new rows via stream, changed values via
+    patch) to the notebook cell of the plot, e.g. for live dashboards. Changes of
+    the axis labels or the encoding of the data (e.g. new categories) raise a
+    ValueError. Plots with handles are not cached.
+
+    Instead of a DataFrame, a pyarrow Table or RecordBatch can be plotted: its
+    numeric and timestamp columns are used without copying, string and
+    dictionary-encoded columns as Categoricals (codes and labels).
+
+    Keyword arguments that are not given (None) default to the global options
+    (see pandas_bokeh.describe_option()), e.g. `webgl`, `hovertool` (via the
+    "hover" option), `max_points`, `precision` and `max_payload_bytes`.
+
+    The data preparation and the creation of the Bokeh models are separate steps:
+    pandas_bokeh.prepare_plot (same parameters) returns a picklable PlotSpec,
+    which pandas_bokeh.render_plot turns into the figure.
+
+    """
+
+    # Call arguments (part of the cache key):
+    arguments = dict(locals())
+    for name in [
+        "df_in",
+        "show_figure",
+        "return_html",
+        "reuse_plot",
+        "notebook_handle",
+    ]:
+        del arguments[name]
+
+    # Arrow tables are converted without copying their columns (plots with handles
+    # need writable columns for patches):
+    if _is_arrow(df_in):
+        df_in = _arrow_to_pandas(df_in)
+        if notebook_handle:
+            df_in = df_in.copy()
+
+    if notebook_handle and (kind == "map" or return_html or progressive):
+        raise ValueError(
+            "<notebook_handle> is not supported for map plots, progressive plots and "
+            "with <return_html>."
+        )
+
+    # Use the result of an identical call from the cache (if enabled):
+    cache = _get_cache()
+    cache_key = None
+    if cache is not None and not progressive and not notebook_handle:
+        cache_key = _cache_key(df_in, arguments)
+    p = None
+    if cache_key is not None:
+        if return_html and not show_figure:
+            html = cache.get(cache_key + ".html")
+            if html is not None:
+                _count(hit=True)
+                return html
+        figure_json = cache.get(cache_key + ".json")
+        _count(hit=figure_json is not None)
+        if figure_json is not None:
+            p = _figure_from_json(figure_json)
+
+    if p is None:
+        if kind == "map":
+            if freq is not None:
+                # Raises an error, since map plots cannot be aggregated:
+                _resample_dataframe(df_in, x, y, kind, freq, agg, use_index)
+            df = pd.DataFrame(df_in) if isinstance(df_in, pd.Series) else df_in.copy()
+            p = mapplot(
+                df,
+                x=x,
+                y=y,
+                figsize=figsize,
+                title=title,
+                legend=legend,
+                xlabel=xlabel,
+                ylabel=ylabel,
+                xlim=xlim,
+                color=color,
+                colormap=colormap,
+                category=category,
+                show_figure=False,
+                return_html=False,
+                panning=panning,
+                zooming=zooming,
+                toolbar_location=toolbar_location,
+                hovertool=hovertool,
+                hovertool_string=hovertool_string,
+                webgl=webgl,
+                **kwargs,
+            )
+        else:
+            with option_context(**(_incremental_options() if notebook_handle else {})):
+                spec = prepare_plot(
+                    df_in,
+                    x=x,
+                    y=y,
+                    kind=kind,
+                    figsize=figsize,
+                    use_index=use_index,
+                    title=title,
+                    legend=legend,
+                    logx=logx,
+                    logy=logy,
+                    xlabel=xlabel,
+                    ylabel=ylabel,
+                    xticks=xticks,
+                    yticks=yticks,
+                    xlim=xlim,
+                    ylim=ylim,
+                    fontsize_title=fontsize_title,
+                    fontsize_label=fontsize_label,
+                    fontsize_ticks=fontsize_ticks,
+                    fontsize_legend=fontsize_legend,
+                    color=color,
+                    colormap=colormap,
+                    category=category,
+                    histogram_type=histogram_type,
+                    stacked=stacked,
+                    weights=weights,
+                    bins=bins,
+                    bw_method=bw_method,
+                    ind=ind,
+                    max_points=max_points,
+                    freq=freq,
+                    agg=agg,
+                    normed=normed,
+                    cumulative=cumulative,
+                    show_average=show_average,
+                    plot_data_points=plot_data_points,
+                    plot_data_points_size=plot_data_points_size,
+                    number_format=number_format,
+                    disable_scientific_axes=disable_scientific_axes,
+                    panning=panning,
+                    zooming=zooming,
+                    sizing_mode=sizing_mode,
+                    toolbar_location=toolbar_location,
+                    hovertool=hovertool,
+                    hovertool_string=hovertool_string,
+                    rangetool=rangetool,
+                    vertical_xlabel=vertical_xlabel,
+                    x_axis_location=x_axis_location,
+                    webgl=webgl,
+                    precision=precision,
+                    max_payload_bytes=max_payload_bytes,
+                    progressive=progressive,
+                    **kwargs,
+                )
+                p = render_plot(spec)
+        if cache_key is not None:
+            cache.set(cache_key + ".json", _figure_to_json(p))
+
+    # Display plot if wanted
+    shown = show(p, notebook_handle=notebook_handle) if show_figure else None
+    if notebook_handle:
+        comms_handle = shown if isinstance(shown, CommsHandle) else None
+        return PlotHandle(p, df_in, arguments, spec, comms_handle)
+
+    # Return as (embeddable) HTML if wanted:
+    if return_html:
+        html = embedded_html(p)
+        if cache_key is not None:
+            cache.set(cache_key + ".html", html)
+        return html
+
+    # Return plot:
+    return p
+
+
+def prepare_plot(  # noqa C901
+    df_in,
+    x=None,
+    y=None,
+    kind="line",
+    figsize=None,
+    use_index=True,
+    title="",
+    legend="top_right",
+    logx=False,
+    logy=False,
+    xlabel=None,
+    ylabel=None,
+    xticks=None,
+    yticks=None,
+    xlim=None,
+    ylim=None,
+    fontsize_title=None,
+    fontsize_label=None,
+    fontsize_ticks=None,
+    fontsize_legend=None,
+    color=None,
+    colormap=None,
+    category=None,
+    histogram_type=None,
+    stacked=False,
+    weights=None,
+    bins=None,
+    bw_method=None,
+    ind=None,
+    max_points=None,
+    freq=None,
+    agg="mean",
+    normed=False,
+    cumulative=False,
+    show_average=False,
+    plot_data_points=False,
+    plot_data_points_size=5,
+    number_format=None,
+    disable_scientific_axes=None,
+    panning=True,
+    zooming=True,
+    sizing_mode="fixed",
+    toolbar_location="right",
+    hovertool=None,
+    hovertool_string=None,
+    rangetool=False,
+    vertical_xlabel=False,
+    x_axis_location="below",
+    webgl=None,
+    precision=None,
+    max_payload_bytes=None,
+    progressive=False,
+    **kwargs,
+):
+    """Prepares the data of a plot without creating any Bokeh models and returns it
+    as picklable PlotSpec (see pandas_bokeh.plot for the parameters, "map" plots
+    are not supported). The figure is created via render_plot:
+
+    >>> spec = prepare_plot(df, kind="line", title="Sales")
+    >>> p = render_plot(spec)
     """
 
-    # Make a local copy of the DataFrame:
-    df = df_in.copy()
+    if kind == "map":
+        raise ValueError("Map plots cannot be prepared as PlotSpec.")
+
+    if _is_arrow(df_in):
+        df_in = _arrow_to_pandas(df_in)
+
+    # Make a local copy of the DataFrame (the pre-aggregated DataFrame for <freq> is
+    # already a new object that does not share data with the input, DataFrames of
+    # Arrow tables share only their immutable buffers):
+    if freq is not None:
+        df, x_span = _resample_dataframe(df_in, x, y, kind, freq, agg, use_index)
+        x = None
+        use_index = True
+    else:
+        df = df_in if _is_arrow_frame(df_in) else df_in.copy()
+        x_span = None
     if isinstance(df, pd.Series):
         df = pd.DataFrame(df)
 
-    if kind == "map":
-        return mapplot(
-            df,
-            x=x,
-            y=y,
-            figsize=figsize,
-            title=title,
-            legend=legend,
-            xlabel=xlabel,
-            ylabel=ylabel,
-            xlim=xlim,
-            color=color,
-            colormap=colormap,
-            category=category,
-            show_figure=show_figure,
-            return_html=return_html,
-            panning=panning,
-            zooming=zooming,
-            toolbar_location=toolbar_location,
-            hovertool=hovertool,
-            hovertool_string=hovertool_string,
-            webgl=webgl,
-            **kwargs,
-        )
+    # Use global options for keyword arguments that are not given:
+    if webgl is None:
+        webgl = get_option("webgl")
+    if hovertool is None:
+        hovertool = get_option("hover") != "off"
+    if max_points is None:
+        max_points = get_option("max_points")
+
+    # "density" is an alias for "kde" (like in pandas):
+    if kind == "density":
+        kind = "kde"
+
+    # Check precision of plot data (it may only be reduced further by the payload
+    # budget if it is not given explicitly):
+    adapt_precision = precision is None
+    if precision is None:
+        precision = get_option("precision")
+    if precision not in PRECISIONS:
+        raise ValueError(f"<precision> can only be one of {PRECISIONS}.")
+    quantize_kinds = ["line", "step", "point", "scatter"]
+    if kind not in quantize_kinds and precision in ["int32", "int16"]:
+        precision = "float32"
+    quantized = {}
 
     # Check plot kind input:
     allowed_kinds = [
@@ -220,6 +537,8 @@ def plot(  # noqa C901
         "bar",
         "barh",
         "hist",
+        "kde",
+        "ecdf",
         "area",
         "pie",
         "map",
@@ -240,6 +559,18 @@ def plot(  # noqa C901
     if rangetool:
         x_axis_location = "above"
 
+    # Progressive plots embed only a coarse subset of the rows (see render_plot):
+    if progressive:
+        if kind not in PROGRESSIVE_KINDS:
+            allowed_progressive_kinds = "', '".join(PROGRESSIVE_KINDS)
+            raise ValueError(
+                f"For progressive plots, the allowed plot kinds are '{allowed_progressive_kinds}'."
+            )
+        if progressive is True:
+            progressive = get_option("progressive_points")
+        elif not isinstance(progressive, int) or progressive < 2:
+            raise ValueError("<progressive> has to be a boolean or an integer >= 2.")
+
     # Get and check options for base figure:
     figure_options = {
         "title": title,
@@ -247,12 +578,10 @@ def plot(  # noqa C901
         "active_scroll": "wheel_zoom",
         "width": 600,
         "height": 400,
-        "output_backend": "webgl",
+        "output_backend": "webgl" if webgl else "canvas",
         "sizing_mode": sizing_mode,
         "x_axis_location": x_axis_location,
     }
-    # Initializing rangetool plot variable:
-    p_rangetool = None
 
     if figsize is not None:
         width, height = figsize
@@ -280,8 +609,6 @@ def plot(  # noqa C901
             raise ValueError("<ylim> must be a list/tuple of form (y_min, y_max).")
         else:
             figure_options["y_range"] = ylim
-    if webgl:
-        figure_options["output_backend"] = "webgl"
     if number_format is None:
         number_format = ""
     else:
@@ -289,24 +616,39 @@ def plot(  # noqa C901
 
     # Check hovertool_string and define additional columns to keep in source:
     additional_columns = _extract_additional_columns(df, hovertool_string)
+    # Columns only shown in the hovertool (not used by glyphs) can be encoded:
+    hover_only_columns = [
+        col for col in additional_columns if col not in kwargs.values()
+    ]
+    if get_option("hover") == "raw":
+        hover_only_columns = []
+    hover_labels = {}
 
     # Set standard linewidth:
     if "line_width" not in kwargs:
         kwargs["line_width"] = 2
 
+    # Distribution plots do not use x-values of the DataFrame (x-axis shows the values):
+    if kind in ["kde", "ecdf"]:
+        x = None
+        use_index = False
+
     # Get x-axis Name and Values:
     delete_in_y = None
+    x_categorical = None
     if x is not None:
         if issubclass(x.__class__, pd.Index) or issubclass(x.__class__, pd.Series):
             if x.name is not None:
                 name = str(x.name)
             else:
                 name = ""
-            x = x.values
+            x_categorical = _get_categorical(x)
+            x = _to_numpy(x)
         elif x in df.columns:
             delete_in_y = x
             name = str(x)
-            x = df[x].values
+            x_categorical = _get_categorical(df[x])
+            x = _to_numpy(df[x])
         elif isinstance(x, (tuple, list, type(np.array))):
             if len(x) == len(df):
                 x = x
@@ -321,7 +663,8 @@ def plot(  # noqa C901
             )
     else:
         if use_index:
-            x = df.index.values
+            x_categorical = _get_categorical(df.index)
+            x = _to_numpy(df.index)
             if df.index.name is not None:
                 name = str(df.index.name)
             else:
@@ -369,6 +712,11 @@ def plot(  # noqa C901
     if xaxis_type == "categorical":
         if check_type(x) == "datetime":
             x = _times_to_string(x)
+        elif x_categorical is not None:
+            # Convert only the categories (instead of each value) to strings:
+            codes, categories = _categorical_codes(x_categorical)
+            labels = np.array([str(c) for c in categories] + ["nan"], dtype=object)
+            x = list(labels[codes])
         else:
             x = [str(el) for el in x]
         if kind != "hist":
@@ -394,6 +742,69 @@ def plot(  # noqa C901
             f"The only numeric column is the column {delete_in_y} that is already used on the x-axis."
         )
 
+    # Fit the estimated size of the plot data into the payload budget:
+    if max_payload_bytes is None:
+        max_payload_bytes = get_option("max_payload_bytes")
+    share_source = False
+    drop_x_original = False
+    if progressive:
+        # The glyphs share a single source, which is refined as a whole:
+        share_source = kind in ["line", "step", "point"]
+    elif max_payload_bytes is not None and kind in _PAYLOAD_BUDGET_KINDS:
+        n_sources = N_cols
+        if kind in ["line", "step"]:
+            n_sources *= 1 + bool(plot_data_points) + bool(rangetool)
+        elif kind in ["scatter", "bar", "barh"]:
+            n_sources = 1
+        elif kind == "area":
+            n_sources += 1
+        extra_cols = [value for value in kwargs.values() if value in df.columns]
+        extra_cols += [col for col in additional_columns if col not in extra_cols]
+        (
+            rows,
+            precision,
+            share_source,
+            drop_x_original,
+        ) = _fit_payload_budget(
+            kind,
+            df,
+            x,
+            x_old,
+            data_cols,
+            extra_cols,
+            x_span,
+            n_sources,
+            precision,
+            adapt_precision,
+            max_payload_bytes,
+        )
+        if rows is not None:
+            df = df.iloc[rows]
+            x = _take_rows(x, rows)
+            x_old = _take_rows(x_old, rows)
+            if x_span is not None:
+                x_span = {key: values[rows] for key, values in x_span.items()}
+
+    # For kde plots, replace data columns by their estimated densities:
+    if kind == "kde":
+        if N_cols == 1 and "x_axis_label" not in figure_options:
+            figure_options["x_axis_label"] = data_cols[0]
+        if "y_axis_label" not in figure_options:
+            figure_options["y_axis_label"] = "Density"
+        source, data_cols = _kde_source(
+            df, data_cols, kwargs.pop("by", None), weights, bw_method, ind
+        )
+        N_cols = len(data_cols)
+
+    # For ecdf plots, calculate the (reduced) step vertices of each data column:
+    if kind == "ecdf":
+        if N_cols == 1 and "x_axis_label" not in figure_options:
+            figure_options["x_axis_label"] = data_cols[0]
+        if "y_axis_label" not in figure_options:
+            figure_options["y_axis_label"] = "Cumulative probability"
+        ecdf_sources, data_cols = _ecdf_sources(df, data_cols, weights, max_points)
+        N_cols = len(data_cols)
+
     # Autodetect y-label if no y-label is provided by user and only one y-column exists:
     if N_cols == 1:
         if kind == "barh":
@@ -417,38 +828,278 @@ def plot(  # noqa C901
             else "x"
         )
 
+    # Define data source for the plot (scatter, hist, kde & ecdf define own sources):
+    data = {}
+    if kind not in ["hist", "kde", "ecdf", "scatter"]:
+        source = {col: _to_numpy(df[col]) for col in data_cols}
+        source["__x__values"] = x
+        source["__x__values_original"] = x_old
+        if x_span is not None:
+            source.update(x_span)
+        for kwarg, value in kwargs.items():
+            if value in df.columns:
+                source[value] = _to_numpy(df[value])
+        for add_col in additional_columns:
+            source[add_col] = _hover_values(df[add_col])
+        if drop_x_original:
+            del source["__x__values_original"]
+        hover_labels = _encode_hover_columns(source, hover_only_columns)
+        quantized = _encode_source_precision(source, data_cols, precision)
+        if kind == "pie":
+            source["__x__values"] = x_old
+        data["source"] = source
+    elif kind == "kde":
+        data["source"] = source
+    elif kind == "ecdf":
+        # Each column has its own step vertices and is drawn via the stepplot:
+        if "mode" not in kwargs:
+            kwargs["mode"] = "after"
+        data["ecdf_sources"] = ecdf_sources
+
+    if kind == "scatter":
+        if N_cols > 2:
+            raise Exception(
+                "For scatterplots <x> and <y> values can only be a single column of the DataFrame, not a list of columns. Please specify both <x> and <y> columns for a scatterplot uniquely."
+            )
+
+        # Get and set y-labelname:
+        y_column = data_cols[0]
+        if "y_axis_label" not in figure_options:
+            figure_options["y_axis_label"] = y_column
+
+        # Get values for y-axis:
+        y, quantization = _reduce_precision(_to_numpy(df[y_column]), precision)
+        quantized = {"y": quantization} if quantization is not None else {}
+        if precision != "float64" and np.issubdtype(np.asarray(x).dtype, np.datetime64):
+            x = x_old = _datetime_to_epoch_ms(x)
+
+        # Delete additionally created values by pandas.plotting:
+        for add_param in ["s", "c"]:
+            if add_param in kwargs:
+                del kwargs[add_param]
+
+        # Get values for categorical colormap:
+        category_values = None
+        if category in df.columns:
+            # Categoricals are passed as such to use their codes directly:
+            category_values = _get_categorical(df[category])
+            if category_values is None:
+                category_values = _to_numpy(df[category])
+        elif category is not None:
+            raise Exception(
+                "<category> parameter has to be either None or the name of a single column of the DataFrame"
+            )
+
+        # Columns of the DataFrame used by the glyphs or the hovertool:
+        columns = {
+            value: _to_numpy(df[value])
+            for value in kwargs.values()
+            if value in df.columns
+        }
+        for add_col in additional_columns:
+            columns[add_col] = _hover_values(df[add_col])
+
+        data.update(
+            x=x,
+            x_old=x_old,
+            y=y,
+            category_values=category_values,
+            columns=columns,
+        )
+
+    if kind == "hist":
+        # Disable line_color (for borders of histogram bins) per default:
+        if "line_color" not in kwargs:
+            kwargs["line_color"] = None
+        elif kwargs["line_color"] is True:
+            del kwargs["line_color"]
+
+        if "by" in kwargs and y is None:
+            del kwargs["by"]
+
+        # Check for stacked keyword:
+        if stacked and histogram_type not in [None, "stacked"]:
+            warnings.warn(
+                f"<histogram_type> was set to '{histogram_type}', but was overriden by <stacked>=True parameter."
+            )
+            histogram_type = "stacked"
+        elif stacked and histogram_type is None:
+            histogram_type = "stacked"
+
+        # Set xlabel if only one y-column is given and user does not override this via
+        # xlabel parameter:
+        if len(data_cols) == 1 and xlabel is None:
+            figure_options["x_axis_label"] = data_cols[0]
+
+        # If Histogram should be plotted, calculate bins, aggregates and
+        # averages:
+
+        # Autocalculate bins if bins are not specified:
+        if bins is None:
+            values = _data_values(df, data_cols)
+            values = values[~np.isnan(values)]
+            _, bins = np.histogram(values)
+
+        # Calculate bins if number of bins is given:
+        elif isinstance(bins, int):
+            if bins < 1:
+                raise ValueError(
+                    "<bins> can only be an integer>0, a list or a range of numbers."
+                )
+            values = _data_values(df, data_cols)
+            values = values[~np.isnan(values)]
+            v_min, v_max = values.min(), values.max()
+            bins = np.linspace(v_min, v_max, bins + 1)
+
+        if not isinstance(bins, str):
+            bins = list(bins)
+
+        if weights is not None:
+            if weights not in df.columns:
+                raise ValueError(
+                    "Columns '%s' for <weights> is not in provided DataFrame."
+                )
+            else:
+                weights = np.asarray(_to_numpy(df[weights]), dtype=float)
+
+        aggregates = []
+        averages = []
+        for col in data_cols:
+            values = np.asarray(_to_numpy(df[col]), dtype=float)
+            if weights is not None:
+                not_nan = ~(np.isnan(values) | np.isnan(weights))
+                values_not_nan = values[not_nan]
+                weights_not_nan = weights[not_nan]
+                if sum(not_nan) < len(not_nan):
+                    warnings.warn(
+                        f"There are NaN values in column '{col}' or in the <weights> column. For the histogram, these rows have been neglected.",
+                        Warning,
+                    )
+            else:
+                not_nan = ~np.isnan(values)
+                values_not_nan = values[not_nan]
+                weights_not_nan = None
+                if sum(not_nan) < len(not_nan):
+                    warnings.warn(
+                        f"There are NaN values in column '{col}'. For the histogram, these rows have been neglected.",
+                        Warning,
+                    )
+
+            average = np.average(values_not_nan, weights=weights_not_nan)
+            averages.append(average)
+
+            aggregate, bins = np.histogram(
+                values_not_nan, bins=bins, weights=weights_not_nan
+            )
+            if normed:
+                aggregate = aggregate / np.sum(aggregate) * normed
+            if cumulative:
+                aggregate = np.cumsum(aggregate)
+            aggregates.append(aggregate)
+
+        data.update(aggregates=aggregates, bins=bins, averages=averages)
+
+    # Ticks of categorical x-values:
+    data["ticks"] = x if x_labels_dict is not None else None
+    data["quantized"] = quantized
+    data["hover_labels"] = hover_labels
+
+    options = {
+        "figure_options": figure_options,
+        "x_labels_dict": x_labels_dict,
+        "data_cols": data_cols,
+        "xlabelname": xlabelname,
+        "aggregated": x_span is not None,
+        "share_source": share_source,
+        "drop_x_original": drop_x_original,
+        "additional_columns": additional_columns,
+        "colormap": colormap,
+        "color": color,
+        "category": category,
+        "hovertool": hovertool,
+        "hovertool_string": hovertool_string,
+        "plot_data_points": plot_data_points,
+        "plot_data_points_size": plot_data_points_size,
+        "number_format": number_format,
+        "rangetool": rangetool,
+        "stacked": stacked,
+        "normed": normed,
+        "cumulative": cumulative,
+        "show_average": show_average,
+        "histogram_type": histogram_type,
+        "logy": logy,
+        "xticks": None if xticks is None else list(xticks),
+        "yticks": None if yticks is None else list(yticks),
+        "vertical_xlabel": vertical_xlabel,
+        "panning": panning,
+        "zooming": zooming,
+        "legend": legend,
+        "fontsize_title": fontsize_title,
+        "fontsize_label": fontsize_label,
+        "fontsize_ticks": fontsize_ticks,
+        "fontsize_legend": fontsize_legend,
+        "disable_scientific_axes": disable_scientific_axes,
+        "progressive": progressive or None,
+        "kwargs": kwargs,
+    }
+
+    return PlotSpec(kind, data, options)
+
+
+def render_plot(spec):  # noqa C901
+    """Creates the Bokeh figure (or layout for the rangetool) of a PlotSpec returned
+    by prepare_plot. The PlotSpec is not modified, such that it can be rendered
+    multiple times."""
+
+    kind = spec.kind
+    data = spec.data
+    options = spec.options
+    figure_options = dict(options["figure_options"])
+    x_labels_dict = options["x_labels_dict"]
+    data_cols = options["data_cols"]
+    N_cols = len(data_cols)
+    xlabelname = options["xlabelname"]
+    colormap = options["colormap"]
+    hovertool = options["hovertool"]
+    hovertool_string = options["hovertool_string"]
+    stacked = options["stacked"]
+    legend = options["legend"]
+    kwargs = dict(options["kwargs"])
+
+    # Initializing rangetool plot variable:
+    p_rangetool = None
+
     # Create Figure for plotting:
     p = figure(**figure_options)
     if "x_axis_type" not in figure_options:
         figure_options["x_axis_type"] = None
 
-    # For categorical plots, set the xticks:
+    # For categorical plots, set the xticks (resp. yticks for barh):
     if x_labels_dict is not None:
-        p.xaxis.formatter = FuncTickFormatter(
+        tick_formatter = FuncTickFormatter(
             code="""
                                 var labels = %s;
                                 return labels[tick];
                                 """
             % x_labels_dict
         )
+        if kind == "barh":
+            p.yaxis.formatter = tick_formatter
+        else:
+            p.xaxis.formatter = tick_formatter
 
-    # Define ColumnDataSource for Plot if kind != "hist":
-    if kind != "hist":
-        source = {col: df[col].values for col in data_cols}
-        source["__x__values"] = x
-        source["__x__values_original"] = x_old
-        for kwarg, value in kwargs.items():
-            if value in df.columns:
-                source[value] = df[value].values
-        for add_col in additional_columns:
-            source[add_col] = df[add_col].values
+    # Define ColumnDataSource for Plot (scatter, hist, kde & ecdf define own sources):
+    if "source" in data:
+        source = dict(data["source"])
+        if options["share_source"] or kind in ["kde", "bar", "barh"]:
+            source = ColumnDataSource(source)
 
     # Define colormap
     if kind not in ["scatter", "pie"]:
         colormap = get_colormap(colormap, N_cols)
 
-    if color is not None:
-        colormap = get_colormap([color], N_cols)
+    if options["color"] is not None:
+        colormap = get_colormap([options["color"]], N_cols)
 
     # Add Glyphs to Plot:
     if kind == "line":
@@ -460,14 +1111,49 @@ def plot(  # noqa C901
             hovertool,
             xlabelname,
             figure_options["x_axis_type"],
-            plot_data_points,
-            plot_data_points_size,
+            options["plot_data_points"],
+            options["plot_data_points_size"],
+            hovertool_string,
+            options["number_format"],
+            options["rangetool"],
+            **kwargs,
+        )
+
+    if kind == "kde":
+        p, p_rangetool = lineplot(
+            p,
+            source,
+            data_cols,
+            colormap,
+            hovertool,
+            xlabelname,
+            figure_options["x_axis_type"],
+            False,
+            options["plot_data_points_size"],
             hovertool_string,
-            number_format,
-            rangetool,
+            options["number_format"],
+            False,
             **kwargs,
         )
 
+    if kind == "ecdf":
+        for name, color, ecdf_source in zip(data_cols, colormap, data["ecdf_sources"]):
+            p, p_rangetool = stepplot(
+                p,
+                dict(ecdf_source),
+                [name],
+                [color],
+                hovertool,
+                xlabelname,
+                figure_options["x_axis_type"],
+                options["plot_data_points"],
+                options["plot_data_points_size"],
+                hovertool_string,
+                options["number_format"],
+                False,
+                **kwargs,
+            )
+
     if kind == "step":
         p, p_rangetool = stepplot(
             p,
@@ -477,11 +1163,11 @@ def plot(  # noqa C901
             hovertool,
             xlabelname,
             figure_options["x_axis_type"],
-            plot_data_points,
-            plot_data_points_size,
+            options["plot_data_points"],
+            options["plot_data_points_size"],
             hovertool_string,
-            number_format,
-            rangetool,
+            options["number_format"],
+            options["rangetool"],
             **kwargs,
         )
 
@@ -495,93 +1181,30 @@ def plot(  # noqa C901
             hovertool_string,
             xlabelname,
             figure_options["x_axis_type"],
-            number_format,
+            options["number_format"],
             **kwargs,
         )
 
     if kind == "scatter":
-        if N_cols > 2:
-            raise Exception(
-                "For scatterplots <x> and <y> values can only be a single column of the DataFrame, not a list of columns. Please specify both <x> and <y> columns for a scatterplot uniquely."
-            )
-
-        # Get and set y-labelname:
-        y_column = data_cols[0]
-        if "y_axis_label" not in figure_options:
-            p.yaxis.axis_label = y_column
-
-        # Get values for y-axis:
-        y = df[y_column].values
-
-        # Delete additionally created values by pandas.plotting:
-        for add_param in ["s", "c"]:
-            if add_param in kwargs:
-                del kwargs[add_param]
-
-        # Get values for categorical colormap:
-        category_values = None
-        if category in df.columns:
-            category_values = df[category].values
-        elif category is not None:
-            raise Exception(
-                "<category> parameter has to be either None or the name of a single column of the DataFrame"
-            )
-
         scatterplot(
             p,
-            df,
-            x,
-            x_old,
-            y,
-            category,
-            category_values,
+            data["columns"],
+            data["x"],
+            data["x_old"],
+            data["y"],
+            options["category"],
+            data["category_values"],
             colormap,
             hovertool,
             hovertool_string,
-            additional_columns,
+            options["additional_columns"],
             x_axis_type=figure_options["x_axis_type"],
             xlabelname=xlabelname,
-            ylabelname=y_column,
+            ylabelname=data_cols[0],
             **kwargs,
         )
 
     if kind == "bar" or kind == "barh":
-        # Define data source for barplot:
-        data = {col: df[col].values for col in data_cols}
-        data["__x__values"] = x
-        data["__x__values_original"] = x_old
-        source = ColumnDataSource(data)
-        for kwarg, value in kwargs.items():
-            if value in df.columns:
-                source.data[value] = df[value].values
-        for add_col in additional_columns:
-            source.data[add_col] = df[add_col].values
-
-        # Create Figure (just for categorical barplots):
-        del figure_options["x_axis_type"]
-        if "y_axis_label" not in figure_options and kind == "barh":
-            figure_options["y_axis_label"] = xlabelname
-        p = figure(**figure_options)
-        figure_options["x_axis_type"] = None
-
-        # Set xticks:
-        if kind == "bar":
-            p.xaxis.formatter = FuncTickFormatter(
-                code="""
-                                    var labels = %s;
-                                    return labels[tick];
-                                    """
-                % x_labels_dict
-            )
-        elif kind == "barh":
-            p.yaxis.formatter = FuncTickFormatter(
-                code="""
-                                    var labels = %s;
-                                    return labels[tick];
-                                    """
-                % x_labels_dict
-            )
-
         if not stacked:
             if N_cols >= 3:
                 base_width = 0.5
@@ -643,137 +1266,46 @@ def plot(  # noqa C901
                     legend_label=data_cols,
                     **kwargs,
                 )
-                hovermode = "vline"
-
-            elif kind == "barh":
-                glyph = p.hbar_stack(
-                    data_cols,
-                    y="__x__values",
-                    height=0.8,
-                    source=source,
-                    color=colormap,
-                    legend_label=data_cols,
-                    **kwargs,
-                )
-                hovermode = "hline"
-
-            if hovertool:
-                my_hover = HoverTool(mode=hovermode, renderers=[glyph[-1]])
-                if hovertool_string is None:
-                    my_hover.tooltips = [(xlabelname, "@__x__values_original")] + [
-                        (col, "@{%s}" % col) for col in data_cols
-                    ]
-                else:
-                    my_hover.tooltips = hovertool_string
-                p.add_tools(my_hover)
-
-    if kind == "hist":
-        # Disable line_color (for borders of histogram bins) per default:
-        if "line_color" not in kwargs:
-            kwargs["line_color"] = None
-        elif kwargs["line_color"] is True:
-            del kwargs["line_color"]
-
-        if "by" in kwargs and y is None:
-            y = kwargs["by"]
-            del kwargs["by"]
-
-        # Check for stacked keyword:
-        if stacked and histogram_type not in [None, "stacked"]:
-            warnings.warn(
-                f"<histogram_type> was set to '{histogram_type}', but was overriden by <stacked>=True parameter."
-            )
-            histogram_type = "stacked"
-        elif stacked and histogram_type is None:
-            histogram_type = "stacked"
-
-        # Set xlabel if only one y-column is given and user does not override this via
-        # xlabel parameter:
-        if len(data_cols) == 1 and xlabel is None:
-            p.xaxis.axis_label = data_cols[0]
-
-        # If Histogram should be plotted, calculate bins, aggregates and
-        # averages:
-
-        # Autocalculate bins if bins are not specified:
-        if bins is None:
-            values = df[data_cols].values
-            values = values[~np.isnan(values)]
-            data, bins = np.histogram(values)
-
-        # Calculate bins if number of bins is given:
-        elif isinstance(bins, int):
-            if bins < 1:
-                raise ValueError(
-                    "<bins> can only be an integer>0, a list or a range of numbers."
-                )
-            values = df[data_cols].values
-            values = values[~np.isnan(values)]
-            v_min, v_max = values.min(), values.max()
-            bins = np.linspace(v_min, v_max, bins + 1)
-
-        if not isinstance(bins, str):
-            bins = list(bins)
-
-        if weights is not None:
-            if weights not in df.columns:
-                raise ValueError(
-                    "Columns '%s' for <weights> is not in provided DataFrame."
-                )
-            else:
-                weights = df[weights].values
-
-        aggregates = []
-        averages = []
-        for col in data_cols:
-            values = df[col].values
-            if weights is not None:
-                not_nan = ~(np.isnan(values) | np.isnan(weights))
-                values_not_nan = values[not_nan]
-                weights_not_nan = weights[not_nan]
-                if sum(not_nan) < len(not_nan):
-                    warnings.warn(
-                        f"There are NaN values in column '{col}' or in the <weights> column. For the histogram, these rows have been neglected.",
-                        Warning,
-                    )
-            else:
-                not_nan = ~np.isnan(values)
-                values_not_nan = values[not_nan]
-                weights_not_nan = None
-                if sum(not_nan) < len(not_nan):
-                    warnings.warn(
-                        f"There are NaN values in column '{col}'. For the histogram, these rows have been neglected.",
-                        Warning,
-                    )
+                hovermode = "vline"
 
-            average = np.average(values_not_nan, weights=weights_not_nan)
-            averages.append(average)
+            elif kind == "barh":
+                glyph = p.hbar_stack(
+                    data_cols,
+                    y="__x__values",
+                    height=0.8,
+                    source=source,
+                    color=colormap,
+                    legend_label=data_cols,
+                    **kwargs,
+                )
+                hovermode = "hline"
 
-            data, bins = np.histogram(
-                values_not_nan, bins=bins, weights=weights_not_nan
-            )
-            if normed:
-                data = data / np.sum(data) * normed
-            if cumulative:
-                data = np.cumsum(data)
-            aggregates.append(data)
+            if hovertool:
+                my_hover = HoverTool(mode=hovermode, renderers=[glyph[-1]])
+                if hovertool_string is None:
+                    my_hover.tooltips = [(xlabelname, "@__x__values_original")] + [
+                        (col, "@{%s}" % col) for col in data_cols
+                    ]
+                else:
+                    my_hover.tooltips = hovertool_string
+                p.add_tools(my_hover)
 
+    if kind == "hist":
         p = histogram(
             p,
-            df,
             data_cols,
             colormap,
-            aggregates,
-            bins,
-            averages,
+            data["aggregates"],
+            data["bins"],
+            data["averages"],
             hovertool,
             hovertool_string,
-            additional_columns,
-            normed,
-            cumulative,
-            show_average,
-            histogram_type,
-            logy,
+            options["additional_columns"],
+            options["normed"],
+            options["cumulative"],
+            options["show_average"],
+            options["histogram_type"],
+            options["logy"],
             **kwargs,
         )
 
@@ -788,12 +1320,11 @@ def plot(  # noqa C901
             xlabelname,
             figure_options["x_axis_type"],
             stacked,
-            normed,
+            options["normed"],
             **kwargs,
         )
 
     if kind == "pie":
-        source["__x__values"] = x_old
         p = pieplot(
             source,
             data_cols,
@@ -805,15 +1336,34 @@ def plot(  # noqa C901
             **kwargs,
         )
 
+    # Show the span of the original timestamps of each aggregated interval:
+    if options["aggregated"]:
+        _add_span_to_hovertools(p)
+
+    # Hovertools show the x-values directly if their duplicate was dropped:
+    if options["drop_x_original"]:
+        for my_hover in p.select(type=HoverTool):
+            _rename_hover_column(my_hover, "__x__values_original", "__x__values")
+
+    # Decode quantized data columns in glyphs and hovertools:
+    if data["quantized"]:
+        _apply_quantization([p, p_rangetool], data["quantized"])
+
+    # Resolve dictionary-encoded hover columns in the hovertools:
+    if data["hover_labels"]:
+        hover_formatters = _hover_formatters(data["hover_labels"])
+        for my_hover in p.select(type=HoverTool):
+            _apply_hover_formatters(my_hover, hover_formatters)
+
     # Set xticks and yticks:
-    if xticks is not None:
-        p.xaxis[0].ticker = list(xticks)
+    if options["xticks"] is not None:
+        p.xaxis[0].ticker = options["xticks"]
     elif x_labels_dict is not None and kind != "barh":
-        p.xaxis.ticker = x
+        p.xaxis.ticker = data["ticks"]
     elif kind == "barh":
-        p.yaxis.ticker = x
-    if yticks is not None:
-        p.yaxis.ticker = list(yticks)
+        p.yaxis.ticker = data["ticks"]
+    if options["yticks"] is not None:
+        p.yaxis.ticker = options["yticks"]
 
     # Format datetime ticks correctly:
     if figure_options["x_axis_type"] == "datetime":
@@ -828,15 +1378,15 @@ def plot(  # noqa C901
         )
 
     # Rotate xlabel if wanted:
-    if vertical_xlabel:
+    if options["vertical_xlabel"]:
         p.xaxis.major_label_orientation = np.pi / 2
 
     # Set panning option:
-    if panning is False:
+    if options["panning"] is False:
         p.toolbar.active_drag = None
 
     # Set zooming option:
-    if zooming is False:
+    if options["zooming"] is False:
         p.toolbar.active_scroll = None
 
     # Set click policy for legend:
@@ -871,13 +1421,14 @@ def plot(  # noqa C901
     # Set fontsizes:
     set_fontsizes_of_figure(
         figure=p,
-        fontsize_title=fontsize_title,
-        fontsize_label=fontsize_label,
-        fontsize_ticks=fontsize_ticks,
-        fontsize_legend=fontsize_legend,
+        fontsize_title=options["fontsize_title"],
+        fontsize_label=options["fontsize_label"],
+        fontsize_ticks=options["fontsize_ticks"],
+        fontsize_legend=options["fontsize_legend"],
     )
 
     # Scientific formatting for axes:
+    disable_scientific_axes = options["disable_scientific_axes"]
     if disable_scientific_axes is None:
         pass
     elif disable_scientific_axes == "x":
@@ -892,20 +1443,414 @@ def plot(  # noqa C901
             """Keyword parameter <disable_scientific_axes> only accepts "xy", True, "x", "y" or None."""
         )
 
+    # Embed only a coarse subset of the rows of progressive plots:
+    if options["progressive"]:
+        _make_progressive([p, p_rangetool], kind, data_cols, options["progressive"])
+
     # If rangetool is used, add it to layout:
     if p_rangetool is not None:
         p = column(p, p_rangetool)
 
-    # Display plot if wanted
-    if show_figure:
-        show(p)
+    return p
 
-    # Return as (embeddable) HTML if wanted:
-    if return_html:
-        return embedded_html(p)
 
-    # Return plot:
-    return p
+def _resample_dataframe(df, x, y, kind, freq, agg, use_index):
+    """Aggregates the (numeric) data columns of <df> to regular time intervals
+    <freq> of the datetime x-values via <agg>. Returns the aggregated DataFrame
+    (indexed by the start of the intervals) and a dictionary with the first and
+    last original timestamp of each interval."""
+
+    resample_allowed_kinds = ["line", "step", "point", "bar", "barh", "area"]
+    if kind not in resample_allowed_kinds:
+        allowed_kinds = "', '".join(resample_allowed_kinds)
+        raise ValueError(
+            f"For using <freq>, the allowed plot kinds are '{allowed_kinds}'."
+        )
+
+    if isinstance(df, pd.Series):
+        df = pd.DataFrame(df)
+
+    # Get datetime values to aggregate on:
+    x_column = None
+    if x is None:
+        if not use_index:
+            raise ValueError("<freq> cannot be used together with <use_index>=False.")
+        keys = df.index
+    elif isinstance(x, (pd.Index, pd.Series, tuple, list, np.ndarray)):
+        if len(x) != len(df):
+            raise ValueError(
+                "Length of provided <x> argument does not fit length of DataFrame or Series."
+            )
+        keys = x
+    elif x in df.columns:
+        x_column = x
+        keys = df[x]
+    else:
+        raise ValueError(
+            "Please provide for the <x> parameter either a column name of the DataFrame/Series or an array of the same length."
+        )
+    try:
+        keys = pd.DatetimeIndex(keys, name=getattr(keys, "name", None))
+    except (TypeError, ValueError):
+        raise ValueError("<freq> can only be used for datetime x-values.")
+
+    # Determine columns to aggregate:
+    if isinstance(agg, dict):
+        columns = list(agg.keys())
+    elif y is not None:
+        columns = [y] if not isinstance(y, (list, tuple)) else list(y)
+    else:
+        columns = [col for col in _determine_data_columns(None, df) if col != x_column]
+    for col in columns:
+        if col not in df.columns:
+            raise ValueError(
+                f"Could not find '{col}' in the columns of the provided DataFrame/Series."
+            )
+
+    # Aggregate only the needed columns:
+    data = df[columns]
+    data.index = keys
+    df_resampled = data.resample(freq).agg(agg)
+    if isinstance(df_resampled.columns, pd.MultiIndex):
+        raise ValueError(
+            "<agg> can only be a single aggregation or a mapping of column names to single aggregations."
+        )
+    df_resampled.index.name = keys.name
+
+    span = pd.Series(keys, index=keys).resample(freq).agg(["min", "max"])
+    x_span = {
+        "__x__values_first": span["min"].values,
+        "__x__values_last": span["max"].values,
+    }
+
+    return df_resampled, x_span
+
+
+def _add_span_to_hovertools(p):
+    """Adds the span of the original timestamps of each aggregated interval to
+    all (default) hovertools of figure p."""
+
+    for hovertool in p.select(type=HoverTool):
+        if isinstance(hovertool.tooltips, list):
+            hovertool.tooltips = hovertool.tooltips + [
+                ("span", "@__x__values_first{%F %T} – @__x__values_last{%F %T}")
+            ]
+            hovertool.formatters = dict(
+                hovertool.formatters,
+                **{
+                    "@__x__values_first": "datetime",
+                    "@__x__values_last": "datetime",
+                },
+            )
+
+
+# Plot kinds whose plot data grows with the number of rows of the DataFrame:
+_PAYLOAD_BUDGET_KINDS = ["line", "step", "point", "scatter", "area", "bar", "barh"]
+
+
+def _fit_payload_budget(  # noqa C901
+    kind,
+    df,
+    x,
+    x_old,
+    data_cols,
+    extra_cols,
+    x_span,
+    n_sources,
+    precision,
+    adapt_precision,
+    max_payload_bytes,
+):
+    """Estimates the size of the serialized plot data from the number of rows,
+    the dtypes and the number of copies of the data source (Bokeh serializes a
+    separate copy for each glyph that gets a dictionary as source). If it exceeds
+    <max_payload_bytes>, the payload is reduced step by step: lossless sharing of
+    the source, reduced precision and finally downsampling of the rows.
+
+    Returns a tuple of the rows to keep (None for all), the precision, and whether
+    the source should be shared and the duplicate x-values dropped."""
+
+    n_rows = len(df)
+    # Areaplots convert the x-values to lists:
+    x_bytes = _estimate_column_bytes(x, as_list=kind == "area")
+    x_old_bytes = x_bytes if x_old is x else _estimate_column_bytes(x_old)
+    other_bytes = sum(_estimate_column_bytes(_to_numpy(df[col])) for col in extra_cols)
+    if x_span is not None:
+        other_bytes += sum(_estimate_column_bytes(v) for v in x_span.values())
+    data_dtypes = [_to_numpy(df[col]).dtype for col in data_cols]
+
+    def estimate(precision, share_source, drop_x_original):
+        size = x_bytes + other_bytes
+        if not drop_x_original:
+            size += x_old_bytes
+        for col, dtype in zip(data_cols, data_dtypes):
+            if precision != "float64" and dtype.kind in "iuf":
+                itemsize = min(dtype.itemsize, np.dtype(precision).itemsize)
+                size += itemsize * n_rows * 4 / 3
+            else:
+                size += _estimate_column_bytes(_to_numpy(df[col]))
+        return size * (1 if share_source else n_sources)
+
+    share_source = False
+    drop_x_original = False
+    size = initial_size = estimate(precision, share_source, drop_x_original)
+    if size <= max_payload_bytes:
+        return None, precision, share_source, drop_x_original
+    measures = []
+
+    # 1. Lossless: Share a single source between all glyphs & drop duplicate x:
+    if kind in ["line", "step", "point"]:
+        share_source = n_sources > 1
+        drop_x_original = x_old is x
+        size = estimate(precision, share_source, drop_x_original)
+        if share_source or drop_x_original:
+            measures.append("deduplicated the data source")
+
+    # 2. Reduce precision of the data columns (areaplots convert their data to
+    # lists, such that a reduced precision would not reduce the payload):
+    if adapt_precision and kind != "area":
+        precisions = ["float32"]
+        if kind in ["line", "step", "point", "scatter"]:
+            precisions.append("int16")
+        initial_precision = precision
+        for reduced_precision in precisions:
+            if size <= max_payload_bytes:
+                break
+            if PRECISIONS.index(reduced_precision) <= PRECISIONS.index(precision):
+                continue
+            precision = reduced_precision
+            size = estimate(precision, share_source, drop_x_original)
+        if precision != initial_precision:
+            measures.append(f"reduced the precision to '{precision}'")
+
+    # 3. Downsample the rows:
+    rows = None
+    if size > max_payload_bytes and kind not in ["bar", "barh"]:
+        n_target = max(int(n_rows * max_payload_bytes / size), 3)
+        method = get_option("downsampling")
+        if kind in ["line", "step", "area"] and method != "sample":
+            rows = _downsample_lines(df, x_old, data_cols, n_target, method)
+            method = {"lttb": "Largest-Triangle-Three-Buckets", "minmax": "min/max"}[
+                method
+            ]
+        else:
+            rng = np.random.default_rng(0)
+            rows = np.sort(rng.choice(n_rows, size=n_target, replace=False))
+            method = "random sample"
+        size *= len(rows) / n_rows
+        measures.append(
+            f"downsampled the data from {n_rows:,} to {len(rows):,} rows ({method})"
+        )
+
+    message = (
+        f"The estimated size of the plot data ({initial_size / 1e6:.1f} MB) "
+        f"exceeds <max_payload_bytes> ({max_payload_bytes / 1e6:.1f} MB). "
+    )
+    if measures:
+        message += "To reduce it, Pandas-Bokeh " + ", ".join(measures) + ". "
+    if size > max_payload_bytes:
+        message += f"The plot data still has an estimated size of {size / 1e6:.1f} MB."
+    else:
+        message += f"Estimated size: {size / 1e6:.1f} MB."
+    warnings.warn(message)
+
+    return rows, precision, share_source, drop_x_original
+
+
+def _downsample_lines(df, x, data_cols, n_target, method="lttb"):
+    """Returns the rows of <df> to keep such that the shape of the lines of all
+    data columns is preserved (union of the selections of each column via
+    <method> "lttb" or "minmax")."""
+
+    x = np.asarray(x)
+    if x.dtype.kind == "M":
+        x = x.astype("datetime64[ns]").view(np.int64)
+    if x.dtype.kind not in "iuf" or np.any(np.diff(x) < 0):
+        # Categorical or unsorted x-values: Use the positions of the rows:
+        x = np.arange(len(df))
+
+    n_out = max(n_target // len(data_cols), 4)
+    rows = []
+    for col in data_cols:
+        y = np.asarray(_to_numpy(df[col]), dtype=float)
+        if method == "minmax":
+            rows.append(_minmax_indices(y, n_out))
+        else:
+            rows.append(_lttb_indices(x, y, n_out))
+    return np.unique(np.concatenate(rows))
+
+
+def _take_rows(values, rows):
+    """Returns the <rows> of an array or list of x-values."""
+
+    if isinstance(values, list):
+        return [values[i] for i in rows]
+    return np.asarray(values)[rows]
+
+
+def _rename_hover_column(my_hover, old, new):
+    """Replaces all references of column <old> in the tooltips and formatters of
+    the hovertool by column <new>."""
+
+    pattern = r"@(\{%s\}|%s(?![\w.]))" % (re.escape(old), re.escape(old))
+
+    def rename(tooltip):
+        return re.sub(pattern, "@{%s}" % new, tooltip)
+
+    if isinstance(my_hover.tooltips, str):
+        my_hover.tooltips = rename(my_hover.tooltips)
+    elif my_hover.tooltips is not None:
+        my_hover.tooltips = [
+            (label, rename(value)) for label, value in my_hover.tooltips
+        ]
+    my_hover.formatters = {
+        rename(field): formatter for field, formatter in my_hover.formatters.items()
+    }
+
+
+def _get_categorical(values):
+    """Returns the Categorical of a categorical Series/Index, else None."""
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.array
+    return None
+
+
+def _data_values(df, data_cols):
+    """Returns the values of all data columns as one flat float array."""
+
+    return np.concatenate(
+        [np.asarray(_to_numpy(df[col]), dtype=float) for col in data_cols]
+    )
+
+
+def _hover_values(values):
+    """Returns the values of a hovertool column: Categoricals are kept (such that
+    they can be encoded by their codes), other columns as NumPy arrays."""
+
+    categorical = _get_categorical(values)
+    if categorical is not None:
+        return categorical
+    return _to_numpy(values)
+
+
+def _encode_hover_columns(source, columns):
+    """Replaces low-cardinality string columns and Categoricals of <source> (that
+    are only used by the hovertool) by integer codes. Returns the labels of the
+    codes of each encoded column. Categoricals of all other columns are replaced
+    by arrays of their values."""
+
+    hover_labels = {}
+    for col in columns:
+        encoded = _dictionary_encode(source[col])
+        if encoded is None:
+            continue
+        source[col], hover_labels[col] = encoded
+    for col, values in source.items():
+        if isinstance(values, pd.Categorical):
+            source[col] = np.asarray(values)
+    return hover_labels
+
+
+def _hover_formatters(hover_labels):
+    """Returns the CustomJSHover formatters that resolve the codes of
+    dictionary-encoded columns to their labels in the hovertool."""
+
+    return {
+        col: CustomJSHover(
+            code="""
+                var labels = %s;
+                return value < 0 ? "NaN" : labels[value];
+                """
+            % json.dumps(labels)
+        )
+        for col, labels in hover_labels.items()
+    }
+
+
+def _apply_hover_formatters(my_hover, formatters):
+    """Uses the formatters of dictionary-encoded columns for all references of
+    these columns in the tooltips of the hovertool."""
+
+    if not formatters:
+        return
+
+    def use_formatter(tooltip):
+        for col in formatters:
+            pattern = r"@(\{%s\}|%s(?![\w.]))(\{[^}]*\})?" % (
+                re.escape(col),
+                re.escape(col),
+            )
+            tooltip = re.sub(
+                pattern, "@{%s}{custom}" % col.replace("\\", "\\\\"), tooltip
+            )
+        return tooltip
+
+    if isinstance(my_hover.tooltips, str):
+        my_hover.tooltips = use_formatter(my_hover.tooltips)
+    elif my_hover.tooltips is not None:
+        my_hover.tooltips = [
+            (label, use_formatter(value)) for label, value in my_hover.tooltips
+        ]
+    my_hover.formatters = dict(
+        my_hover.formatters,
+        **{"@{%s}" % col: formatter for col, formatter in formatters.items()},
+    )
+
+
+def _encode_source_precision(source, data_cols, precision):
+    """Encodes the data columns of <source> with reduced <precision> (and all
+    datetime columns as milliseconds since epoch). Returns the quantization
+    parameters of quantized columns."""
+
+    quantized = {}
+    if precision == "float64":
+        return quantized
+
+    for col, values in source.items():
+        if np.issubdtype(np.asarray(values).dtype, np.datetime64):
+            source[col] = _datetime_to_epoch_ms(values)
+    for col in data_cols:
+        source[col], quantization = _reduce_precision(source[col], precision)
+        if quantization is not None:
+            quantized[col] = quantization
+    return quantized
+
+
+def _apply_quantization(figures, quantized):
+    """Decodes quantized columns in the browser: Glyphs get a transform for the
+    quantized y-fields and the hovertools a formatter for the quantized columns."""
+
+    transforms = {}
+    formatters = {}
+    for col, quantization in quantized.items():
+        decode = "(v == %(sentinel)d ? NaN : %(offset)r + v * %(scale)r)" % quantization
+        transforms[col] = CustomJSTransform(
+            func="var v = x; return %s;" % decode,
+            v_func="""
+                var out = new Float64Array(xs.length);
+                for (var i = 0; i < xs.length; i++) {
+                    var v = xs[i];
+                    out[i] = %s;
+                }
+                return out;
+                """
+            % decode,
+        )
+        decimals = int(np.clip(-np.floor(np.log10(quantization["scale"])), 0, 15))
+        formatters[col] = CustomJSHover(
+            code="var v = value; return %s.toFixed(%d);" % (decode, decimals)
+        )
+
+    for p in figures:
+        if p is None:
+            continue
+        for renderer in p.renderers:
+            glyph = renderer.glyph
+            if isinstance(getattr(glyph, "y", None), str) and glyph.y in transforms:
+                glyph.y = {"field": glyph.y, "transform": transforms[glyph.y]}
+        for my_hover in p.select(type=HoverTool):
+            _apply_hover_formatters(my_hover, formatters)
 
 
 def _determine_data_columns(
@@ -934,6 +1879,126 @@ def _determine_data_columns(
     return data_cols
 
 
+def _kde_source(df, data_cols, by, weights, bw_method, ind):
+    """Returns the (shared) source data for a kde plot, containing a common
+    x-grid and one density per data column and group of <by>, together with the
+    names of the density columns."""
+
+    if by is not None and by not in df.columns:
+        raise ValueError(
+            "<by> parameter has to be either None or the name of a single column of the DataFrame."
+        )
+    if weights is not None:
+        if weights not in df.columns:
+            raise ValueError(
+                f"Column '{weights}' for <weights> is not in provided DataFrame."
+            )
+        weight_values = np.asarray(_to_numpy(df[weights]), dtype=float)
+    data_cols = [col for col in data_cols if col not in (by, weights)]
+    if len(data_cols) == 0:
+        raise ValueError("No numeric data columns found for plotting.")
+
+    # Common grid for all densities (of the columns with values):
+    column_values = {
+        col: np.asarray(_to_numpy(df[col]), dtype=float) for col in data_cols
+    }
+    ranges = [
+        (np.nanmin(values), np.nanmax(values))
+        for values in column_values.values()
+        if not np.isnan(values).all()
+    ]
+    if len(ranges) == 0:
+        raise ValueError("The data columns do not contain any values to plot.")
+    v_min = min(v_min for v_min, _ in ranges)
+    v_max = max(v_max for _, v_max in ranges)
+    grid = _kde_grid(v_min, v_max, ind)
+    source = {"__x__values": grid, "__x__values_original": grid}
+
+    # Split row positions by group (a single sort instead of one mask per group):
+    if by is None:
+        groups = [(None, slice(None))]
+    else:
+        codes, uniques = pd.factorize(df[by], sort=True)
+        order = np.argsort(codes, kind="stable")
+        boundaries = np.searchsorted(codes[order], np.arange(1, len(uniques)))
+        groups = list(zip(uniques, np.split(order, boundaries)))
+
+    density_cols = []
+    for col in data_cols:
+        for group, rows in groups:
+            values = column_values[col][rows]
+            group_weights = None if weights is None else weight_values[rows]
+            not_nan = ~np.isnan(values)
+            if group_weights is not None:
+                not_nan &= ~np.isnan(group_weights)
+                group_weights = group_weights[not_nan]
+            if not_nan.sum() < len(not_nan):
+                warnings.warn(
+                    f"There are NaN values in column '{col}' or in the <weights> column. For the density estimation, these rows have been neglected.",
+                    Warning,
+                )
+            values = values[not_nan]
+
+            if group is None:
+                name = col
+            elif len(data_cols) == 1:
+                name = str(group)
+            else:
+                name = f"{col} ({group})"
+            # Columns and groups without variance do not abort the whole plot:
+            if len(values) == 0 or values.min() == values.max():
+                warnings.warn(
+                    f"Cannot estimate a density for '{name}' (no values or all values are equal). It has been skipped.",
+                    UserWarning,
+                )
+                continue
+            bandwidth = _kde_bandwidth(values, bw_method, group_weights)
+            source[name] = _binned_kde(values, grid, bandwidth, group_weights)
+            density_cols.append(name)
+    if len(density_cols) == 0:
+        raise ValueError(
+            "Cannot estimate a density for any data column or group of <by> (no values or all values are equal)."
+        )
+
+    return source, density_cols
+
+
+def _ecdf_sources(df, data_cols, weights, max_points):
+    """Returns one source per data column containing the step vertices of its
+    empirical cumulative distribution function, together with the names of the
+    data columns."""
+
+    if weights is not None:
+        if weights not in df.columns:
+            raise ValueError(
+                f"Column '{weights}' for <weights> is not in provided DataFrame."
+            )
+        weight_values = np.asarray(_to_numpy(df[weights]), dtype=float)
+    data_cols = [col for col in data_cols if col != weights]
+    if len(data_cols) == 0:
+        raise ValueError("No numeric data columns found for plotting.")
+
+    sources = []
+    for col in data_cols:
+        values = np.asarray(_to_numpy(df[col]), dtype=float)
+        not_nan = ~np.isnan(values)
+        if weights is not None:
+            not_nan &= ~np.isnan(weight_values)
+        if not_nan.sum() < len(not_nan):
+            warnings.warn(
+                f"There are NaN values in column '{col}' or in the <weights> column. For the ECDF, these rows have been neglected.",
+                Warning,
+            )
+        x, y = _ecdf(
+            values[not_nan],
+            None if weights is None else weight_values[not_nan],
+            max_points,
+        )
+        sources.append({"__x__values": x, "__x__values_original": x, col: y})
+
+    return sources, data_cols
+
+
 def _base_lineplot(
     linetype,
     p,
@@ -1143,7 +2208,7 @@ def pointplot(
 
 def scatterplot(  # noqa C901
     p,
-    df,
+    columns,
     x,
     x_old,
     y,
@@ -1158,7 +2223,8 @@ def scatterplot(  # noqa C901
     ylabelname,
     **kwargs,
 ):
-    """Adds a scatterplot to figure p for each data_col."""
+    """Adds a scatterplot to figure p for each data_col. <columns> contains the
+    values of the DataFrame columns used by the glyphs or the hovertool."""
 
     # Set standard size and linecolor of markers:
     if "size" not in kwargs:
@@ -1167,20 +2233,30 @@ def scatterplot(  # noqa C901
         kwargs["line_color"] = "black"
 
     # Define source:
-    source = ColumnDataSource({"__x__values": x, "__x__values_original": x_old, "y": y})
+    data = {"__x__values": x, "__x__values_original": x_old, "y": y}
     for kwarg, value in kwargs.items():
-        if value in df.columns:
-            source.data[value] = df[value].values
+        if value in columns:
+            data[value] = columns[value]
     for add_col in additional_columns:
-        source.data[add_col] = df[add_col].values
+        data[add_col] = columns[add_col]
+    hover_only_columns = [
+        col for col in additional_columns if col not in kwargs.values()
+    ]
+    if get_option("hover") == "raw":
+        hover_only_columns = []
+    hover_formatters = _hover_formatters(
+        _encode_hover_columns(data, hover_only_columns)
+    )
+    source = ColumnDataSource(data)
 
     # Define Colormapper for categorical scatterplot:
     if category is not None:
         category = str(category)
-        source.data[category] = category_values
+        is_categorical = isinstance(category_values, pd.Categorical)
 
         # Make numerical categorical scatterplot:
-        if check_type(category_values) == "numeric":
+        if not is_categorical and check_type(category_values) == "numeric":
+            source.data[category] = category_values
             kwargs["legend_label"] = category + " "
 
             # Define colormapper for numerical scatterplot:
@@ -1238,35 +2314,48 @@ def scatterplot(  # noqa C901
                     my_hover.tooltips.append((str(category), "@{%s}" % category))
                 else:
                     my_hover.tooltips = hovertool_string
+                _apply_hover_formatters(my_hover, hover_formatters)
                 p.add_tools(my_hover)
 
         # Make categorical scatterplot:
-        elif check_type(category_values) == "object":
-            # Define colormapper for categorical scatterplot:
-            labels, categories = pd.factorize(category_values)
+        elif is_categorical or check_type(category_values) == "object":
+            # Get integer labels of categories (Categoricals already provide them):
+            if is_categorical:
+                labels, categories = _categorical_codes(category_values)
+                observed = np.bincount(labels[labels >= 0], minlength=len(categories))
+                categories = categories[observed > 0]
+                labels = np.searchsorted(np.flatnonzero(observed > 0), labels)
+                labels[category_values.codes < 0] = -1
+            else:
+                labels, categories = pd.factorize(category_values)
             colormap = get_colormap(colormap, len(categories))
 
+            # Get rows of each category via a single sort of the labels:
+            order = np.argsort(labels, kind="stable")
+            order = order[labels[order] >= 0]
+            boundaries = np.searchsorted(labels[order], np.arange(1, len(categories)))
+            category_rows = np.split(order, boundaries)
+
             # Draw each category as separate glyph:
-            x, y = source.data["__x__values"], source.data["y"]
-            for cat, color in zip(categories, colormap):
-                # Define reduced source for this categorx:
-                x_cat = x[category_values == cat]
-                x_old_cat = x_old[category_values == cat]
-                y_cat = y[category_values == cat]
-                cat_cat = category_values[category_values == cat]
-                source = ColumnDataSource(
-                    {
-                        "__x__values": x_cat,
-                        "__x__values_original": x_old_cat,
-                        "y": y_cat,
-                        "category": cat_cat,
-                    }
-                )
+            x, y = np.asarray(source.data["__x__values"]), source.data["y"]
+            x_old = np.asarray(x_old)
+            for cat, color, rows in zip(categories, colormap, category_rows):
+                # Define reduced source for this category:
+                data = {
+                    "__x__values": x[rows],
+                    "__x__values_original": x_old[rows],
+                    "y": y[rows],
+                    "category": np.full(len(rows), cat),
+                }
                 for kwarg, value in kwargs.items():
-                    if value in df.columns:
-                        source.data[value] = df[value].values[category_values == cat]
+                    if value in columns:
+                        data[value] = columns[value][rows]
                 for add_col in additional_columns:
-                    source.data[add_col] = df[add_col].values[category_values == cat]
+                    data[add_col] = columns[add_col][rows]
+                hover_formatters = _hover_formatters(
+                    _encode_hover_columns(data, hover_only_columns + ["category"])
+                )
+                source = ColumnDataSource(data)
 
                 # Draw glyph:
                 glyph = p.scatter(
@@ -1296,6 +2385,7 @@ def scatterplot(  # noqa C901
                         my_hover.tooltips.append((str(category), "@category"))
                     else:
                         my_hover.tooltips = hovertool_string
+                    _apply_hover_formatters(my_hover, hover_formatters)
                     p.add_tools(my_hover)
 
             if len(categories) > 5:
@@ -1332,6 +2422,7 @@ def scatterplot(  # noqa C901
                     ]
             else:
                 my_hover.tooltips = hovertool_string
+            _apply_hover_formatters(my_hover, hover_formatters)
             p.add_tools(my_hover)
 
     return p
@@ -1339,7 +2430,6 @@ def scatterplot(  # noqa C901
 
 def histogram(
     p,
-    df,
     data_cols,
     colormap,
     aggregates,
@@ -1505,6 +2595,9 @@ def areaplot(
             "__x__values": source["__x__values"],
             "__x__values_original": source["__x__values_original"],
         }
+        for key in ["__x__values_first", "__x__values_last"]:
+            if key in source:
+                line_source[key] = source.pop(key)
         baseline = np.zeros(len(source["__x__values"]))
         del source["__x__values_original"]
         source["__x__values"] = (
@@ -1754,6 +2847,9 @@ def df(self):
         # Convert PySpark Dataframe to Pandas Dataframe:
         if hasattr(dataframe, "toPandas"):
             dataframe = dataframe.toPandas()
+        # Arrow tables are plotted directly (see plot):
+        elif _is_arrow(dataframe):
+            dataframe = _arrow_to_pandas(dataframe)
 
         return dataframe
 
@@ -2167,6 +3263,98 @@ def hist(self, **kwds):
         """
         return self(kind="hist", **kwds)
 
+    def kde(self, bw_method=None, ind=None, **kwds):
+        """
+        Generate Kernel Density Estimate plot using Gaussian kernels.
+
+        The density of each column is estimated by binning the values onto a
+        regular grid and convolving the binned counts with the Gaussian kernel via
+        FFT. This scales linearly with the number of values, such that densities
+        of very large DataFrames can be plotted in a few seconds.
+
+        Parameters
+        ----------
+        bw_method : str or scalar, optional
+            The method used to calculate the estimator bandwidth. This can be
+            'scott', 'silverman' or a scalar factor that is multiplied with the
+            standard deviation of the data. If None (default), 'scott' is used.
+        ind : NumPy array or int, optional
+            Evaluation points for the estimated PDF. If None (default),
+            1000 equally spaced points are used. If `ind` is an integer,
+            `ind` number of equally spaced points are used.
+        by : str, optional
+            Column in the DataFrame to group by. A density is drawn for each
+            group.
+        **kwds
+            Additional keyword arguments are documented in
+            :meth:`pandas.DataFrame.plot_bokeh`.
+
+        Returns
+        -------
+        Bokeh.plotting.figure
+
+        See Also
+        --------
+        pandas.DataFrame.plot_bokeh.hist : Draw a histogram of the columns.
+
+        Examples
+        --------
+
+        .. plot::
+            :context: close-figs
+
+            >>> df = pd.DataFrame({
+            ...     'x': [1, 2, 2.5, 3, 3.5, 4, 5],
+            ...     'y': [4, 4, 4.5, 5, 5.5, 6, 6],
+            ... })
+            >>> p = df.plot_bokeh.kde(bw_method=0.3, ind=[1, 2, 3, 4, 5, 6])
+        """
+        return self(kind="kde", bw_method=bw_method, ind=ind, **kwds)
+
+    density = kde
+
+    def ecdf(self, y=None, max_points=None, **kwds):
+        """
+        Plot the empirical cumulative distribution function (ECDF) of the
+        DataFrame's columns as step lines.
+
+        Instead of drawing one vertex per row, at most `max_points` vertices are
+        drawn per column. They are placed at the data values where the ECDF
+        crosses an equally spaced grid of probabilities, such that the curve
+        deviates at most 1/(max_points - 1) of the y-range from the exact ECDF.
+
+        Parameters
+        ----------
+        y : label or list of labels, optional
+            Columns to plot. By default, all numeric columns are used.
+        max_points : int, optional
+            Maximum number of step vertices per column. Defaults to
+            pandas_bokeh.options.max_points (1000). Pass float("inf") (or set
+            the option to None) to draw every value.
+        weights : str, optional
+            A column of the DataFrame that is used as weight for each row.
+        **kwds
+            Additional keyword arguments are documented in
+            :meth:`pandas.DataFrame.plot_bokeh`.
+
+        Returns
+        -------
+        Bokeh.plotting.figure
+
+        Examples
+        --------
+
+        .. plot::
+            :context: close-figs
+
+            >>> df = pd.DataFrame({
+            ...     'latency_a': np.random.exponential(20, 100000),
+            ...     'latency_b': np.random.exponential(30, 100000),
+            ... })
+            >>> p = df.plot_bokeh.ecdf(max_points=500)
+        """
+        return self(kind="ecdf", y=y, max_points=max_points, **kwds)
+
     def area(self, x=None, y=None, **kwds):
         """
         Area plot
@@ -2410,12 +3598,15 @@ def _initialize_rangetool(p, x_axis_type, source):
     )
 
     # Need to explicitly set the initial range of the plot for the range tool.
-    start_index = int(0.75 * len(source["__x__values"]))
-    start = source["__x__values"][start_index]
-    end = source["__x__values"][-1]
+    x_values = (
+        source.data["__x__values"] if hasattr(source, "data") else source["__x__values"]
+    )
+    start_index = int(0.75 * len(x_values))
+    start = x_values[start_index]
+    end = x_values[-1]
     # Explicitly cast to python datetime object due to a bug in numpy
     # (see https://github.com/bokeh/bokeh/blob/branch-3.0/bokeh/core/property/bases.py#L251):
-    if source["__x__values"].dtype.name == "datetime64[ns]":
+    if x_values.dtype.name == "datetime64[ns]":
         start = datetime.datetime.fromtimestamp(int(start) / 1_000_000_000)
         end = datetime.datetime.fromtimestamp(int(end) / 1_000_000_000)
     p.x_range = Range1d(start, end)
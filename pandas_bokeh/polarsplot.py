@@ -0,0 +1,337 @@
+"""Plotting of Polars DataFrames and LazyFrames via their plot_bokeh namespace
+(registered if polars is installed):
+
+>>> lf = pl.scan_parquet("sensors.parquet")
+>>> lf.plot_bokeh.line(x="time", y="temperature", filters=pl.col("sensor") == "A")
+
+Only the columns used by the plot are selected and the <filters> are applied in
+the lazy plan, such that Polars pushes both down to the scan. The reductions of
+plot_chunks are computed by Polars:
+
+- line, step, point: M4 buckets of the x-range (if there are more rows than
+  4 * <buckets>)
+- scatter: counts of a 2D grid (if there are more rows than <buckets>**2)
+- hist: counts of the bins
+- bar, barh: sums of the data columns (or counts of rows) per category
+
+The (reduced) result is handed to the plot as Arrow table, whose buffers are
+shared by the plot data (see arrow._arrow_to_pandas)."""
+
+import functools
+import operator
+
+import numpy as np
+import pandas as pd
+
+from .arrow import _arrow_to_pandas
+from .cache import _used_columns
+from .chunks import _DEFAULT_BUCKETS, _plot_reduced
+from .plot import FramePlotMethods, plot
+
+# Row numbers, which are used as index (x-values) if no <x> is given:
+_ROW = "__row_nr__"
+# Helper columns of the reductions:
+_KEY = "__key__"
+_WEIGHT = "__weight__"
+
+
+def _schema(frame):
+    "Returns the schema of the Polars DataFrame or LazyFrame <frame>."
+
+    if hasattr(frame, "collect_schema"):
+        return frame.collect_schema()
+    return frame.schema
+
+
+def _with_row_numbers(frame):
+    if hasattr(frame, "with_row_index"):
+        return frame.with_row_index(_ROW)
+    return frame.with_row_count(_ROW)
+
+
+def _keys(col):
+    "Returns the expression of the values of <col> as floats (null for NaN)."
+
+    import polars as pl
+
+    return pl.col(col).to_physical().cast(pl.Float64).fill_nan(None)
+
+
+def _data_columns(schema, y, exclude):
+    """Returns the data columns <y> (default: the numeric columns of <schema>
+    except <exclude>)."""
+
+    if y is None:
+        data_cols = [
+            col
+            for col, dtype in schema.items()
+            if col not in exclude and dtype.is_numeric()
+        ]
+    else:
+        data_cols = list(y) if isinstance(y, (list, tuple)) else [y]
+        for col in data_cols:
+            if col not in schema:
+                raise ValueError(
+                    f"Could not find '{col}' in the columns of the provided DataFrame."
+                )
+    if len(data_cols) == 0:
+        raise ValueError("No numeric data columns found for plotting.")
+    return data_cols
+
+
+def _to_pandas(frame):
+    """Returns the Polars DataFrame <frame> as pandas DataFrame sharing its Arrow
+    buffers, with the row numbers (if selected) as index."""
+
+    df = _arrow_to_pandas(frame.to_arrow())
+    if _ROW in df.columns:
+        df.index = pd.Index(df.pop(_ROW).to_numpy())
+    return df
+
+
+def _bounds(frame, keys):
+    "Returns the minimum and maximum of the expressions <keys> (or None)."
+
+    bounds = frame.select(
+        [key.min().alias(f"min{i}") for i, key in enumerate(keys)]
+        + [key.max().alias(f"max{i}") for i, key in enumerate(keys)]
+    ).row(0)
+    values = [value for value in bounds if value is not None]
+    if not values:
+        return None, None
+    return min(values), max(values)
+
+
+def _m4(frame, x, data_cols, n_buckets):
+    """Returns the first, last, minimum and maximum row of each of <n_buckets>
+    buckets of the x-range and each data column, sorted by x."""
+
+    import polars as pl
+
+    frame = frame.with_columns(_keys(_ROW if x is None else x).alias(_KEY))
+    frame = frame.drop_nulls(_KEY).with_columns(
+        pl.int_range(pl.len()).alias("__position__")
+    )
+    lo, hi = _bounds(frame, [pl.col(_KEY)])
+    if lo is None:
+        raise ValueError("The DataFrame does not contain any rows to plot.")
+    width = (hi - lo) / n_buckets or 1.0
+    bucket = ((pl.col(_KEY) - lo) / width).floor().clip(0, n_buckets - 1)
+
+    position = pl.col("__position__")
+    selected = [
+        position.sort_by(_KEY).first().alias("first"),
+        position.sort_by(_KEY).last().alias("last"),
+    ]
+    for i, col in enumerate(data_cols):
+        values = _keys(col)
+        selected += [
+            position.sort_by(values, nulls_last=True).first().alias(f"min{i}"),
+            position.sort_by(values, descending=True, nulls_last=True)
+            .first()
+            .alias(f"max{i}"),
+        ]
+    rows = frame.group_by(bucket.alias("__bucket__")).agg(selected).drop("__bucket__")
+    rows = np.unique(np.concatenate([rows[col].to_numpy() for col in rows.columns]))
+    return frame[rows].sort(_KEY).drop([_KEY, "__position__"])
+
+
+def _grid(frame, x, y, n_buckets):
+    """Returns the centers of the non-empty cells of a grid of <n_buckets> x
+    <n_buckets> cells of the x- and y-values and their number of rows."""
+
+    import polars as pl
+
+    dtypes = _schema(frame)
+    frame = frame.select(_keys(x).alias(x), _keys(y).alias(y)).drop_nulls()
+    cells, centers = [], []
+    for col in [x, y]:
+        lo, hi = _bounds(frame, [pl.col(col)])
+        if lo is None:
+            raise ValueError("The DataFrame does not contain any rows to plot.")
+        width = (hi - lo) / n_buckets or 1.0
+        cells.append(((pl.col(col) - lo) / width).floor().clip(0, n_buckets - 1))
+        center = lo + (pl.col(col) + 0.5) * width
+        # Datetimes are bucketed by their integer representation:
+        if dtypes[col].is_temporal():
+            center = center.cast(pl.Int64).cast(dtypes[col])
+        centers.append(center.alias(col))
+    return (
+        frame.group_by(cells)
+        .agg(pl.len().cast(pl.Int64).alias("count"))
+        .with_columns(centers)
+    )
+
+
+def _histogram(frame, data_cols, bins, weights):
+    """Returns the bin edges, the (weighted) counts and the averages of the data
+    columns for the bins <bins> like plot(kind='hist')."""
+
+    import polars as pl
+
+    if bins is None:
+        bins = 10
+    frame = frame.with_columns(
+        pl.lit(1.0).alias(_WEIGHT) if weights is None else _keys(weights).alias(_WEIGHT)
+    )
+    if isinstance(bins, int):
+        if bins < 1:
+            raise ValueError(
+                "<bins> can only be an integer>0, a list or a range of numbers."
+            )
+        lo, hi = _bounds(frame, [_keys(col) for col in data_cols])
+        if lo is None:
+            raise ValueError("The DataFrame does not contain any values to plot.")
+        if lo == hi:
+            lo, hi = lo - 0.5, hi + 0.5
+        edges = np.linspace(lo, hi, bins + 1)
+    else:
+        edges = np.asarray(bins, dtype=float)
+    n_bins = len(edges) - 1
+
+    weight = pl.col(_WEIGHT)
+    aggregates, averages = [], []
+    for col in data_cols:
+        values = _keys(col)
+        if isinstance(bins, int):
+            index = ((values - edges[0]) / (edges[1] - edges[0])).floor()
+        else:
+            # The bin of a value is the number of inner edges below it:
+            index = functools.reduce(
+                operator.add,
+                [(values >= edge).cast(pl.Int64) for edge in edges[1:-1]],
+                pl.lit(0),
+            )
+        valid = frame.filter(values.is_not_null() & weight.is_not_null())
+        total_sum, total = valid.select((values * weight).sum(), weight.sum()).row(0)
+        averages.append(total_sum / total if total else np.nan)
+
+        counts = (
+            valid.filter((values >= edges[0]) & (values <= edges[-1]))
+            .group_by(index.cast(pl.Int64).clip(0, n_bins - 1).alias("bin"))
+            .agg(weight.sum().alias("count"))
+        )
+        aggregate = np.zeros(n_bins)
+        aggregate[counts["bin"].to_numpy()] = counts["count"].to_numpy()
+        aggregates.append(aggregate)
+    return list(edges), aggregates, averages
+
+
+def _sums(frame, x, y, top_k):
+    """Returns the sums of the data columns (or the number of rows if there are no
+    numeric columns) per category of <x> and the data columns. With <top_k>, only
+    the categories with the largest totals are kept."""
+
+    import polars as pl
+
+    schema = _schema(frame)
+    if y is None and not any(
+        dtype.is_numeric() for col, dtype in schema.items() if col != x
+    ):
+        data_cols = ["count"]
+        aggregations = [pl.len().cast(pl.Int64).alias("count")]
+    else:
+        data_cols = _data_columns(schema, y, [x])
+        aggregations = [pl.col(col).sum() for col in data_cols]
+    sums = frame.group_by(x, maintain_order=True).agg(aggregations)
+    if top_k is not None:
+        sums = sums.sort(
+            pl.sum_horizontal(data_cols), descending=True, maintain_order=True
+        ).head(top_k)
+    return sums, data_cols
+
+
+class PolarsPlotMethods(FramePlotMethods):
+    """Polars DataFrame and LazyFrame plotting namespace and method
+
+    Examples
+    --------
+    >>> df.plot_bokeh.line(x="time", y="temperature")
+    >>> lf.plot_bokeh(kind="hist", y="temperature", filters=pl.col("sensor") == "A")
+    """
+
+    def __call__(  # noqa C901
+        self,
+        x=None,
+        y=None,
+        kind="line",
+        filters=None,
+        buckets=None,
+        top_k=None,
+        **kwargs,
+    ):
+        """Plots the Polars DataFrame or LazyFrame like plot(), selecting only the
+        columns used by the plot and reducing the data in Polars (see the module
+        docstring). Without <x>, the row numbers are used as x-values.
+
+        Parameters (in addition to plot()):
+        ----------------------------------------------------------------
+        filters (polars expression or list, optional) – predicates on the rows,
+                 which are applied in the lazy plan (e.g. pl.col("sensor") == "A")
+        buckets (int, optional) – number of buckets of line, step and point plots
+                                  (default: 1000) resp. of each axis of scatter
+                                  plots (default: 200). Scatter plots with a
+                                  <category> are not reduced.
+        top_k (int, optional) – number of categories with the largest totals of
+                                bar plots (default: all)"""
+
+        import polars as pl
+
+        if buckets is None:
+            buckets = _DEFAULT_BUCKETS.get(kind)
+        if buckets is not None and (not isinstance(buckets, int) or buckets < 1):
+            raise ValueError("<buckets> has to be an integer >= 1.")
+        if top_k is not None and (not isinstance(top_k, int) or top_k < 1):
+            raise ValueError("<top_k> has to be an integer >= 1.")
+
+        frame = self._parent.lazy()
+        if x is None and kind != "hist":
+            frame = _with_row_numbers(frame)
+        if filters is not None:
+            frame = frame.filter(filters)
+        columns = _used_columns(
+            pd.DataFrame(columns=list(_schema(frame))),
+            dict(kwargs, x=x, y=y, kwargs=kwargs),
+        )
+        if x is None and _ROW not in columns and kind != "hist":
+            columns.append(_ROW)
+        frame = frame.select(columns).collect()
+        schema = _schema(frame)
+
+        plot_kwargs = dict(kwargs, x=x, y=y)
+        reduce_kwargs = dict(
+            x=x,
+            buckets=buckets,
+            show_figure=kwargs.pop("show_figure", True),
+            return_html=kwargs.pop("return_html", False),
+            kwargs=kwargs,
+        )
+        if kind in ["line", "step", "point"] and frame.height > 4 * buckets:
+            x_dtype = schema[_ROW if x is None else x]
+            if x_dtype.is_numeric() or x_dtype.is_temporal():
+                data_cols = _data_columns(schema, y, [x, _ROW])
+                frame = _m4(frame, x, data_cols, buckets)
+        elif (
+            kind == "scatter"
+            and frame.height > buckets**2
+            and kwargs.get("category") is None
+            and isinstance(x, str)
+            and isinstance(y, str)
+        ):
+            result = _to_pandas(_grid(frame, x, y, buckets))
+            return _plot_reduced(kind, result, [y], **reduce_kwargs)
+        elif kind == "hist" and not isinstance(kwargs.get("bins"), str):
+            weights = kwargs.pop("weights", None)
+            data_cols = _data_columns(schema, y, [weights])
+            result = _histogram(frame, data_cols, kwargs.pop("bins", None), weights)
+            return _plot_reduced(kind, result, data_cols, **reduce_kwargs)
+        elif kind in ["bar", "barh"] and x is not None:
+            sums, data_cols = _sums(frame, x, y, top_k)
+            result = _to_pandas(sums).set_index(x)
+            return _plot_reduced(kind, result, data_cols, **reduce_kwargs)
+
+        return plot(_to_pandas(frame), kind=kind, **plot_kwargs)
+
+    @property
+    def df(self):
+        return _to_pandas(self._parent.lazy().collect())
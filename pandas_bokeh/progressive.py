@@ -0,0 +1,105 @@
+"""Progressive refinement of line, step, point and scatter plots: the figure only
+embeds a coarse subset of the rows (shape-preserving for lines, a random sample
+for points), the full data is loaded afterwards in chunks from sidecar files and
+spliced into the data sources, without resetting the zoom of the user:
+
+>>> pandas_bokeh.output_file("report.html", data="sidecar")
+>>> df.plot_bokeh.line(progressive=True)
+
+The full data of the data sources is kept in the Python process (weakly, as long
+as the figure exists) until the figure is written with sidecar data (see
+sidecar_components). Other outputs only contain the coarse data."""
+
+import weakref
+
+import numpy as np
+from bokeh.models import ColumnDataSource
+
+from .config import get_option
+from .utils import _lttb_indices, _minmax_indices
+
+PROGRESSIVE_KINDS = ["line", "step", "point", "scatter"]
+
+# Full data of the data sources of progressive plots:
+_FULL_DATA = weakref.WeakKeyDictionary()
+
+
+def _coarse_rows(kind, data, data_cols, n_target):
+    """Returns the sorted rows of the data source <data> to embed: for lines the
+    union of the shape-preserving selections of each data column (option
+    "downsampling"), otherwise a random sample."""
+
+    n_rows = len(data["__x__values"])
+    method = get_option("downsampling")
+    y_cols = [col for col in data_cols if col in data] or ["y"]
+    if kind in ["line", "step"] and method != "sample" and y_cols[0] in data:
+        x = np.asarray(data["__x__values"])
+        if x.dtype.kind == "M":
+            x = x.astype("datetime64[ns]").view(np.int64)
+        if x.dtype.kind not in "iuf" or np.any(np.diff(x) < 0):
+            x = np.arange(n_rows)
+        n_out = max(n_target // len(y_cols), 4)
+        rows = []
+        for col in y_cols:
+            y = np.asarray(data[col], dtype=float)
+            if method == "minmax":
+                rows.append(_minmax_indices(y, n_out))
+            else:
+                rows.append(_lttb_indices(x, y, n_out))
+        return np.unique(np.concatenate(rows))
+
+    rng = np.random.default_rng(0)
+    return np.sort(rng.choice(n_rows, size=n_target, replace=False))
+
+
+def _make_progressive(figures, kind, data_cols, n_target):
+    """Replaces the data of the sources of <figures> with more than <n_target> rows
+    (in total) by coarse subsets and keeps their full data for sidecar output.
+    Sources of categorical scatterplots share <n_target> by their number of
+    rows."""
+
+    sources = {}
+    for p in figures:
+        if p is not None:
+            for source in p.select({"type": ColumnDataSource}):
+                sources[source.id] = source
+    lengths = {
+        source_id: len(next(iter(source.data.values()), ()))
+        for source_id, source in sources.items()
+    }
+    n_total = sum(lengths.values())
+    if n_total <= n_target:
+        return
+
+    for source_id, source in sources.items():
+        n_source = max(int(n_target * lengths[source_id] / n_total), 4)
+        if lengths[source_id] <= n_source:
+            continue
+        full_data = dict(source.data)
+        rows = _coarse_rows(kind, full_data, data_cols, n_source)
+        source.data = {
+            name: (
+                [values[i] for i in rows]
+                if isinstance(values, list)
+                else np.asarray(values)[rows]
+            )
+            for name, values in full_data.items()
+        }
+        _FULL_DATA[source] = (full_data, rows)
+
+
+def _progressive_chunks(source, chunk_rows):
+    """Returns the chunks of the full data of a progressive <source> (None for
+    other sources) as list of (data, cut): the data of consecutive rows and the
+    number of coarse rows before the end of the chunk."""
+
+    if source not in _FULL_DATA:
+        return None
+    full_data, rows = _FULL_DATA[source]
+    n_rows = len(next(iter(full_data.values())))
+    chunks = []
+    for start in range(0, n_rows, chunk_rows):
+        stop = min(start + chunk_rows, n_rows)
+        data = {name: values[start:stop] for name, values in full_data.items()}
+        chunks.append((data, int(np.searchsorted(rows, stop))))
+    return chunks
@@ -0,0 +1,225 @@
+"""HTML reports with many figures, which include the BokehJS resources only once
+and serialize the figures together instead of one document per figure:
+
+>>> report = pandas_bokeh.Report(title="Sales")
+>>> report.add_heading("Revenue")
+>>> report.add(df.plot_bokeh.line(show_figure=False))
+>>> report.save("sales.html")
+
+For very large reports, the page can be streamed to a file, such that only
+<batch_size> figures are kept in memory:
+
+>>> with open("sales.html", "w") as f, pandas_bokeh.Report(f, batch_size=20) as report:
+...     for region, df_region in df.groupby("region"):
+...         report.add(df_region.plot_bokeh.line(show_figure=False), heading=region)
+"""
+
+import html
+import io
+
+from bokeh.embed import components
+from bokeh.model import Model
+from bokeh.resources import Resources
+
+from .compress import compressed_components
+from .dedup import deduplicate_sources
+from .sidecar import sidecar_components
+
+
+class Report:
+    """Collects figures, layouts, headings and HTML snippets for a single HTML page.
+
+    Parameters:
+    ----------------------------------------------------------------
+    file (file handle, optional) – stream the page to this text file handle
+                                   (the report has to be closed, e.g. via a
+                                   with-statement). Otherwise the page is created
+                                   via save or to_html.
+    title (str) – title of the HTML page (default: "Bokeh Report")
+    mode (str) – how to include BokehJS (default: 'cdn'), see output_file
+    root_dir (str, optional) – root directory for 'absolute' resources
+    batch_size (int, optional) – number of figures serialized together (in one
+                                 components() call). By default, all figures are
+                                 serialized together when the page is written.
+    deduplicate (bool) – merge data sources with identical columns across the
+                         figures of each batch (see deduplicate_sources), the
+                         estimated number of saved bytes is counted in
+                         <bytes_saved>. This links the selections of the merged
+                         figures.
+    compress (bool) – embed the serialized figures deflate compressed, they are
+                      inflated by the browser (via DecompressionStream).
+    data (str) – "inline" (default) embeds the plot data into the page, "sidecar"
+                 writes the data of each data source to a binary file in
+                 <data_dir>, which is loaded asynchronously by the page (see
+                 sidecar_components)
+    data_dir (str, optional) – directory of the sidecar files (required for
+                               data="sidecar")
+    data_url (str, optional) – URL of <data_dir> relative to the page (default:
+                               the name of <data_dir>, i.e. next to the page)"""
+
+    def __init__(
+        self,
+        file=None,
+        title="Bokeh Report",
+        mode="cdn",
+        root_dir=None,
+        batch_size=None,
+        deduplicate=False,
+        compress=False,
+        data="inline",
+        data_dir=None,
+        data_url=None,
+    ):
+        if batch_size is not None and (
+            not isinstance(batch_size, int) or batch_size < 1
+        ):
+            raise ValueError("<batch_size> has to be None or an integer >= 1.")
+        if data not in ("inline", "sidecar"):
+            raise ValueError('<data> has to be "inline" or "sidecar".')
+        if data == "sidecar" and data_dir is None:
+            raise ValueError('<data_dir> is required for data="sidecar".')
+        self.title = title
+        self.resources = Resources(mode=mode, root_dir=root_dir)
+        self.batch_size = batch_size
+        self.deduplicate = deduplicate
+        self.compress = compress
+        self.data = data
+        self.data_dir = data_dir
+        self.data_url = data_url
+        self.bytes_saved = 0
+        self._file = file
+        self._items = []
+        self._n_models = 0
+        self._closed = False
+        if file is not None:
+            self._write_header(file)
+
+    def add(self, obj, heading=None):
+        """Adds a figure or layout (optionally with a heading above it). Returns the
+        report, such that calls can be chained."""
+
+        if not isinstance(obj, Model):
+            raise ValueError("<obj> has to be a Bokeh figure or layout.")
+        if heading is not None:
+            self.add_heading(heading)
+        self._append(("model", obj))
+        self._n_models += 1
+        if (
+            self._file is not None
+            and self.batch_size is not None
+            and self._n_models >= self.batch_size
+        ):
+            self._write_items(self._file)
+        return self
+
+    def add_heading(self, text, level=2):
+        "Adds a heading <h{level}> with (escaped) <text>."
+
+        if level not in range(1, 7):
+            raise ValueError("<level> has to be an integer between 1 and 6.")
+        return self._append(("html", f"<h{level}>{html.escape(str(text))}</h{level}>"))
+
+    def add_html(self, html_string):
+        "Adds an HTML snippet (not escaped)."
+
+        return self._append(("html", html_string))
+
+    def _append(self, item):
+        if self._closed:
+            raise ValueError("The report is already closed.")
+        self._items.append(item)
+        return self
+
+    def _write_header(self, f):
+        f.write(
+            "<!DOCTYPE html>\n"
+            '<html lang="en">\n'
+            "<head>\n"
+            '<meta charset="utf-8">\n'
+            f"<title>{html.escape(str(self.title))}</title>\n"
+            f"{self.resources.render_css()}\n"
+            f"{self.resources.render_js()}\n"
+            "</head>\n"
+            "<body>\n"
+        )
+
+    def _write_items(self, f):
+        "Writes the collected items, serializing batch_size figures at a time."
+
+        items, self._items = self._items, []
+        self._n_models = 0
+        models = [obj for kind, obj in items if kind == "model"]
+        batch_size = self.batch_size or max(len(models), 1)
+        while items:
+            # Items up to (and including) the last model of the batch:
+            n_batch = 0
+            end = len(items)
+            for i, (kind, _) in enumerate(items):
+                if kind == "model":
+                    n_batch += 1
+                    if n_batch == batch_size:
+                        end = i + 1
+                        break
+            batch, items = items[:end], items[end:]
+
+            batch_models = [obj for kind, obj in batch if kind == "model"]
+            if self.deduplicate and batch_models:
+                self.bytes_saved += deduplicate_sources(batch_models).bytes_saved
+            if not batch_models:
+                script, divs = "", ()
+            elif self.data == "sidecar":
+                script, divs = sidecar_components(
+                    batch_models, self.data_dir, self.data_url, self.compress
+                )
+            elif self.compress:
+                script, divs = compressed_components(batch_models)
+            else:
+                script, divs = components(batch_models)
+            divs = iter(divs)
+            for kind, obj in batch:
+                f.write((next(divs) if kind == "model" else obj) + "\n")
+            f.write(script + "\n")
+
+    def _write_footer(self, f):
+        f.write("</body>\n</html>\n")
+
+    def write(self, f):
+        "Writes the complete page to the text file handle <f>."
+
+        if self._file is not None:
+            raise ValueError("The report is streamed to the file given on creation.")
+        self._write_header(f)
+        items = list(self._items)
+        try:
+            self._write_items(f)
+        finally:
+            self._items = items
+            self._n_models = sum(kind == "model" for kind, _ in items)
+        self._write_footer(f)
+
+    def save(self, filename):
+        "Saves the page as HTML file <filename>."
+
+        with open(filename, mode="w", encoding="utf-8") as f:
+            self.write(f)
+
+    def to_html(self):
+        "Returns the page as HTML string."
+
+        f = io.StringIO()
+        self.write(f)
+        return f.getvalue()
+
+    def close(self):
+        "Writes the remaining items and the end of the page to the streamed file."
+
+        if self._file is not None and not self._closed:
+            self._write_items(self._file)
+            self._write_footer(self._file)
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,292 @@
+"""Plot data in sidecar files: the columns of each ColumnDataSource are written to
+a binary file next to the HTML page instead of being embedded into it. The page
+is rendered with empty data sources, which are filled when their files have been
+loaded (asynchronously via fetch), such that the files can be cached by the
+browser:
+
+>>> pandas_bokeh.output_file("report.html", data="sidecar")
+>>> df.plot_bokeh.line()  # writes report.html and report_data/<hash>.bin
+
+The page has to be served via HTTP (e.g. python -m http.server), since browsers
+do not allow fetching local files.
+
+The sidecar files are named by a hash of their content, such that pages sharing
+a data directory do not overwrite each other's files and regenerated data gets a
+new URL (instead of a stale copy from the browser cache).
+
+Each sidecar file consists of the length of a JSON header (uint32, little
+endian), the JSON header and the binary columns (little endian, aligned to 8
+bytes). The header lists the columns with their name and either the "dtype",
+"offset" (relative to the end of the header) and "length" of a binary column or
+their "values"."""
+
+import hashlib
+import json
+import math
+import os
+import struct
+
+import numpy as np
+from bokeh.model import Model
+from bokeh.models import ColumnDataSource
+
+from .compress import _document_script, _root_divs, _serialize_models
+from .config import get_option
+from .progressive import _progressive_chunks
+from .utils import _BINARY_DTYPES, _datetime_to_epoch_ms
+
+_SIDECAR_LOADER_JS = """\
+(function() {
+  const sidecars = %(sidecars)s;
+  const array_types = {
+    float32: Float32Array, float64: Float64Array, uint8: Uint8Array,
+    int8: Int8Array, uint16: Uint16Array, int16: Int16Array,
+    uint32: Uint32Array, int32: Int32Array
+  };
+  function find_source(id) {
+    for (const doc of (window.Bokeh !== undefined ? Bokeh.documents : [])) {
+      const model = doc.get_model_by_id(id);
+      if (model != null)
+        return model;
+    }
+    return null;
+  }
+  function wait_for_source(id) {
+    return new Promise(function(resolve, reject) {
+      let attempts = 0;
+      const timer = setInterval(function() {
+        const source = find_source(id);
+        if (source != null) {
+          clearInterval(timer);
+          resolve(source);
+        } else if (++attempts > 1000) {
+          clearInterval(timer);
+          reject(new Error("data source " + id + " not found"));
+        }
+      }, 10);
+    });
+  }
+  function decode(buffer) {
+    const header_length = new DataView(buffer).getUint32(0, true);
+    const header = JSON.parse(
+      new TextDecoder().decode(new Uint8Array(buffer, 4, header_length))
+    );
+    const start = 4 + header_length;
+    const data = {};
+    for (const column of header.columns) {
+      data[column.name] = column.values !== undefined ? column.values :
+        new array_types[column.dtype](buffer, start + column.offset, column.length);
+    }
+    return data;
+  }
+  function fetch_buffer(url) {
+    return fetch(url).then(function(response) {
+      if (!response.ok)
+        throw new Error(url + ": " + response.status + " " + response.statusText);
+      return response.arrayBuffer();
+    });
+  }
+  function concat(a, b) {
+    const typed = ArrayBuffer.isView(a) ? a : (ArrayBuffer.isView(b) ? b : null);
+    if (typed == null)
+      return Array.from(a).concat(Array.from(b));
+    const result = new typed.constructor(a.length + b.length);
+    result.set(a);
+    result.set(b, a.length);
+    return result;
+  }
+  for (const sidecar of sidecars) {
+    const source = wait_for_source(sidecar.id);
+    if (sidecar.chunks === undefined) {
+      Promise.all([fetch_buffer(sidecar.url), source]).then(function(results) {
+        results[1].data = decode(results[0]);
+      }).catch(function(error) {
+        console.error("Bokeh: loading sidecar data failed:", error);
+      });
+      continue;
+    }
+    // Progressive plot: splice the chunks of the full data (in order) into the
+    // coarse data, <cut> is the number of coarse rows replaced by the chunks:
+    const buffers = sidecar.chunks.map(function(chunk) { return fetch_buffer(chunk.url); });
+    buffers.forEach(function(buffer) { buffer.catch(function() {}); });
+    let state = source.then(function(source) {
+      return {source: source, coarse: source.data, full: null};
+    });
+    sidecar.chunks.forEach(function(chunk, i) {
+      state = Promise.all([state, buffers[i]]).then(function(results) {
+        const state = results[0];
+        const chunk_data = decode(results[1]);
+        const data = {};
+        for (const name in chunk_data) {
+          const full = state.full == null ? chunk_data[name] : concat(state.full[name], chunk_data[name]);
+          data[name] = concat(full, state.coarse[name].slice(chunk.cut));
+          chunk_data[name] = full;
+        }
+        state.full = chunk_data;
+        state.source.data = data;
+        return state;
+      });
+    });
+    state.catch(function(error) {
+      console.error("Bokeh: loading progressive data failed:", error);
+    });
+  }
+})();"""
+
+
+def _sidecar_column(values):
+    """Returns <values> as little endian array of a binary dtype, as list of JSON
+    values or None (if the column cannot be written to a sidecar file)."""
+
+    if not isinstance(values, np.ndarray):
+        if any(isinstance(value, (list, tuple, np.ndarray)) for value in values):
+            return None
+        values = np.asarray(values)
+    if values.ndim != 1:
+        return None
+    if values.dtype.kind == "M":
+        values = _datetime_to_epoch_ms(values)
+    elif values.dtype.kind in "iu" and values.dtype.name not in _BINARY_DTYPES:
+        # BokehJS has no 64-bit integer arrays:
+        if len(values) and values.min() >= -(2**31) and values.max() < 2**31:
+            values = values.astype(np.int32)
+        else:
+            values = values.astype(np.float64)
+    if values.dtype.name in _BINARY_DTYPES:
+        return values.astype(values.dtype.newbyteorder("<"), copy=False)
+
+    column = []
+    for value in values.tolist():
+        if isinstance(value, (list, tuple, dict, np.ndarray)):
+            return None
+        if isinstance(value, float) and math.isnan(value):
+            value = None
+        column.append(value)
+    return column
+
+
+def _encode_sidecar(data):
+    """Returns the content of the sidecar file for the ColumnDataSource <data> or
+    None if a column cannot be written to a sidecar file."""
+
+    columns = {name: _sidecar_column(values) for name, values in data.items()}
+    if any(column is None for column in columns.values()):
+        return None
+
+    header = {"columns": []}
+    arrays = []
+    offset = 0
+    for name, column in columns.items():
+        if isinstance(column, np.ndarray):
+            header["columns"].append(
+                {
+                    "name": name,
+                    "dtype": column.dtype.name,
+                    "offset": offset,
+                    "length": len(column),
+                }
+            )
+            arrays.append(column)
+            offset += -(-column.nbytes // 8) * 8
+        else:
+            header["columns"].append({"name": name, "values": column})
+    # The header is padded, such that the binary columns are aligned:
+    header_bytes = json.dumps(header, default=str).encode("utf-8")
+    header_bytes += b" " * (-(4 + len(header_bytes)) % 8)
+
+    content = bytearray(struct.pack("<I", len(header_bytes)) + header_bytes)
+    for array in arrays:
+        content += array.tobytes()
+        content += b"\0" * (-len(content) % 8)
+    return bytes(content)
+
+
+def _decode_sidecar(content):
+    "Returns the columns of the sidecar file <content> (see _encode_sidecar)."
+
+    (header_length,) = struct.unpack_from("<I", content)
+    header = json.loads(content[4 : 4 + header_length].decode("utf-8"))
+    start = 4 + header_length
+    data = {}
+    for column in header["columns"]:
+        if "values" in column:
+            data[column["name"]] = column["values"]
+        else:
+            data[column["name"]] = np.frombuffer(
+                content,
+                dtype=np.dtype(column["dtype"]).newbyteorder("<"),
+                count=column["length"],
+                offset=start + column["offset"],
+            )
+    return data
+
+
+def _write_sidecar(source, data_dir, data_url):
+    """Writes the sidecar file(s) of <source> and returns their description for
+    the loader ({"id", "url"} or {"id", "chunks"} for the chunks of progressive
+    plots), None if the source cannot be written to sidecar files."""
+
+    chunks = _progressive_chunks(source, get_option("progressive_chunk_rows"))
+    if chunks is None:
+        chunks = [(source.data, None)]
+    contents = [_encode_sidecar(data) for data, _ in chunks]
+    if any(content is None for content in contents):
+        return None
+
+    files = []
+    for content, (_, cut) in zip(contents, chunks):
+        filename = f"{hashlib.sha1(content).hexdigest()[:16]}.bin"
+        with open(os.path.join(data_dir, filename), mode="wb") as f:
+            f.write(content)
+        files.append({"url": f"{data_url}/{filename}", "cut": cut})
+    if chunks[0][1] is None:
+        return {"id": source.id, "url": files[0]["url"]}
+    return {"id": source.id, "chunks": files}
+
+
+def sidecar_components(models, data_dir, data_url=None, compress=False):
+    """Like bokeh.embed.components, but the columns of the ColumnDataSources are
+    written to the sidecar files <data_dir>/<content hash>.bin and loaded from
+    the URL <data_url>/<content hash>.bin (default: the name of <data_dir>, i.e.
+    the directory is next to the HTML page). Data sources with nested columns
+    (e.g. of patches) remain embedded. The full data of progressive plots is
+    written in chunks, which replace their coarse data in order. With compress=True, the document is embedded
+    compressed (see compressed_components).
+
+    Returns the script and a single div (if <models> is a Model) or a tuple of
+    divs (for a list of models)."""
+
+    if data_url is None:
+        data_url = os.path.basename(os.path.normpath(data_dir))
+    data_url = data_url.rstrip("/")
+    os.makedirs(data_dir, exist_ok=True)
+
+    if not isinstance(models, Model):
+        models = list(models)
+    docs_json, render_item, was_single_object = _serialize_models(models)
+    sources = {
+        reference.id: reference
+        for model in ([models] if was_single_object else models)
+        for reference in model.references()
+    }
+
+    sidecars = []
+    for doc_json in docs_json.values():
+        for reference in doc_json["roots"]["references"]:
+            source = sources.get(reference["id"])
+            if type(source) is not ColumnDataSource or not source.data:
+                continue
+            sidecar = _write_sidecar(source, data_dir, data_url)
+            if sidecar is None:
+                continue
+            if "url" in sidecar:
+                # Placeholder until the data is loaded (progressive plots show
+                # their coarse data):
+                reference["attributes"]["data"] = {name: [] for name in source.data}
+            sidecars.append(sidecar)
+
+    script = _document_script(docs_json, render_item, compress=compress)
+    if sidecars:
+        loader = _SIDECAR_LOADER_JS % dict(sidecars=json.dumps(sidecars))
+        script += f'\n<script type="text/javascript">\n{loader}\n</script>'
+    return script, _root_divs(render_item, was_single_object)
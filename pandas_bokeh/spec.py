@@ -0,0 +1,80 @@
+"""Picklable intermediate representation of a plot: all data transformations of
+pandas_bokeh.plot (x-axis conversion, aggregation, density estimation, payload
+reduction, encodings, ...) produce a PlotSpec, which is then turned into Bokeh
+models by pandas_bokeh.render_plot:
+
+>>> spec = pandas_bokeh.prepare_plot(df, kind="line", title="Sales")
+>>> p = pandas_bokeh.render_plot(spec)
+
+PlotSpecs only contain NumPy arrays and plain Python objects, such that they can
+be sent to other processes, cached and compared."""
+
+import hashlib
+import pickle
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+
+def _update_fingerprint(hash_object, value):
+    """Adds <value> (nested dicts, lists, tuples, arrays and pandas Series/Index) to
+    <hash_object>."""
+
+    if isinstance(value, dict):
+        hash_object.update(b"dict:%d" % len(value))
+        for key in sorted(value, key=repr):
+            _update_fingerprint(hash_object, key)
+            _update_fingerprint(hash_object, value[key])
+    elif isinstance(value, (list, tuple)):
+        hash_object.update(b"%s:%d" % (type(value).__name__.encode(), len(value)))
+        for element in value:
+            _update_fingerprint(hash_object, element)
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        hash_object.update(b"array:%s:%r" % (value.dtype.str.encode(), value.shape))
+        hash_object.update(np.ascontiguousarray(value).view(np.uint8).data)
+    elif isinstance(value, np.ndarray):
+        _update_fingerprint(hash_object, value.tolist())
+    elif isinstance(value, (pd.Series, pd.Index)):
+        hash_object.update(b"%s:%r" % (type(value).__name__.encode(), value.name))
+        _update_fingerprint(hash_object, str(value.dtype))
+        _update_fingerprint(
+            hash_object, pd.util.hash_pandas_object(value, index=False).values
+        )
+    else:
+        hash_object.update(pickle.dumps(value, protocol=4))
+
+
+class PlotSpec(namedtuple("PlotSpec", ["kind", "data", "options"])):
+    """Data and options of a plot without any Bokeh models.
+
+    - kind (str) - plot kind ("line", "step", "point", "scatter", "bar", "barh",
+        "hist", "kde", "ecdf", "area" or "pie")
+    - data (dict) - prepared plot data, e.g. "source" (the columns of the data
+        source as NumPy arrays), "ecdf_sources" or "aggregates" & "bins" (hist)
+    - options (dict) - options for building the figure and glyphs (figure
+        options, data columns, keyword arguments of the glyphs, ...)
+
+    PlotSpecs are compared and hashed by their content (see fingerprint)."""
+
+    __slots__ = ()
+
+    @property
+    def fingerprint(self):
+        "SHA-1 hex digest of the content of the PlotSpec."
+
+        hash_object = hashlib.sha1()
+        _update_fingerprint(hash_object, (self.kind, self.data, self.options))
+        return hash_object.hexdigest()
+
+    def __eq__(self, other):
+        if not isinstance(other, PlotSpec):
+            return NotImplemented
+        return self.fingerprint == other.fingerprint
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(self.fingerprint)
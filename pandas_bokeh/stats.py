@@ -0,0 +1,150 @@
+import numpy as np
+
+
+def _kde_bandwidth(values, bw_method=None, weights=None):
+    """Returns the Gaussian kernel bandwidth (standard deviation of the kernel)
+    for <values>. <bw_method> follows the conventions of
+    scipy.stats.gaussian_kde: "scott" (default), "silverman" or a scalar factor
+    that is multiplied with the standard deviation of the data."""
+
+    if len(values) == 0:
+        raise ValueError("Cannot estimate a density for data without values.")
+    if weights is None:
+        n_eff = len(values)
+        std = np.std(values, ddof=1) if n_eff > 1 else 0.0
+    else:
+        weights_sum = np.sum(weights)
+        n_eff = weights_sum**2 / np.sum(weights**2)
+        mean = np.sum(weights * values) / weights_sum
+        variance = np.sum(weights * (values - mean) ** 2) / weights_sum
+        # Bessel correction with the effective number of samples:
+        if n_eff > 1:
+            variance *= n_eff / (n_eff - 1)
+        std = np.sqrt(variance)
+
+    if bw_method is None or bw_method == "scott":
+        factor = n_eff ** (-1.0 / 5)
+    elif bw_method == "silverman":
+        factor = (n_eff * 3 / 4.0) ** (-1.0 / 5)
+    elif isinstance(bw_method, (int, float)) and not isinstance(bw_method, bool):
+        if bw_method <= 0:
+            raise ValueError("A scalar <bw_method> has to be larger than 0.")
+        factor = bw_method
+    else:
+        raise ValueError(
+            '<bw_method> can only be None, "scott", "silverman" or a positive scalar.'
+        )
+
+    bandwidth = factor * std
+    if not bandwidth > 0:
+        raise ValueError(
+            "Cannot estimate a density for data without variance (all values are equal)."
+        )
+
+    return bandwidth
+
+
+def _binned_kde(values, ind, bandwidth, weights=None, gridsize=4096):
+    """Evaluates a Gaussian kernel density estimate of <values> at the points
+    <ind> using linear binning and FFT convolution.
+
+    The data is distributed onto a regular grid of <gridsize> points (linear
+    binning, O(n)) and the binned counts are convolved with the sampled kernel
+    via FFT (O(m log m)). The result is interpolated onto <ind>."""
+
+    ind = np.asarray(ind, dtype=float)
+    if weights is None:
+        weights = np.ones(len(values))
+    weights = np.asarray(weights, dtype=float)
+
+    # Regular grid covering both the data (plus kernel tails) and <ind>:
+    cutoff = 4 * bandwidth
+    grid_min = min(values.min(), ind.min()) - cutoff
+    grid_max = max(values.max(), ind.max()) + cutoff
+    grid = np.linspace(grid_min, grid_max, gridsize)
+    delta = grid[1] - grid[0]
+
+    # Linear binning: Split the weight of each value between its two neighbouring
+    # grid points:
+    position = (values - grid_min) / delta
+    left = np.clip(np.floor(position).astype(np.int64), 0, gridsize - 2)
+    fraction = position - left
+    counts = np.bincount(left, weights=(1 - fraction) * weights, minlength=gridsize)
+    counts += np.bincount(left + 1, weights=fraction * weights, minlength=gridsize)
+
+    # Sample kernel on the grid spacing and convolve via FFT:
+    half_width = min(int(np.ceil(cutoff / delta)), gridsize - 1)
+    offsets = np.arange(-half_width, half_width + 1) * delta
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (
+        bandwidth * np.sqrt(2 * np.pi)
+    )
+    n_fft = 1 << int(np.ceil(np.log2(gridsize + len(kernel) - 1)))
+    convolved = np.fft.irfft(
+        np.fft.rfft(counts, n_fft) * np.fft.rfft(kernel, n_fft), n_fft
+    )
+    density = convolved[half_width : half_width + gridsize] / np.sum(weights)
+    density = np.clip(density, 0, None)
+
+    return np.interp(ind, grid, density)
+
+
+def _kde_grid(v_min, v_max, ind=None):
+    """Returns the evaluation points of the density for data in the range
+    [<v_min>, <v_max>]. If <ind> is None, 1000 equally spaced points are used
+    (range of the data extended by 50% on both sides, like
+    pandas.DataFrame.plot.kde). If <ind> is an integer, that many equally spaced
+    points are used."""
+
+    if ind is None or isinstance(ind, (int, np.integer)):
+        n_points = 1000 if ind is None else ind
+        if n_points < 2:
+            raise ValueError("<ind> has to be an integer >= 2 or an array of points.")
+        v_range = v_max - v_min
+        return np.linspace(v_min - 0.5 * v_range, v_max + 0.5 * v_range, n_points)
+
+    return np.asarray(ind, dtype=float)
+
+
+def _ecdf(values, weights=None, max_points=1000):
+    """Returns the vertices (x, y) of the empirical cumulative distribution function
+    of <values>, to be drawn as step line (mode="after").
+
+    At most <max_points> vertices are returned. They are placed at the data values
+    where the ECDF crosses an equally spaced grid of probabilities, such that the
+    vertical deviation from the exact ECDF is at most 1/(max_points - 1) of the
+    y-range (less than one pixel for figures up to <max_points> pixels high). For
+    unweighted data, only the needed order statistics are computed via
+    np.partition instead of sorting all values. Without values, the ECDF has no
+    vertices."""
+
+    n = len(values)
+    if n == 0:
+        return np.asarray(values), np.empty(0)
+    if max_points is None:
+        max_points = n
+    if max_points < 2:
+        raise ValueError("<max_points> has to be an integer >= 2.")
+    if weights is None:
+        if n <= max_points:
+            x = np.sort(values)
+            return x, np.arange(1, n + 1) / n
+
+        ranks = np.unique(np.linspace(0, n - 1, max_points).round().astype(np.int64))
+        if n > 4 * max_points:
+            x = np.partition(values, ranks)[ranks]
+        else:
+            x = np.sort(values)[ranks]
+        return x, (ranks + 1) / n
+
+    order = np.argsort(values, kind="stable")
+    x = values[order]
+    y = np.cumsum(weights[order])
+    y /= y[-1]
+    if n > max_points:
+        thresholds = np.linspace(0, 1, max_points)[1:]
+        ranks = np.unique(
+            np.concatenate([[0], np.searchsorted(y, thresholds * (1 - 1e-12))])
+        )
+        ranks = ranks[ranks < n]
+        x, y = x[ranks], y[ranks]
+    return x, y
@@ -0,0 +1,352 @@
+"""Live plots of streams of DataFrames: the batches of an iterator (or of an async
+iterator / asyncio.Queue) are appended to the data sources of a line, step, point
+or scatter plot via ColumnDataSource.stream, which keeps only the last <rollover>
+rows in the browser:
+
+>>> p = pandas_bokeh.stream(batches(), kind="line", rollover=100_000)
+>>> p = await pandas_bokeh.astream(queue, kind="line", rollover=100_000)
+
+Batches arriving within one frame (1 / pandas_bokeh.options.stream_fps seconds)
+are sent together. The figure is shown in the notebook (and updated via
+push_notebook), added to the Bokeh server document <doc> (updated via next tick
+callbacks) or, for file output, shown after the stream has ended."""
+
+import asyncio
+import queue
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from bokeh.io import push_notebook
+from bokeh.io.notebook import CommsHandle
+
+from .arrow import _arrow_to_pandas, _is_arrow
+from .base import _current_output, show
+from .config import get_option, option_context
+from .handle import PlotHandle, _glyph_sources, _incremental_options
+from .progressive import _coarse_rows
+
+STREAM_KINDS = ["line", "step", "point", "scatter"]
+
+# Marks the end of the batches read by the reader thread of stream():
+_END = object()
+
+
+class _LivePlot:
+    """Figure of a stream: collects the batches of a frame and sends them to the
+    data sources of the figure."""
+
+    def __init__(self, kind, rollover, max_points, doc, show_figure, kwargs):
+        if kind not in STREAM_KINDS:
+            allowed_kinds = "', '".join(STREAM_KINDS)
+            raise ValueError(
+                f"For streams, the allowed plot kinds are '{allowed_kinds}'."
+            )
+        if not isinstance(rollover, int) or rollover < 1:
+            raise ValueError("<rollover> has to be an integer >= 1.")
+        if max_points is not None and (
+            not isinstance(max_points, int) or not 2 <= max_points <= rollover
+        ):
+            raise ValueError(
+                "<max_points> has to be None or an integer between 2 and <rollover>."
+            )
+        for name in ["show_figure", "return_html", "notebook_handle", "progressive"]:
+            if name in kwargs:
+                raise TypeError(f"stream() got an unexpected keyword argument '{name}'")
+
+        self.kind = kind
+        self.rollover = rollover
+        self.max_points = max_points
+        self.doc = doc
+        self.show_figure = show_figure
+        self.kwargs = kwargs
+        self.figure = None
+        self.comms_handle = None
+        self._batches = []
+        self._sources = None
+        self._fingerprint = None
+        self._data_cols = None
+        self._rows_in = None
+        self._rows_out = None
+
+    def add(self, batch):
+        if _is_arrow(batch):
+            batch = _arrow_to_pandas(batch)
+        if isinstance(batch, pd.Series):
+            batch = batch.to_frame()
+        if not isinstance(batch, pd.DataFrame):
+            raise ValueError(
+                f"The batches of a stream have to be DataFrames, not {type(batch)}."
+            )
+        self._batches.append(batch)
+
+    def _render(self, df):
+        "Returns the glyph sources of the plot of <df> and the fingerprint of its axes."
+
+        from .plot import prepare_plot, render_plot
+
+        # Batches are never reduced to the payload budget (which would change the
+        # encoding of the data between frames):
+        with option_context(max_payload_bytes=None, **_incremental_options()):
+            spec = prepare_plot(df, kind=self.kind, **self.kwargs)
+            p = render_plot(spec)
+        self._data_cols = spec.options["data_cols"]
+        return p, PlotHandle._fingerprint(spec)
+
+    def _reduce(self, i, data):
+        """Returns the rows of <data> (new rows of source <i>) to send: with
+        <max_points>, the frames are downsampled such that the window of
+        <max_points> rows in the browser spans the last <rollover> rows."""
+
+        n_rows = len(data["__x__values"])
+        if self.max_points is None:
+            return data
+        self._rows_in[i] += n_rows
+        n_keep = int(self._rows_in[i] * self.max_points / self.rollover)
+        n_keep = min(max(n_keep - self._rows_out[i], 0), n_rows)
+        if n_keep == n_rows:
+            rows = np.arange(n_rows)
+        elif n_keep == 0:
+            rows = np.arange(0)
+        else:
+            rows = _coarse_rows(self.kind, data, self._data_cols, n_keep)
+        self._rows_out[i] += len(rows)
+        return {
+            name: (
+                [values[row] for row in rows]
+                if isinstance(values, list)
+                else np.asarray(values)[rows]
+            )
+            for name, values in data.items()
+        }
+
+    def flush(self):
+        "Sends the collected batches to the figure (created by the first frame)."
+
+        if not self._batches:
+            return
+        df = pd.concat(self._batches) if len(self._batches) > 1 else self._batches[0]
+        self._batches = []
+        p, fingerprint = self._render(df)
+        window = self.rollover if self.max_points is None else self.max_points
+
+        if self.figure is None:
+            self.figure = p
+            self._fingerprint = fingerprint
+            self._sources = _glyph_sources(p)
+            self._rows_in = [0] * len(self._sources)
+            self._rows_out = [0] * len(self._sources)
+            for i, source in enumerate(self._sources):
+                data = self._reduce(i, dict(source.data))
+                source.data = {name: values[-window:] for name, values in data.items()}
+            self._show()
+            return
+
+        new_sources = _glyph_sources(p)
+        if fingerprint != self._fingerprint or len(new_sources) != len(self._sources):
+            raise ValueError(
+                "A batch of the stream changes the axis labels, the encoding or the "
+                "number of glyphs of the plot (e.g. new categories or a quantized "
+                "<precision>) and cannot be appended."
+            )
+        updates = [
+            (source, self._reduce(i, new_source.data))
+            for i, (source, new_source) in enumerate(zip(self._sources, new_sources))
+        ]
+
+        def update():
+            for source, data in updates:
+                source.stream(data, rollover=window)
+
+        if self.doc is not None:
+            self.doc.add_next_tick_callback(update)
+        else:
+            update()
+            if self.comms_handle is not None:
+                push_notebook(document=self.comms_handle.doc, handle=self.comms_handle)
+
+    def _show(self):
+        if self.doc is not None:
+            figure = self.figure
+            self.doc.add_next_tick_callback(lambda: self.doc.add_root(figure))
+        elif self.show_figure and _current_output().output_type == "jupyter":
+            shown = show(self.figure, notebook_handle=True)
+            if isinstance(shown, CommsHandle):
+                self.comms_handle = shown
+
+    def close(self):
+        "Sends the remaining batches and shows the figure for other outputs."
+
+        self.flush()
+        if self.figure is None:
+            raise ValueError("The stream did not contain any batches.")
+        if (
+            self.doc is None
+            and self.show_figure
+            and _current_output().output_type != "jupyter"
+        ):
+            show(self.figure)
+        return self.figure
+
+
+def _frame_time(fps):
+    if fps is None:
+        fps = get_option("stream_fps")
+    if isinstance(fps, bool) or not isinstance(fps, (int, float)) or not fps > 0:
+        raise ValueError("<fps> has to be a positive number.")
+    return 1 / fps
+
+
+def _read_batches(batches, items):
+    "Puts the batches of the iterable <batches> into the queue <items>."
+
+    try:
+        for batch in batches:
+            items.put(batch)
+    except BaseException as error:
+        items.put(error)
+    items.put(_END)
+
+
+def _consume(live, items, frame_time, last_flush):
+    "Sends the batches of the queue <items> to <live> frame by frame."
+
+    while True:
+        timeout = None
+        if live._batches:
+            timeout = max(last_flush + frame_time - time.monotonic(), 0)
+        try:
+            item = items.get(timeout=timeout)
+        except queue.Empty:
+            item = None
+        if item is _END:
+            return live.close()
+        if isinstance(item, BaseException):
+            raise item
+        if item is not None:
+            live.add(item)
+        if time.monotonic() >= last_flush + frame_time:
+            live.flush()
+            last_flush = time.monotonic()
+
+
+def stream(
+    batches,
+    kind="line",
+    rollover=100_000,
+    max_points=None,
+    fps=None,
+    doc=None,
+    show_figure=True,
+    **kwargs,
+):
+    """Plots a stream of DataFrames: each batch of the iterable <batches> (e.g. a
+    generator) is appended to the plot, and only the last <rollover> rows are
+    kept. Batches arriving within one frame are sent together.
+
+    Parameters:
+    ----------------------------------------------------------------
+    batches (iterable) – DataFrames, Series or pyarrow RecordBatches with the new
+                         rows
+    kind (str) – "line", "step", "point" or "scatter"
+    rollover (int) – number of rows kept in the plot (default: 100_000)
+    max_points (int, optional) – downsample the new rows of each frame (line and
+                                 step plots shape-preserving via the option
+                                 "downsampling", otherwise randomly), such that
+                                 the plot shows the last <rollover> rows with
+                                 <max_points> points (default: None, no
+                                 downsampling)
+    fps (float, optional) – maximum number of updates per second (default:
+                            pandas_bokeh.options.stream_fps)
+    doc (bokeh.document.Document, optional) – document of a Bokeh server session
+                                              (e.g. curdoc()): the figure is
+                                              added to the document and the
+                                              batches are read in a background
+                                              thread
+    show_figure (bool) – show the figure in the notebook (updated live) or, for
+                         file output, after the stream has ended
+    **kwargs – arguments of the plot method (e.g. x, y, title, colormap)
+
+    Returns:
+    ----------------------------------------------------------------
+    The figure after the stream has ended (with <doc>: the figure with the first
+    batch, the stream continues in the background)."""
+
+    live = _LivePlot(kind, rollover, max_points, doc, show_figure, kwargs)
+    frame_time = _frame_time(fps)
+
+    # The first batch creates the figure:
+    batches = iter(batches)
+    for batch in batches:
+        live.add(batch)
+        live.flush()
+        break
+    else:
+        return live.close()
+
+    items = queue.Queue()
+    reader = threading.Thread(target=_read_batches, args=(batches, items), daemon=True)
+    reader.start()
+    if doc is not None:
+        threading.Thread(
+            target=_consume,
+            args=(live, items, frame_time, time.monotonic()),
+            daemon=True,
+        ).start()
+        return live.figure
+    return _consume(live, items, frame_time, time.monotonic())
+
+
+async def astream(
+    batches,
+    kind="line",
+    rollover=100_000,
+    max_points=None,
+    fps=None,
+    doc=None,
+    show_figure=True,
+    **kwargs,
+):
+    """Awaitable version of stream() for an async iterable or an asyncio.Queue of
+    DataFrames (None ends a queue). The data of each frame is prepared in the
+    event loop; returns the figure after the stream has ended.
+
+    >>> queue = asyncio.Queue()
+    >>> task = asyncio.create_task(pandas_bokeh.astream(queue, rollover=10_000))
+    >>> await queue.put(df_batch)
+    >>> await queue.put(None)
+    >>> p = await task"""
+
+    live = _LivePlot(kind, rollover, max_points, doc, show_figure, kwargs)
+    frame_time = _frame_time(fps)
+    if isinstance(batches, asyncio.Queue):
+        next_batch = batches.get
+    else:
+        iterator = batches.__aiter__()
+
+        async def next_batch():
+            try:
+                return await iterator.__anext__()
+            except StopAsyncIteration:
+                return None
+
+    last_flush = -float("inf")
+    pending = None
+    while True:
+        if pending is None:
+            pending = asyncio.ensure_future(next_batch())
+        timeout = None
+        if live._batches:
+            timeout = max(last_flush + frame_time - time.monotonic(), 0)
+        # Waiting does not cancel the pending batch, it is used in the next frame:
+        done, _ = await asyncio.wait([pending], timeout=timeout)
+        if done:
+            batch = pending.result()
+            pending = None
+            if batch is None:
+                return live.close()
+            live.add(batch)
+        if time.monotonic() >= last_flush + frame_time:
+            live.flush()
+            last_flush = time.monotonic()
@@ -1,7 +1,17 @@
 import re
+from typing import Tuple, Union
 
+import numpy as np
+import pandas as pd
 from pandas import DataFrame
 
+# Nullable numeric & boolean extension arrays (FloatingArray exists for pandas>=1.2):
+_MASKED_ARRAYS = tuple(
+    getattr(pd.arrays, name)
+    for name in ["IntegerArray", "FloatingArray", "BooleanArray"]
+    if hasattr(pd.arrays, name)
+)
+
 
 def _extract_additional_columns(df: DataFrame, hovertool_string: str):
     additional_columns = []
@@ -13,8 +23,285 @@ def _extract_additional_columns(df: DataFrame, hovertool_string: str):
             s = s[1:]
             if s in df.columns:
                 additional_columns.append(s)
-        for s in re.findall(r"@\{.+\}", hovertool_string):
+        for s in re.findall(r"@\{[^\}]+\}", hovertool_string):
             s = s[2:-1]
             if s in df.columns:
                 additional_columns.append(s)
     return additional_columns
+
+
+def _to_numpy(values: Union[pd.Series, pd.Index]) -> np.ndarray:
+    """Returns the values of a Series/Index as NumPy array, which Bokeh serializes
+    as a binary array (extension arrays would be serialized element by element).
+
+    Nullable numeric and boolean columns (Int64, Float64, boolean, ...) are
+    returned as float arrays with NaN for missing values. If there are no missing
+    values, they keep their NumPy dtype (without copying). Categoricals are
+    returned as arrays of their values (see _categorical_codes for their codes)."""
+
+    array = values.array
+    if isinstance(array, _MASKED_ARRAYS):
+        if values.hasnans:
+            return array.to_numpy(dtype="float64", na_value=np.nan)
+        return array.to_numpy(dtype=array.dtype.numpy_dtype, copy=False)
+    return np.asarray(values.values)
+
+
+def _categorical_codes(values: pd.Categorical) -> Tuple[np.ndarray, pd.Index]:
+    """Returns the integer codes (-1 for missing values) and the table of
+    categories of a Categorical, without materializing its values."""
+
+    return np.asarray(values.codes), values.categories
+
+
+def _dictionary_encode(
+    values: Union[np.ndarray, pd.Categorical], max_unique_ratio: float = 0.5
+):
+    """Dictionary-encodes an array of strings/objects with many repeated values.
+
+    Returns a tuple (codes, labels) with the smallest sufficient integer dtype for
+    the codes (-1 for missing values) and the list of unique values as strings. If
+    <values> is not an array of strings/objects or has more than
+    <max_unique_ratio> * len(values) unique values, None is returned.
+    Categoricals are always encoded by their codes and table of categories."""
+
+    if isinstance(values, pd.Categorical):
+        codes, uniques = _categorical_codes(values)
+    else:
+        values = np.asarray(values)
+        if values.dtype.kind not in "OUS" or len(values) < 2:
+            return None
+
+        codes, uniques = pd.factorize(values)
+        if len(uniques) > max_unique_ratio * len(values):
+            return None
+
+    for dtype in [np.int8, np.int16, np.int32]:
+        if len(uniques) <= np.iinfo(dtype).max:
+            codes = codes.astype(dtype)
+            break
+
+    return codes, [str(label) for label in uniques]
+
+
+# Supported values for the <precision> of numeric data sent to the browser:
+PRECISIONS = ["float64", "float32", "int32", "int16"]
+
+
+def _datetime_to_epoch_ms(values: np.ndarray) -> np.ndarray:
+    """Returns datetime64 values as float64 milliseconds since epoch (the
+    representation BokehJS uses for datetimes), NaT as NaN."""
+
+    values = np.asarray(values).astype("datetime64[ns]")
+    epoch_ms = values.view(np.int64) / 1e6
+    epoch_ms[np.isnat(values)] = np.nan
+    return epoch_ms
+
+
+def _reduce_precision(values: np.ndarray, precision: str):
+    """Encodes numeric <values> with the given <precision>. Returns a tuple of the
+    encoded values and the quantization parameters (None if not quantized).
+
+    * "float64": values are returned unchanged
+    * "float32": values are downcast to float32 (relative error <= 6e-8)
+    * "int32"/"int16": values are quantized to integers q, such that
+      value = offset + q * scale, with an absolute error <= scale / 2 =
+      (max - min) / (2 * (2**32 - 2)) resp. (max - min) / (2 * (2**16 - 2)).
+      Missing and non-finite values are mapped to the smallest integer (sentinel).
+    """
+
+    if precision not in PRECISIONS:
+        raise ValueError(f"<precision> can only be one of {PRECISIONS}.")
+
+    values = np.asarray(values)
+    if precision == "float64" or values.dtype.kind not in "iuf":
+        return values, None
+    if precision == "float32" or values.dtype.itemsize <= np.dtype(precision).itemsize:
+        if values.dtype.kind == "f" and values.dtype.itemsize > 4:
+            values = values.astype(np.float32)
+        elif values.dtype.kind in "iu" and values.dtype.itemsize > 4:
+            info = np.iinfo(np.int32)
+            if len(values) and info.min <= values.min() and values.max() <= info.max:
+                values = values.astype(np.int32)
+        return values, None
+
+    finite = np.isfinite(values)
+    if not finite.any():
+        return values.astype(np.float32), None
+    v_min, v_max = values[finite].min(), values[finite].max()
+
+    dtype = np.dtype(precision)
+    q_max = np.iinfo(dtype).max
+    sentinel = np.iinfo(dtype).min
+    scale = (v_max - v_min) / (2 * q_max) if v_max > v_min else 1.0
+    offset = v_min + q_max * scale
+
+    codes = np.full(len(values), sentinel, dtype=dtype)
+    codes[finite] = np.clip(np.round((values[finite] - offset) / scale), -q_max, q_max)
+    quantization = {
+        "offset": float(offset),
+        "scale": float(scale),
+        "sentinel": int(sentinel),
+    }
+
+    return codes, quantization
+
+
+# NumPy dtypes that Bokeh serializes as base64-encoded binary arrays (all other
+# arrays and lists are serialized element by element as JSON lists):
+_BINARY_DTYPES = ["float32", "float64", "uint8", "int8", "uint16", "int16"]
+_BINARY_DTYPES += ["uint32", "int32"]
+
+
+def _estimate_column_bytes(values, as_list: bool = False, sample_size: int = 1000):
+    """Estimates the number of bytes of the serialized column <values> in the
+    Bokeh document. Binary arrays are base64 encoded (4/3 bytes per byte), the
+    size of JSON lists (or of all values if <as_list>) is extrapolated from a
+    sample of their elements."""
+
+    values = np.asarray(values)
+    n = len(values)
+    if n == 0:
+        return 0.0
+    if values.dtype.kind == "M":
+        if not as_list:
+            return 8 * n * 4 / 3
+        values = _datetime_to_epoch_ms(values)
+    if values.dtype.name in _BINARY_DTYPES and not as_list:
+        return values.dtype.itemsize * n * 4 / 3
+
+    sample = values[np.linspace(0, n - 1, min(n, sample_size)).astype(np.int64)]
+    if values.dtype.kind in "iufb":
+        element_size = np.mean([len(repr(v)) for v in sample.tolist()])
+    else:
+        # Strings are quoted:
+        element_size = np.mean([len(str(v)) + 2 for v in sample.tolist()])
+    # Elements are separated by ",":
+    return (element_size + 1) * n
+
+
+# Maximum number of iterations of the vectorized selection of _lttb_indices (then
+# the remaining buckets are selected sequentially):
+_LTTB_MAX_ITERATIONS = 16
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Returns the sorted indices of at most <n_out> points of the line (x, y)
+    selected by the Largest-Triangle-Three-Buckets algorithm, which keeps the
+    visual shape (peaks and dips) of the line.
+
+    The first and last points are always kept. The remaining points are split
+    into n_out - 2 buckets of equal size, from each the point is selected that
+    forms the largest triangle with the previously selected point and the mean of
+    the next bucket. Missing values of <y> are skipped, but the first missing
+    value of each gap is kept such that gaps of the line remain visible."""
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("<n_out> has to be an integer >= 3.")
+
+    missing = np.isnan(y) | np.isnan(x)
+    gaps = np.flatnonzero(missing & ~np.concatenate([[False], missing[:-1]]))
+    if len(gaps) > n_out // 4:
+        gaps = gaps[np.linspace(0, len(gaps) - 1, n_out // 4).astype(np.int64)]
+    valid = np.flatnonzero(~missing)
+    n_out = n_out - len(gaps)
+    if n_out >= len(valid):
+        return np.union1d(valid, gaps)
+    if n_out < 3:
+        keep = np.linspace(0, len(valid) - 1, max(n_out, 0)).astype(np.int64)
+        return np.union1d(valid[keep], gaps)
+    x, y = x[valid], y[valid]
+
+    edges = np.linspace(1, len(valid) - 1, n_out - 1).astype(np.int64)
+    starts, stops = edges[:-1], edges[1:]
+    lengths = stops - starts
+    # Points of all buckets as rows of a matrix (padded with their last point):
+    rows = np.minimum(starts[:, None] + np.arange(lengths.max()), stops[:, None] - 1)
+    bucket_x, bucket_y = x[rows], y[rows]
+
+    # The third point of each triangle: the mean of the next bucket (the last
+    # point for the last bucket):
+    mean_x = np.add.reduceat(x[: stops[-1]], starts) / lengths
+    mean_y = np.add.reduceat(y[: stops[-1]], starts) / lengths
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    # The first point of each triangle is the point selected in the previous
+    # bucket. To compute all buckets at once, the selection starts from the means
+    # of the previous buckets and is repeated for the buckets whose previous
+    # selection has changed, until it equals the sequential selection:
+    a_x = np.append(x[0], mean_x[:-1])
+    a_y = np.append(y[0], mean_y[:-1])
+    selected = np.full(len(rows), -1)
+    update = np.arange(len(rows))
+    for _ in range(_LTTB_MAX_ITERATIONS):
+        area = np.abs(
+            (a_x[update] - next_x[update])[:, None]
+            * (bucket_y[update] - a_y[update, None])
+            - (a_x[update, None] - bucket_x[update])
+            * (next_y[update] - a_y[update])[:, None]
+        )
+        previous = selected[update]
+        selected[update] = rows[update, np.argmax(area, axis=1)]
+        changed = update[selected[update] != previous]
+        update = changed[changed < len(rows) - 1] + 1
+        if len(update) == 0:
+            break
+        a_x[update] = x[selected[update - 1]]
+        a_y[update] = y[selected[update - 1]]
+    else:
+        # Changes still propagate through many buckets (e.g. for zigzag lines):
+        # the remaining buckets are selected sequentially, skipping those whose
+        # previous selection has not changed.
+        stale = np.sort(update)
+        i = stale[0]
+        while i < len(rows):
+            a = selected[i - 1]
+            area = np.abs(
+                (x[a] - next_x[i]) * (bucket_y[i] - y[a])
+                - (x[a] - bucket_x[i]) * (next_y[i] - y[a])
+            )
+            previous = selected[i]
+            selected[i] = rows[i, np.argmax(area)]
+            i += 1
+            if selected[i - 1] == previous:
+                position = np.searchsorted(stale, i)
+                if position == len(stale):
+                    break
+                i = stale[position]
+    selected = np.concatenate([[0], selected, [len(valid) - 1]])
+
+    return np.union1d(valid[selected], gaps)
+
+
+def _minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Returns the sorted indices of at most <n_out> points of the line y: the
+    first and last point and the minimum and maximum of n_out // 2 - 1 buckets of
+    equal size. Buckets consisting only of missing values keep their first point,
+    such that gaps of the line remain visible."""
+
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 4:
+        raise ValueError("<n_out> has to be an integer >= 4.")
+
+    missing = np.isnan(y)
+    y_min = np.where(missing, np.inf, y)
+    y_max = np.where(missing, -np.inf, y)
+    starts = np.linspace(0, n, n_out // 2).astype(np.int64)[:-1]
+    buckets = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, n)))
+    indices = [[0, n - 1]]
+    for values, reduce in [(y_min, np.minimum), (y_max, np.maximum)]:
+        # The first position of each bucket that has its extreme value:
+        extremes = reduce.reduceat(values, starts)
+        positions = np.flatnonzero(values == extremes[buckets])
+        _, first = np.unique(buckets[positions], return_index=True)
+        indices.append(positions[first])
+    return np.unique(np.concatenate(indices))